@@ -0,0 +1,100 @@
+# Headless join engine shared by the Tk app and the command line
+from joinapp.asof import ASOF_DIRECTIONS, asof_join, interval_join
+from joinapp.cache import FrameCache
+from joinapp.cardinality import estimate_join
+from joinapp.encoding import categorize_columns, decode_keys, encode_keys
+from joinapp.engine import (
+    COMPRESSIONS,
+    FILE_FORMATS,
+    JOIN_TYPES,
+    SORT_ORDERS,
+    compression_for,
+    export_frame,
+    file_format,
+    is_sorted_on,
+    join_frames,
+    key_columns,
+    load_frame,
+    header_names,
+    normalize_columns,
+    project_frames,
+    projection,
+    read_csv_chunks,
+    read_frame,
+    read_header,
+    select_columns,
+    sort_columns,
+    sort_frame,
+)
+from joinapp.extsort import external_sort, external_sort_frame, sort_csv
+from joinapp.filters import filter_chunks, filter_frame
+from joinapp.fuzzy import fuzzy_join, match_names, normalize_name
+from joinapp.incremental import AppendTracker, append_rows, append_to_export, join_appended
+from joinapp.index import KeyIndex, SavedIndex, ensure_index, join_with_index, open_index, save_index
+from joinapp.lazy import LazyCrossJoin
+from joinapp.mergejoin import merge_join_files, merge_join_frames, sorted_merge_join
+from joinapp.memo import ResultCache, frame_fingerprint
+from joinapp.parallel import parallel_join
+from joinapp.schema import infer_schema, read_typed_csv
+from joinapp.streaming import stream_join, stream_join_frames
+
+__all__ = [
+    "ASOF_DIRECTIONS",
+    "AppendTracker",
+    "COMPRESSIONS",
+    "FILE_FORMATS",
+    "FrameCache",
+    "JOIN_TYPES",
+    "KeyIndex",
+    "LazyCrossJoin",
+    "ResultCache",
+    "SavedIndex",
+    "SORT_ORDERS",
+    "append_rows",
+    "append_to_export",
+    "asof_join",
+    "categorize_columns",
+    "compression_for",
+    "decode_keys",
+    "encode_keys",
+    "ensure_index",
+    "estimate_join",
+    "export_frame",
+    "file_format",
+    "filter_chunks",
+    "filter_frame",
+    "frame_fingerprint",
+    "fuzzy_join",
+    "header_names",
+    "infer_schema",
+    "interval_join",
+    "is_sorted_on",
+    "join_with_index",
+    "external_sort",
+    "external_sort_frame",
+    "join_appended",
+    "join_frames",
+    "key_columns",
+    "load_frame",
+    "match_names",
+    "merge_join_files",
+    "merge_join_frames",
+    "normalize_columns",
+    "normalize_name",
+    "open_index",
+    "parallel_join",
+    "project_frames",
+    "projection",
+    "read_csv_chunks",
+    "read_frame",
+    "read_header",
+    "read_typed_csv",
+    "save_index",
+    "select_columns",
+    "sort_columns",
+    "sort_csv",
+    "sort_frame",
+    "sorted_merge_join",
+    "stream_join",
+    "stream_join_frames",
+]
@@ -0,0 +1,102 @@
+import numpy as np
+import pandas as pd
+
+from joinapp.schema import DATE_FORMATS
+
+# How an as-of join picks the Data 2 date for each Data 1 date: the latest one
+# on or before it, the earliest one on or after it, or the closest either way
+ASOF_DIRECTIONS = ["backward", "forward", "nearest"]
+
+# Rows sampled to work out the layout of a text date column
+DATE_SAMPLE_ROWS = 10_000
+
+# Helper columns carrying the parsed dates, Data 1 row positions and a match marker
+_ON = "__on"
+_POSITION = "__position"
+_MATCHED = "__matched"
+
+
+# Function to return a column as datetimes. Datetime columns are returned as
+# they are; text columns are parsed with the first DATE_FORMATS layout that
+# fits a sample of them, so day-first dates such as 20/10/2024 parse correctly.
+def as_dates(series):
+    if pd.api.types.is_datetime64_any_dtype(series.dtype):
+        return series
+    sample = series.dropna().iloc[:DATE_SAMPLE_ROWS].astype(str)
+    if sample.empty:
+        return pd.to_datetime(series.astype(object), errors="coerce")
+    for date_format in DATE_FORMATS:
+        if pd.to_datetime(sample, format=date_format, errors="coerce").notna().all():
+            return pd.to_datetime(series.astype(object), format=date_format, errors="coerce")
+    raise ValueError(f"Column {series.name!r} does not hold dates")
+
+
+# Function to join each left row to the right row of the same `by` keys whose
+# `on` date is nearest in `direction` (see ASOF_DIRECTIONS), optionally no more
+# than `tolerance` (a Timedelta or a string such as "7D") away. Both sides are
+# sorted on the date once and searched per key, so the cost is
+# O((n + m) log(n + m)) however many dates a name has. Left rows keep their
+# order; a left join keeps unmatched left rows. The right date comes out as
+# on + suffixes[1], and other shared columns get suffixes.
+def asof_join(left, right, on="date", by=("name",), how="left", direction="backward", tolerance=None,
+              suffixes=("_1", "_2")):
+    if direction not in ASOF_DIRECTIONS:
+        raise ValueError(f"Unknown as-of direction: {direction!r} (choose from {', '.join(ASOF_DIRECTIONS)})")
+    return _date_join(left, right, on, on, None, list(by), how, direction, tolerance, suffixes)
+
+
+# Function to join each left row to the right row of the same `by` keys whose
+# [start, end] date range holds its `on` date. Runs as a backward as-of search
+# on the range starts followed by a check of the range end, so each left row
+# is only checked against the range of its key that started last on or before
+# its date; ranges of one key are expected not to overlap. Left rows keep
+# their order; a left join keeps unmatched rows.
+def interval_join(left, right, start, end, on="date", by=("name",), how="left", suffixes=("_1", "_2")):
+    return _date_join(left, right, on, start, end, list(by), how, "backward", None, suffixes)
+
+
+# Function to run an as-of search of the left `on` dates against the right
+# `right_on` dates, then drop matches whose date is past the right `end` date
+def _date_join(left, right, on, right_on, end, by, how, direction, tolerance, suffixes):
+    if how not in ("inner", "left"):
+        raise ValueError(f"Date joins keep the rows of Data 1 and support inner or left joins, not {how!r}")
+    for frame, columns in ((left, by + [on]), (right, by + [right_on] + ([end] if end else []))):
+        missing = [col for col in columns if col not in frame.columns]
+        if missing:
+            raise KeyError(f"Missing date join columns: {', '.join(missing)}")
+
+    left_keyed = left.assign(**{_ON: as_dates(left[on]), _POSITION: np.arange(len(left))})
+    right_keyed = right.assign(**{_ON: as_dates(right[right_on]), _MATCHED: True})
+    if right_on == on:
+        # Keep the matched Data 2 date next to the Data 1 one
+        right_keyed = right_keyed.rename(columns={on: on + suffixes[1]})
+    for col in by:
+        if left_keyed[col].dtype != right_keyed[col].dtype:
+            # Categoricals with different dictionaries only compare as plain values
+            left_keyed[col] = left_keyed[col].astype(object)
+            right_keyed[col] = right_keyed[col].astype(object)
+
+    # merge_asof needs both sides sorted on the date and no missing dates
+    dated = left_keyed[_ON].notna()
+    right_keyed = right_keyed[right_keyed[_ON].notna()].sort_values(_ON, kind="mergesort")
+    if isinstance(tolerance, str):
+        tolerance = pd.Timedelta(tolerance)
+    joined = pd.merge_asof(
+        left_keyed[dated].sort_values(_ON, kind="mergesort"), right_keyed, on=_ON, by=by,
+        direction=direction, tolerance=tolerance, suffixes=suffixes,
+    )
+
+    matched = joined[_MATCHED].notna().to_numpy()
+    if end:
+        # Not in place: with copy-on-write to_numpy() gives a read-only view
+        matched = matched & (joined[_ON] <= as_dates(joined[end])).to_numpy()
+    if how == "inner":
+        joined = joined[matched]
+    else:
+        # merge_asof puts every left column (suffixed where shared) before the right ones
+        left_names = list(joined.columns[:len(left_keyed.columns)])
+        for col in joined.columns[len(left_names):]:
+            joined[col] = joined[col].where(matched)
+        joined = pd.concat([joined, left_keyed[~dated].set_axis(left_names, axis=1)], ignore_index=True)
+    joined = joined.sort_values(_POSITION, kind="mergesort", ignore_index=True)
+    return joined.drop(columns=[_ON, _POSITION, _MATCHED])
@@ -0,0 +1,244 @@
+import datetime
+import gc
+import json
+import os
+import platform
+import shutil
+import subprocess
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+from joinapp import engine, extsort
+from joinapp.resources import current_rss, peak_rss, reset_peak_rss
+from joinapp.writers import DEFAULT_BATCH_ROWS, write_csv
+
+# Stages timed for every generated data set, in run order
+STAGES = ["load_data1", "load_data2"] + [f"join_{how}" for how in engine.JOIN_TYPES] + [
+    "sort_result", "viewport_rows", "export_csv", "export_json",
+]
+
+# Statuses of the attendance schema and how often each is generated
+STATUSES = ["Present", "Absent", "Late"]
+STATUS_WEIGHTS = [0.8, 0.1, 0.1]
+
+# Rows generated and written per chunk, so large data sets never sit in memory
+GENERATE_CHUNK_ROWS = 1_000_000
+
+# Result rows the app keeps in its Treeview: a viewport plus overscan on each side
+VIEWPORT_ROWS = 30 + 2 * 50
+
+# Rows of a lazy cross join generated by its stage; building the LazyCrossJoin
+# itself costs nothing, so the stage times producing rows the way a grid page
+# or a streamed export does
+CROSS_JOIN_ROWS = 1_000_000
+
+# Rows above which the app sorts through extsort instead of in memory
+EXTERNAL_SORT_ROWS = 5_000_000
+
+
+# Function to write a synthetic pair of attendance files shaped like
+# attendance_set_1.csv and attendance_set_2_modified.csv (name, date, status).
+# skew is the Zipf exponent of how often each name appears (0 = uniform).
+# Data 2 keeps about 80% of Data 1's rows, changes the status of a tenth of
+# them and adds 20% new rows. Returns the two paths.
+def generate_attendance(directory, rows, skew=0.0, seed=0):
+    rng = np.random.default_rng(seed)
+    names_count = max(10, int(np.sqrt(rows)))
+    days = max(1, rows // names_count)
+    names = np.array([f"Person{i:06d}" for i in range(names_count)], dtype=object)
+    first_day = datetime.date(2020, 1, 1)
+    dates = np.array([(first_day + datetime.timedelta(days=i)).strftime("%d/%m/%Y") for i in range(days)], dtype=object)
+    weights = 1.0 / np.arange(1, names_count + 1) ** skew
+    weights /= weights.sum()
+
+    def attendance(count):
+        return pd.DataFrame({
+            "name": names[rng.choice(names_count, count, p=weights)],
+            "date": dates[rng.integers(0, days, count)],
+            "status": np.array(STATUSES, dtype=object)[rng.choice(len(STATUSES), count, p=STATUS_WEIGHTS)],
+        })
+
+    os.makedirs(directory, exist_ok=True)
+    path1 = os.path.join(directory, f"attendance_{rows}_{skew:g}_1.csv")
+    path2 = os.path.join(directory, f"attendance_{rows}_{skew:g}_2.csv")
+    for start in range(0, rows, GENERATE_CHUNK_ROWS):
+        count = min(GENERATE_CHUNK_ROWS, rows - start)
+        chunk1 = attendance(count)
+        chunk2 = chunk1[rng.random(count) < 0.8].copy()
+        changed = rng.random(len(chunk2)) < 0.1
+        chunk2.loc[changed, "status"] = np.array(STATUSES, dtype=object)[rng.integers(0, len(STATUSES), changed.sum())]
+        chunk2 = pd.concat([chunk2, attendance(count // 5)], ignore_index=True)
+        mode, header = ("w", True) if start == 0 else ("a", False)
+        chunk1.to_csv(path1, mode=mode, header=header, index=False)
+        chunk2.to_csv(path2, mode=mode, header=header, index=False)
+    return path1, path2
+
+
+# Function to run one stage, returning its value and a result record with the
+# wall time, the peak RSS while it ran and how far that peak rose above the start
+def measure(stage, func):
+    gc.collect()
+    reset_peak_rss()
+    before = current_rss()
+    started = time.perf_counter()
+    value = func()
+    seconds = time.perf_counter() - started
+    peak = peak_rss()
+    return value, {"stage": stage, "seconds": seconds, "peak_rss_bytes": peak, "rss_delta_bytes": max(0, peak - before)}
+
+
+# Function to time every stage on one generated data set. Stages run the way the
+# app runs them: loads through load_frame, joins through join_frames (the cross
+# join lazily, then its first CROSS_JOIN_ROWS rows generated in batches), the
+# sort and exports on the inner join result. viewport_rows builds the row values
+# of a grid viewport at the top, middle and end; inserting them into a Treeview
+# needs a display and is not timed.
+def run_stages(path1, path2, work_dir, repeat=1, categorical_keys=False, typed=False, stages=None):
+    stages = stages or STAGES
+    records = []
+
+    # Each stage keeps its fastest time and its largest memory figures over the repeats
+    def timed(stage, func):
+        runs = []
+        for _ in range(repeat):
+            value, record = measure(stage, func)
+            runs.append(record)
+        if stage in stages:
+            records.append({
+                "stage": stage,
+                "seconds": min(run["seconds"] for run in runs),
+                "peak_rss_bytes": max(run["peak_rss_bytes"] for run in runs),
+                "rss_delta_bytes": max(run["rss_delta_bytes"] for run in runs),
+                "output_rows": value if isinstance(value, int) else len(value),
+            })
+        return value
+
+    data1 = timed("load_data1", lambda: engine.load_frame(path1, None, categorical_keys, typed))
+    data2 = timed("load_data2", lambda: engine.load_frame(path2, None, categorical_keys, typed))
+    joined = {}
+    for how in engine.JOIN_TYPES:
+        if f"join_{how}" in stages or how == "inner":
+            if how == "cross":
+                joined[how] = timed("join_cross", lambda: cross_join_rows(data1, data2))
+                continue
+            joined[how] = timed(f"join_{how}", lambda: engine.join_frames(
+                data1, data2, how, lazy=True, categorical_keys=categorical_keys,
+            ))
+    result = joined["inner"]
+
+    if "sort_result" in stages:
+        def sort():
+            if len(result) > EXTERNAL_SORT_ROWS:
+                return extsort.external_sort_frame(result, "date", "name", tmp_dir=work_dir)
+            return engine.sort_frame(result, "date", "name")
+        timed("sort_result", sort)
+    if "viewport_rows" in stages:
+        def viewport_values():
+            values = []
+            for first in (0, len(result) // 2, max(0, len(result) - VIEWPORT_ROWS)):
+                values.extend(list(row) for row in result.iloc[first:first + VIEWPORT_ROWS].itertuples(index=False))
+            return values
+        timed("viewport_rows", viewport_values)
+    export_path = os.path.join(work_dir, "export")
+    if "export_csv" in stages:
+        timed("export_csv", lambda: write_csv(result, export_path))
+    if "export_json" in stages:
+        def export_json():
+            engine.export_frame(result, export_path, "json")
+            return len(result)
+        timed("export_json", export_json)
+    if os.path.exists(export_path):
+        os.remove(export_path)
+    return records
+
+
+# Function to build a lazy cross join and generate its first CROSS_JOIN_ROWS
+# rows batch by batch, dropping each batch; returns the number of rows made
+def cross_join_rows(data1, data2):
+    product = engine.join_frames(data1, data2, "cross", lazy=True)
+    rows = 0
+    for start in range(0, min(len(product), CROSS_JOIN_ROWS), DEFAULT_BATCH_ROWS):
+        rows += len(product.iloc[start:min(start + DEFAULT_BATCH_ROWS, CROSS_JOIN_ROWS)])
+    return rows
+
+
+# Function to benchmark every combination of row count and skew and return the
+# report: environment details plus one record per (rows, skew, stage)
+def run_benchmarks(rows_list, skews=(0.0,), seed=0, repeat=1, categorical_keys=False, typed=False, stages=None,
+                   work_dir=None):
+    own_dir = work_dir is None
+    work_dir = work_dir or tempfile.mkdtemp(prefix="joinapp-bench-")
+    results = []
+    try:
+        for rows in rows_list:
+            for skew in skews:
+                path1, path2 = generate_attendance(work_dir, rows, skew, seed)
+                for record in run_stages(path1, path2, work_dir, repeat, categorical_keys, typed, stages):
+                    results.append(dict(record, rows=rows, skew=skew))
+                for path in (path1, path2):
+                    os.remove(path)
+    finally:
+        if own_dir:
+            shutil.rmtree(work_dir, ignore_errors=True)
+
+    return {
+        "created": datetime.datetime.now(datetime.timezone.utc).isoformat(timespec="seconds"),
+        "commit": _git_commit(),
+        "python": platform.python_version(),
+        "pandas": pd.__version__,
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "options": {
+            "seed": seed, "repeat": repeat, "categorical_keys": categorical_keys, "typed": typed,
+        },
+        "results": results,
+    }
+
+
+# Function to write a report as indented JSON, one stable layout for diffing
+def save_report(report, path):
+    with open(path, "w") as file:
+        json.dump(report, file, indent=2, sort_keys=True)
+        file.write("\n")
+
+
+def load_report(path):
+    with open(path) as file:
+        return json.load(file)
+
+
+# Function to pair up the records of two reports by (rows, skew, stage) and give
+# the new/old ratios of wall time and peak RSS; ratios above 1 are regressions
+def compare_reports(old, new):
+    baseline = {(r["rows"], r["skew"], r["stage"]): r for r in old["results"]}
+    rows = []
+    for record in new["results"]:
+        before = baseline.get((record["rows"], record["skew"], record["stage"]))
+        if before is None:
+            continue
+        rows.append({
+            "rows": record["rows"],
+            "skew": record["skew"],
+            "stage": record["stage"],
+            "seconds": record["seconds"],
+            "seconds_ratio": record["seconds"] / before["seconds"] if before["seconds"] else None,
+            "peak_rss_ratio": (
+                record["peak_rss_bytes"] / before["peak_rss_bytes"] if before["peak_rss_bytes"] else None
+            ),
+        })
+    return rows
+
+
+# Function to find the commit being benchmarked, if this is a git checkout
+def _git_commit():
+    try:
+        completed = subprocess.run(
+            ["git", "rev-parse", "HEAD"], cwd=os.path.dirname(os.path.abspath(__file__)),
+            capture_output=True, text=True, timeout=10,
+        )
+    except (OSError, subprocess.SubprocessError):
+        return None
+    return completed.stdout.strip() or None
@@ -0,0 +1,89 @@
+import hashlib
+import os
+import tempfile
+
+# Default location and size cap of the on-disk frame cache
+DEFAULT_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "joinapp")
+DEFAULT_MAX_BYTES = 2 * 1024 ** 3
+
+CACHE_SUFFIX = ".feather"
+
+
+# On-disk cache of parsed frames stored as uncompressed Feather (Arrow IPC) files.
+# Entries are keyed by absolute path, size and modification time of the source
+# file, read back memory-mapped, and evicted least-recently-used first once the
+# cache grows past max_bytes. Needs pyarrow; without it every lookup misses.
+class FrameCache:
+    def __init__(self, directory=None, max_bytes=DEFAULT_MAX_BYTES):
+        self.directory = directory or os.environ.get("JOINAPP_CACHE_DIR", DEFAULT_CACHE_DIR)
+        self.max_bytes = max_bytes
+
+    # Function to build the cache file name for a source file in its current state.
+    # variant separates differently parsed copies of the same file.
+    def entry_path(self, source_path, variant=""):
+        stat = os.stat(source_path)
+        fingerprint = f"{os.path.abspath(source_path)}|{stat.st_size}|{stat.st_mtime_ns}|{variant}"
+        digest = hashlib.sha1(fingerprint.encode("utf-8")).hexdigest()
+        return os.path.join(self.directory, digest + CACHE_SUFFIX)
+
+    # Function to return the cached frame for a source file, or None on a miss
+    def get(self, source_path, variant=""):
+        try:
+            import pyarrow.feather as feather
+        except ImportError:
+            return None
+
+        entry = self.entry_path(source_path, variant)
+        if not os.path.exists(entry):
+            return None
+        try:
+            frame = feather.read_table(entry, memory_map=True).to_pandas()
+        except (OSError, ValueError):
+            return None
+        # Touch the entry so eviction sees it as recently used
+        os.utime(entry)
+        return frame
+
+    # Function to store a parsed frame for a source file; returns False if it cannot be cached
+    def put(self, source_path, frame, variant=""):
+        try:
+            import pyarrow as pa
+            import pyarrow.feather as feather
+        except ImportError:
+            return False
+
+        os.makedirs(self.directory, exist_ok=True)
+        entry = self.entry_path(source_path, variant)
+        handle, temp_path = tempfile.mkstemp(suffix=".tmp", dir=self.directory)
+        os.close(handle)
+        try:
+            feather.write_feather(frame.reset_index(drop=True), temp_path, compression="uncompressed")
+            os.replace(temp_path, entry)
+        except (pa.ArrowException, OSError, ValueError, TypeError):
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            return False
+        self.evict()
+        return True
+
+    # Function to drop least-recently-used entries until the cache fits in max_bytes
+    def evict(self):
+        entries = []
+        for name in os.listdir(self.directory):
+            if name.endswith(CACHE_SUFFIX):
+                stat = os.stat(os.path.join(self.directory, name))
+                entries.append((stat.st_mtime, stat.st_size, name))
+        total = sum(size for _, size, _ in entries)
+        for _, size, name in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            os.remove(os.path.join(self.directory, name))
+            total -= size
+
+    # Function to delete every cached frame
+    def clear(self):
+        if not os.path.isdir(self.directory):
+            return
+        for name in os.listdir(self.directory):
+            if name.endswith(CACHE_SUFFIX):
+                os.remove(os.path.join(self.directory, name))
@@ -0,0 +1,65 @@
+import numpy as np
+import pandas as pd
+
+from joinapp.engine import JOIN_TYPES, key_columns, project_frames
+
+# Rows of the larger input above which key frequencies are counted on a sample
+DEFAULT_SAMPLE_ROWS = 1_000_000
+
+# Rows measured per input to estimate the bytes each output row takes
+BYTES_SAMPLE_ROWS = 10_000
+
+
+# Function to predict how many rows, and roughly how many bytes, a join would
+# produce without running it. Key frequencies are counted on both sides and
+# multiplied per key. When the larger input has more than sample_rows rows only
+# keys whose hash falls in a fixed slice of the hash range are counted; both
+# sides keep the same keys, so every match of a sampled key is seen and the
+# counts scale up without bias. Returns {"rows", "bytes", "sampled"}.
+def estimate_join(left, right, how="inner", columns=None, sample_rows=DEFAULT_SAMPLE_ROWS):
+    how = how.strip().lower()
+    if how not in JOIN_TYPES:
+        raise ValueError(f"Unknown join type: {how!r}")
+    if columns:
+        left, right = project_frames(left, right, how, columns)
+    keys = [] if how == "cross" else key_columns(left, right)
+    row_bytes = _row_bytes(left, right, keys, columns)
+
+    if how == "cross":
+        rows = len(left) * len(right)
+        return {"rows": rows, "bytes": rows * row_bytes, "sampled": False}
+
+    left_hashes = pd.util.hash_pandas_object(left[keys], index=False).to_numpy()
+    right_hashes = pd.util.hash_pandas_object(right[keys], index=False).to_numpy()
+    rate = min(1.0, sample_rows / max(len(left), len(right), 1))
+    if rate < 1.0:
+        cutoff = np.uint64(rate * np.iinfo(np.uint64).max)
+        left_hashes = left_hashes[left_hashes < cutoff]
+        right_hashes = right_hashes[right_hashes < cutoff]
+
+    counts = pd.concat(
+        [pd.Series(left_hashes).value_counts(), pd.Series(right_hashes).value_counts()], axis=1, keys=["left", "right"],
+    ).fillna(0)
+    matched = float((counts["left"] * counts["right"]).sum())
+    rows = matched
+    if how in ("left", "outer"):
+        rows += float(counts["left"][counts["right"] == 0].sum())
+    if how in ("right", "outer"):
+        rows += float(counts["right"][counts["left"] == 0].sum())
+    rows = int(round(rows / rate))
+    return {"rows": rows, "bytes": rows * row_bytes, "sampled": rate < 1.0}
+
+
+# Function to measure the average bytes per output row from the first rows of
+# each input: every left column plus the right columns that are not join keys,
+# or only the requested columns if given
+def _row_bytes(left, right, keys, columns):
+    sizes = []
+    for frame, skip in ((left, []), (right, keys)):
+        head = frame.iloc[:BYTES_SAMPLE_ROWS].drop(columns=skip)
+        usage = head.memory_usage(index=False, deep=True) / max(len(head), 1)
+        sizes.extend(usage.items())
+    if columns:
+        # Shared columns of a cross join were renamed to their _x/_y output names
+        sizes = [(col, size) for col, size in sizes if col in columns]
+    return int(sum(size for _, size in sizes))
@@ -0,0 +1,255 @@
+import argparse
+import os
+import sys
+import time
+
+from joinapp import asof, bench, cardinality, engine, extsort, fuzzy, index, mergejoin, parallel, streaming
+from joinapp.cache import FrameCache
+
+
+# Function to build the command-line parser
+def build_parser():
+    parser = argparse.ArgumentParser(
+        prog="joinapp",
+        description="Join two data files without starting the GUI.",
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    join = commands.add_parser("join", help="join two data files on 'name' plus shared columns")
+    join.add_argument("left", help="left-hand file (Data 1): CSV, JSON, Parquet or Feather/Arrow")
+    join.add_argument("right", help="right-hand file (Data 2): CSV, JSON, Parquet or Feather/Arrow")
+    join.add_argument("--how", choices=engine.JOIN_TYPES, default="inner", help="join type (default: inner)")
+    join.add_argument("--out", required=True, help="output file; format is taken from the extension (.csv, .json, .jsonl[.gz|.zst], .parquet, .feather/.arrow)")
+    join.add_argument("--compression", choices=sorted(set(sum(engine.COMPRESSIONS.values(), []))), help="codec for Parquet (default: snappy), Feather/Arrow (default: lz4) or JSON Lines output (default: none)")
+    join.add_argument("--columns", nargs="+", metavar="COLUMN", help="output columns to keep; other columns are never read (join keys are read but dropped unless listed)")
+    join.add_argument("--left-where", metavar="EXPR", help="keep only left rows matching this filter, e.g. 'status == \"Late\"' (applied while reading)")
+    join.add_argument("--right-where", metavar="EXPR", help="keep only right rows matching this filter (applied while reading)")
+    join.add_argument("--sort-by", help="column to sort the result by")
+    join.add_argument("--then-by", help="secondary sort column")
+    join.add_argument("--order", choices=engine.SORT_ORDERS, default="Ascending", help="sort order (default: Ascending)")
+    join.add_argument("--chunksize", type=int, help="stream the larger input in chunks of this many rows (CSV output only)")
+    join.add_argument("--workers", type=int, help="hash-partition the join across this many processes")
+    join.add_argument("--categorical-keys", action="store_true", help="load text columns as categoricals and merge on shared dictionary codes")
+    join.add_argument("--typed", action="store_true", help="parse inputs with an inferred schema (dates, categoricals, downcast ints)")
+    join.add_argument("--save-schema", action="store_true", help="with --typed, write the inferred schema next to each input as <file>.schema.json")
+    join.add_argument("--cache", action="store_true", help="reuse parsed inputs from the on-disk frame cache (see JOINAPP_CACHE_DIR)")
+    join.add_argument("--presorted", action="store_true", help="both inputs are sorted on the join columns: stream them through a sort-merge join (CSV output only)")
+    join.add_argument("--right-index", metavar="DIR", help="probe a saved index of the right file in DIR (built there first if missing or stale)")
+    join.add_argument("--run-rows", type=int, default=1_000_000, help="rows per sorted run when sorting streamed output (default: 1000000)")
+    join.add_argument("--fuzzy", type=float, nargs="?", const=fuzzy.DEFAULT_THRESHOLD, metavar="THRESHOLD", help=f"match names that are only similar (0-1, default when given: {fuzzy.DEFAULT_THRESHOLD}); adds name_2 and name_score columns")
+    join.add_argument("--asof", choices=asof.ASOF_DIRECTIONS, help="match each left row to the right row of the same name with the latest earlier (backward), earliest later (forward) or nearest date; inner or left joins only")
+    join.add_argument("--tolerance", metavar="DELTA", help="with --asof, the furthest apart matched dates may be, e.g. 7D or 12h")
+    join.add_argument("--date-range", nargs=2, metavar=("START", "END"), help="match each left row to the right row of the same name whose START-END date range holds its date; inner or left joins only")
+    join.add_argument("--max-rows", type=_row_count, metavar="N", help="refuse a join, cross joins included, predicted to produce more than N rows (stream keyed joins with --chunksize instead)")
+    join.set_defaults(func=run_join)
+
+    build = commands.add_parser("index", help="build a saved key index for a file that is joined repeatedly")
+    build.add_argument("input", help="CSV file to index, usually the right-hand reference table")
+    build.add_argument("--keys", nargs="+", required=True, help="join columns to index on, e.g. --keys name date")
+    build.add_argument("--out", required=True, metavar="DIR", help="directory to write the index to")
+    build.add_argument("--typed", action="store_true", help="parse the file with an inferred schema, as join --typed does")
+    build.add_argument("--where", metavar="EXPR", help="index only rows matching this filter, as join --right-where does")
+    build.set_defaults(func=run_index)
+
+    sort = commands.add_parser("sort", help="sort a CSV file that may not fit in memory")
+    sort.add_argument("input", help="CSV file to sort")
+    sort.add_argument("--out", required=True, help="sorted CSV file to write")
+    sort.add_argument("--sort-by", help="column to sort by")
+    sort.add_argument("--then-by", help="secondary sort column")
+    sort.add_argument("--order", choices=engine.SORT_ORDERS, default="Ascending", help="sort order (default: Ascending)")
+    sort.add_argument("--run-rows", type=int, default=1_000_000, help="rows sorted in memory per spilled run (default: 1000000)")
+    sort.set_defaults(func=run_sort)
+
+    benchmark = commands.add_parser("bench", help="time load, join, sort, display and export on generated attendance data")
+    benchmark.add_argument("--rows", type=_row_count, nargs="+", default=[1_000, 100_000], help="Data 1 sizes to generate, e.g. 1e3 1e6 (default: 1e3 1e5)")
+    benchmark.add_argument("--skew", type=float, nargs="+", default=[0.0], help="Zipf exponents of the name distribution; 0 is uniform (default: 0)")
+    benchmark.add_argument("--seed", type=int, default=0, help="random seed of the generator (default: 0)")
+    benchmark.add_argument("--repeat", type=int, default=1, help="runs per stage; the fastest is reported (default: 1)")
+    benchmark.add_argument("--stages", nargs="+", choices=bench.STAGES, help="stages to report (default: all)")
+    benchmark.add_argument("--categorical-keys", action="store_true", help="load text columns as categoricals, as the app does by default")
+    benchmark.add_argument("--typed", action="store_true", help="load with an inferred schema")
+    benchmark.add_argument("--work-dir", help="directory for generated files and exports (default: a temporary directory)")
+    benchmark.add_argument("--out", required=True, help="JSON report to write")
+    benchmark.add_argument("--compare", metavar="BASELINE", help="earlier JSON report to compare against")
+    benchmark.set_defaults(func=run_bench)
+
+    return parser
+
+
+# Function to parse row counts given as integers or in scientific notation (1e6)
+def _row_count(text):
+    try:
+        rows = int(float(text))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid row count: {text!r}") from None
+    if rows < 1:
+        raise argparse.ArgumentTypeError(f"row count must be positive: {text!r}")
+    return rows
+
+
+# Function to run the 'join' command
+def run_join(args):
+    started = time.perf_counter()
+    left_header, right_header = engine.read_header(args.left), engine.read_header(args.right)
+    if args.fuzzy is not None and args.how != "cross" and (args.presorted or args.chunksize or args.right_index or args.max_rows):
+        raise ValueError("--fuzzy cannot be used with --presorted, --chunksize, --right-index or --max-rows")
+    date_join = bool(args.asof or args.date_range)
+    if args.tolerance and not args.asof:
+        raise ValueError("--tolerance needs --asof")
+    if date_join and (args.asof and args.date_range or args.fuzzy is not None or args.presorted or args.chunksize
+                      or args.right_index or args.workers or args.max_rows):
+        raise ValueError("--asof and --date-range cannot be combined with each other or with --fuzzy, --presorted, "
+                         "--chunksize, --right-index, --workers or --max-rows")
+    left_columns = right_columns = None
+    if args.columns:
+        missing = [col for col in engine.sort_columns(args.sort_by, args.then_by) if col not in args.columns]
+        if missing:
+            raise ValueError(f"Sort columns must be among --columns: {', '.join(missing)}")
+    if args.columns and not date_join:
+        # Date joins name their output columns differently and read every column
+        read_columns = args.columns
+        if args.fuzzy is not None and args.how != "cross":
+            read_columns = [col for col in args.columns if col not in engine.fuzzy_output_columns()]
+        left_map, right_map = engine.projection(left_header.columns, right_header.columns, args.how, read_columns)
+        left_columns, right_columns = list(left_map), list(right_map)
+
+    if (args.presorted or args.chunksize) and args.how != "cross":
+        for path in (args.left, args.right, args.out):
+            if engine.file_format(path, default="csv") != "csv":
+                raise ValueError(f"--presorted and --chunksize read and write CSV files only, not {path}")
+        if args.presorted:
+            chunksize = args.chunksize or mergejoin.DEFAULT_CHUNK_ROWS
+            join_to = lambda path: mergejoin.merge_join_files(
+                args.left, args.right, path, args.how, chunksize, args.columns, args.left_where, args.right_where,
+            )
+            keys = engine.key_columns(left_header, right_header)
+        else:
+            join_to = lambda path: streaming.stream_join(
+                args.left, args.right, path, args.how, args.chunksize, args.columns, args.left_where, args.right_where,
+            )
+            keys = []
+
+        sort_by = engine.sort_columns(args.sort_by, args.then_by)
+        already_sorted = args.order == "Ascending" and keys[:len(sort_by)] == sort_by
+        if not (sort_by or args.order == "Random") or already_sorted:
+            return report(join_to(args.out), args.out, started)
+
+        # Join into a scratch file next to the output, then sort it out of core
+        unsorted_path = args.out + ".unsorted"
+        try:
+            join_to(unsorted_path)
+            rows = extsort.sort_csv(unsorted_path, args.out, args.sort_by, args.then_by, args.order, args.run_rows)
+        finally:
+            if os.path.exists(unsorted_path):
+                os.remove(unsorted_path)
+        return report(rows, args.out, started)
+
+    cache = FrameCache() if args.cache else None
+    left = engine.load_frame(
+        args.left, cache, args.categorical_keys, args.typed, args.save_schema, left_columns, args.left_where,
+    )
+    if args.right_index and args.how != "cross":
+        if args.max_rows:
+            raise ValueError("--max-rows cannot be used with --right-index; the right file is not loaded to estimate from")
+        keys = engine.key_columns(left_header, right_header)
+        # The right file is indexed as it would be loaded, so both sides' keys compare alike
+        right_index = index.ensure_index(args.right_index, keys, args.right, typed=args.typed, where=args.right_where)
+        result = engine.select_columns(index.join_with_index(left, right_index, args.how), args.columns)
+        if args.sort_by or args.order == "Random":
+            result = engine.sort_frame(result, args.sort_by, args.then_by, args.order)
+        engine.export_frame(result, args.out, compression=args.compression)
+        return report(len(result), args.out, started)
+
+    right = engine.load_frame(
+        args.right, cache, args.categorical_keys, args.typed, args.save_schema, right_columns, args.right_where,
+    )
+    if args.columns and args.how == "cross" and not date_join:
+        # A shared column read from one side only must keep its _x/_y name
+        left, right = left.rename(columns=left_map), right.rename(columns=right_map)
+    if args.max_rows:
+        estimate = cardinality.estimate_join(left, right, args.how, args.columns)
+        if estimate["rows"] > args.max_rows:
+            if args.how == "cross":
+                advice = "narrow the inputs with --left-where and --right-where"
+            else:
+                advice = "join CSV files with --chunksize to stream the result instead"
+            raise ValueError(
+                f"{args.how} join is expected to produce about {estimate['rows']:,} rows, more than --max-rows "
+                f"{args.max_rows:,}; {advice}"
+            )
+    if date_join:
+        result = engine.join_frames(
+            left, right, args.how, columns=args.columns, asof=args.asof, tolerance=args.tolerance, date_range=args.date_range,
+        )
+    elif args.fuzzy is not None:
+        result = engine.join_frames(
+            left, right, args.how, lazy=True, columns=args.columns, fuzzy_threshold=args.fuzzy, fuzzy_workers=args.workers or 1,
+        )
+    elif args.workers:
+        if args.columns:
+            left, right = engine.project_frames(left, right, args.how, args.columns)
+        result = parallel.parallel_join(left, right, args.how, workers=args.workers, categorical_keys=args.categorical_keys)
+        result = engine.select_columns(result, args.columns)
+    else:
+        result = engine.join_frames(left, right, args.how, lazy=True, categorical_keys=args.categorical_keys, columns=args.columns)
+    if args.sort_by or args.order == "Random":
+        result = engine.sort_frame(result, args.sort_by, args.then_by, args.order)
+    engine.export_frame(result, args.out, compression=args.compression)
+    return report(len(result), args.out, started)
+
+
+# Function to run the 'index' command
+def run_index(args):
+    started = time.perf_counter()
+    frame = engine.load_frame(args.input, typed=args.typed, where=args.where)
+    saved = index.save_index(frame, args.keys, args.out, args.input, args.typed, args.where)
+    elapsed = time.perf_counter() - started
+    print(f"Indexed {len(saved)} rows of {args.input} on {args.keys} into {args.out} in {elapsed:.2f}s", file=sys.stderr)
+    return 0
+
+
+# Function to run the 'sort' command
+def run_sort(args):
+    started = time.perf_counter()
+    rows = extsort.sort_csv(args.input, args.out, args.sort_by, args.then_by, args.order, args.run_rows)
+    return report(rows, args.out, started)
+
+
+# Function to run the 'bench' command
+def run_bench(args):
+    report = bench.run_benchmarks(
+        args.rows, args.skew, args.seed, args.repeat, args.categorical_keys, args.typed, args.stages, args.work_dir,
+    )
+    bench.save_report(report, args.out)
+    for record in report["results"]:
+        print(
+            f"{record['rows']:>11} rows  skew {record['skew']:<4g} {record['stage']:<16}"
+            f"{record['seconds']:9.3f}s {record['peak_rss_bytes'] / 1024 ** 2:9.1f} MB peak",
+            file=sys.stderr,
+        )
+    if args.compare:
+        for row in bench.compare_reports(bench.load_report(args.compare), report):
+            seconds_ratio = f"{row['seconds_ratio']:.2f}x" if row["seconds_ratio"] is not None else "n/a"
+            rss_ratio = f"{row['peak_rss_ratio']:.2f}x" if row["peak_rss_ratio"] is not None else "n/a"
+            print(
+                f"{row['rows']:>11} rows  skew {row['skew']:<4g} {row['stage']:<16} time {seconds_ratio:>7}  peak RSS {rss_ratio:>7}",
+                file=sys.stderr,
+            )
+    print(f"Report written to {args.out}", file=sys.stderr)
+    return 0
+
+
+# Function to print a one-line summary of a finished command
+def report(rows, out_path, started):
+    elapsed = time.perf_counter() - started
+    print(f"{rows} rows written to {out_path} in {elapsed:.2f}s", file=sys.stderr)
+    return 0
+
+
+def main(argv=None):
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    try:
+        return args.func(args)
+    except (OSError, KeyError, ValueError) as e:
+        parser.exit(1, f"joinapp: error: {e}\n")
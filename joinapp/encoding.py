@@ -0,0 +1,72 @@
+import pandas as pd
+
+# Columns whose distinct values are at most this share of their rows become categorical
+DEFAULT_MAX_UNIQUE_RATIO = 0.5
+
+
+# Function to check whether a column holds strings (object or string dtype)
+def is_text(series):
+    return series.dtype == object or pd.api.types.is_string_dtype(series.dtype)
+
+
+# Function to store low-cardinality text columns of a freshly parsed frame as
+# categoricals: one small dictionary plus an integer code per row instead of a
+# Python string per cell.
+def categorize_columns(frame, max_unique_ratio=DEFAULT_MAX_UNIQUE_RATIO):
+    for col in frame.columns:
+        series = frame[col]
+        if is_text(series) and series.nunique(dropna=True) <= max_unique_ratio * max(len(series), 1):
+            frame[col] = series.astype("category")
+    return frame
+
+
+# Function to give the join columns of both sides one shared categorical
+# dictionary (the sorted union of their values), so merge() matches integer
+# codes instead of hashing strings. Applies to join columns that are
+# categorical on at least one side. Returns new frames; the inputs are untouched.
+# Also returns the original key dtypes so decode_keys can restore them.
+def encode_keys(left, right, keys):
+    original_dtypes = {}
+    left_encoded = {}
+    right_encoded = {}
+    for col in keys:
+        left_col, right_col = left[col], right[col]
+        left_categorical = isinstance(left_col.dtype, pd.CategoricalDtype)
+        right_categorical = isinstance(right_col.dtype, pd.CategoricalDtype)
+        if not ((left_categorical or is_text(left_col)) and (right_categorical or is_text(right_col))):
+            continue
+        if not (left_categorical or right_categorical):
+            # Encoding plain text here would cost as much as the hashing it saves;
+            # categorize_columns at load time is what makes this path pay off
+            continue
+        if left_categorical and right_categorical and left_col.cat.categories.equals(right_col.cat.categories):
+            continue
+
+        left_values = left_col.cat.categories if left_categorical else left_col.dropna().unique()
+        right_values = right_col.cat.categories if right_categorical else right_col.dropna().unique()
+        categories = pd.Index(left_values).union(pd.Index(right_values))
+        original_dtypes[col] = left_col.dtype
+        left_encoded[col] = _with_categories(left_col, categories)
+        right_encoded[col] = _with_categories(right_col, categories)
+
+    if left_encoded:
+        left = left.assign(**left_encoded)
+        right = right.assign(**right_encoded)
+    return left, right, original_dtypes
+
+
+# Function to turn encoded join columns of a result back into their original dtypes
+def decode_keys(result, original_dtypes):
+    decoded = {
+        col: result[col].astype(dtype)
+        for col, dtype in original_dtypes.items()
+        if col in result.columns and not isinstance(dtype, pd.CategoricalDtype)
+    }
+    return result.assign(**decoded) if decoded else result
+
+
+# Function to recode one column onto the shared categories
+def _with_categories(series, categories):
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        return series.cat.set_categories(categories)
+    return pd.Categorical(series, categories=categories)
@@ -0,0 +1,420 @@
+import os
+
+import numpy as np
+import pandas as pd
+
+from joinapp.asof import asof_join, interval_join
+from joinapp.encoding import categorize_columns, decode_keys, encode_keys
+from joinapp.filters import FILTER_CHUNK_ROWS, filter_chunks, filter_columns, filter_frame
+from joinapp.fuzzy import SCORE_COLUMN, fuzzy_join
+from joinapp.lazy import LazyCrossJoin
+from joinapp.schema import read_typed_csv
+from joinapp.writers import (
+    COMPRESSED_EXTENSIONS,
+    compression_from_path,
+    frame_batches,
+    write_csv,
+    write_json_array,
+    write_json_lines,
+)
+
+# Join kinds offered by the join_type combobox, in display order
+JOIN_TYPES = ["inner", "left", "right", "outer", "cross"]
+
+# Orders offered by the sort_order_choice combobox
+SORT_ORDERS = ["Ascending", "Descending", "Random"]
+
+# Suffixes given to overlapping non-key columns
+JOIN_SUFFIXES = ("_1", "_2")
+
+# File formats by extension. Feather v2 files are Arrow IPC files, so .arrow and
+# .ipc are read and written the same way. Text formats may add .gz or .zst.
+FILE_FORMATS = {
+    ".csv": "csv",
+    ".json": "json",
+    ".jsonl": "jsonl",
+    ".ndjson": "jsonl",
+    ".parquet": "parquet",
+    ".pq": "parquet",
+    ".feather": "feather",
+    ".arrow": "feather",
+    ".ipc": "feather",
+}
+
+# Compression codecs of the binary formats and JSON Lines; the first one is the default
+COMPRESSIONS = {
+    "jsonl": ["none", "gzip", "zstd"],
+    "parquet": ["snappy", "zstd", "gzip", "lz4", "brotli", "none"],
+    "feather": ["lz4", "zstd", "uncompressed"],
+}
+
+
+# Function to name the format of a file: the given fmt (with "arrow"/"ipc" meaning
+# feather), else the one its extension maps to in FILE_FORMATS, else default.
+def file_format(path, fmt=None, default=None):
+    if fmt:
+        fmt = fmt.lower()
+        return "feather" if fmt in ("arrow", "ipc") else fmt
+    stem, extension = os.path.splitext(path)
+    if extension.lower() in COMPRESSED_EXTENSIONS:
+        extension = os.path.splitext(stem)[1]
+    fmt = FILE_FORMATS.get(extension.lower(), default)
+    if fmt is None:
+        raise ValueError(f"Unsupported file format: {extension or path!r}")
+    return fmt
+
+
+# Function to pick the compression codec for a binary format, checking it is known
+def compression_for(fmt, compression=None):
+    if fmt not in COMPRESSIONS:
+        return None
+    codec = (compression or COMPRESSIONS[fmt][0]).lower()
+    if codec not in COMPRESSIONS[fmt]:
+        raise ValueError(f"Unsupported {fmt} compression: {codec!r} (choose from {', '.join(COMPRESSIONS[fmt])})")
+    return codec
+
+
+# Function to read a JSON, JSON Lines, Parquet or Feather/Arrow file. The binary
+# formats are read memory-mapped, so only the pages pyarrow touches are paged in,
+# and with columns (names as stored in the file) only those columns are read.
+# With a where filter (see filter_frame) the binary formats are read one record
+# batch at a time and only matching rows are kept; headers come back normalized.
+def read_frame(path, fmt, columns=None, where=None):
+    if fmt in ("json", "jsonl"):
+        frame = pd.read_json(path, orient="records", lines=fmt == "jsonl")
+        if columns is not None:
+            frame = frame[list(columns)]
+        return frame if where is None else filter_frame(normalize_columns(frame), where)
+    if where is not None and fmt in ("parquet", "feather"):
+        return filter_chunks((normalize_columns(batch.to_pandas()) for batch in _record_batches(path, fmt, columns)), where)
+    if fmt == "parquet":
+        import pyarrow.parquet as pq
+
+        return pq.read_table(path, columns=columns, memory_map=True).to_pandas()
+    if fmt == "feather":
+        import pyarrow.feather as feather
+
+        return feather.read_table(path, columns=columns, memory_map=True).to_pandas()
+    raise ValueError(f"Unsupported input format: {fmt!r}")
+
+
+# Function to read a Parquet or Feather/Arrow file as record batches, starting with
+# an empty one so an empty file still has its columns
+def _record_batches(path, fmt, columns):
+    import pyarrow as pa
+
+    if fmt == "parquet":
+        import pyarrow.parquet as pq
+
+        parquet_file = pq.ParquetFile(path, memory_map=True)
+        schema = parquet_file.schema_arrow
+        batches = parquet_file.iter_batches(batch_size=FILTER_CHUNK_ROWS, columns=columns)
+    else:
+        reader = pa.ipc.open_file(pa.memory_map(path))
+        schema = reader.schema
+        batches = (reader.get_batch(i) for i in range(reader.num_record_batches))
+        if columns is not None:
+            batches = (batch.select(columns) for batch in batches)
+    if columns is not None:
+        schema = pa.schema([schema.field(col) for col in columns])
+    yield pa.RecordBatch.from_pylist([], schema=schema)
+    yield from batches
+
+
+# Function to list the column names of a data file as stored, before normalize_columns
+def header_names(path):
+    fmt = file_format(path, default="csv")
+    if fmt == "csv":
+        return list(pd.read_csv(path, nrows=0).columns)
+    if fmt == "parquet":
+        import pyarrow.parquet as pq
+
+        return pq.read_schema(path, memory_map=True).names
+    if fmt == "feather":
+        import pyarrow as pa
+
+        return pa.ipc.open_file(pa.memory_map(path)).schema.names
+    return list(read_frame(path, fmt).columns)
+
+
+# Function to read just the header of a data file, as an empty frame
+def read_header(path):
+    return normalize_columns(pd.DataFrame(columns=header_names(path)))
+
+
+# Function to read a CSV file in chunks with normalized headers. Only `usecols`
+# (normalized names) plus the columns a where filter needs are parsed, and only
+# rows matching the filter are yielded.
+def read_csv_chunks(path, chunksize, usecols=None, where=None):
+    raw_columns = None
+    if usecols is not None:
+        header = header_names(path)
+        needed = set(usecols) | ({col.strip() for col in filter_columns(where, header)} if where else set())
+        raw_columns = [col for col in header if col.strip() in needed]
+    for chunk in pd.read_csv(path, chunksize=chunksize, usecols=raw_columns):
+        chunk = normalize_columns(chunk)
+        yield chunk if where is None else filter_frame(chunk, where)
+
+
+# Function to read a data file into a DataFrame, going through a FrameCache if given.
+# Files whose extension is not in FILE_FORMATS are read as CSV.
+# With categorize=True low-cardinality text columns are stored as categoricals.
+# With typed=True a CSV file is parsed with an inferred (or sidecar) schema, see
+# read_typed_csv; save_schema writes the inferred schema next to the file.
+# With usecols (normalized column names, e.g. from projection) no other column is
+# parsed or kept. With where (a filter_frame expression) the file is parsed in
+# chunks and only matching rows are kept; columns the filter needs are read even
+# if usecols leaves them out. JSON and binary files carry their own types and skip the cache.
+def load_frame(path, cache=None, categorize=False, typed=False, save_schema=False, usecols=None, where=None):
+    fmt = file_format(path, default="csv")
+    raw_columns = keep = None
+    if usecols is not None:
+        header = header_names(path)
+        wanted = set(usecols)
+        keep = [col.strip() for col in header if col.strip() in wanted]
+        needed = wanted | {col.strip() for col in filter_columns(where, header)} if where else wanted
+        raw_columns = [col for col in header if col.strip() in needed]
+    if fmt != "csv":
+        frame = normalize_columns(read_frame(path, fmt, raw_columns, where))
+        if keep is not None and len(keep) < frame.shape[1]:
+            frame = frame[keep]
+        return categorize_columns(frame) if categorize else frame
+
+    variant = "typed" if typed else ""
+    if raw_columns is not None:
+        variant += "|" + ",".join(raw_columns)
+    if where:
+        variant += "|where:" + where
+    if cache is not None:
+        frame = cache.get(path, variant)
+        if frame is not None:
+            return categorize_columns(frame) if categorize else frame
+
+    chunksize = FILTER_CHUNK_ROWS if where else None
+    if typed:
+        reader = read_typed_csv(path, save=save_schema, usecols=raw_columns, chunksize=chunksize)
+    else:
+        reader = pd.read_csv(path, usecols=raw_columns, chunksize=chunksize)
+    if where:
+        frame = filter_chunks((normalize_columns(chunk) for chunk in reader), where, keep)
+    else:
+        frame = normalize_columns(reader)
+    if cache is not None:
+        # Cached as parsed, so loads with and without categorize share the entry
+        cache.put(path, frame, variant)
+    return categorize_columns(frame) if categorize else frame
+
+
+# Function to strip stray whitespace from the headers of a freshly parsed frame.
+# Done once at load time so joins never have to touch the loaded frames.
+def normalize_columns(frame):
+    frame.columns = frame.columns.str.strip()
+    return frame
+
+
+# Function to list the join keys: 'name' plus every other column both sides share
+def key_columns(left, right):
+    shared = [col for col in left.columns if col in right.columns and col != 'name']
+    return ['name'] + shared
+
+
+# Function to check whether a frame is sorted ascending on the given columns
+def is_sorted_on(frame, keys):
+    if len(frame) < 2:
+        return True
+    if len(frame) > 1000 and not is_sorted_on(frame.iloc[:1000], keys):
+        # Most unsorted inputs give themselves away in the first rows
+        return False
+    if frame[keys].isna().any().any():
+        return False
+    # Compare each row with the next one, column by column, without hashing anything
+    greater = np.zeros(len(frame) - 1, dtype=bool)
+    equal_so_far = np.ones(len(frame) - 1, dtype=bool)
+    for col in keys:
+        values = frame[col].to_numpy()
+        greater |= equal_so_far & (values[1:] > values[:-1])
+        equal_so_far &= values[1:] == values[:-1]
+    return bool((greater | equal_so_far).all())
+
+
+# Function to work out which input columns a join needs to produce the output
+# `columns`: the requested columns of each side plus, except for cross joins,
+# every join key. Returns one {input name: output name} dict per side; output
+# names differ only for shared columns of a cross join, which come out as _x/_y.
+def projection(left_columns, right_columns, how, columns):
+    left_columns, right_columns = list(left_columns), list(right_columns)
+    wanted = set(columns)
+    if how == "cross":
+        keys = []
+        output = list(pd.DataFrame(columns=left_columns).merge(pd.DataFrame(columns=right_columns), how="cross").columns)
+    else:
+        keys = key_columns(pd.DataFrame(columns=left_columns), pd.DataFrame(columns=right_columns))
+        output = left_columns + [col for col in right_columns if col not in keys]
+    unknown = [col for col in columns if col not in output]
+    if unknown:
+        raise ValueError(f"Unknown output columns: {', '.join(unknown)}")
+
+    left_names = output[:len(left_columns)]
+    right_names = output[len(left_columns):] if how == "cross" else right_columns
+    left_map = {col: name for col, name in zip(left_columns, left_names) if col in keys or name in wanted}
+    right_map = {col: name for col, name in zip(right_columns, right_names) if col in keys or name in wanted}
+    return left_map, right_map
+
+
+# Function to cut both inputs down to the columns projection() keeps, renaming
+# shared cross join columns to their suffixed names so merge leaves them alone
+def project_frames(left, right, how, columns):
+    left_map, right_map = projection(left.columns, right.columns, how.strip().lower(), columns)
+    projected = []
+    for frame, mapping in ((left, left_map), (right, right_map)):
+        frame = frame[list(mapping)]
+        if any(col != name for col, name in mapping.items()):
+            frame = frame.rename(columns=mapping)
+        projected.append(frame)
+    return projected[0], projected[1]
+
+
+# Function to name the columns a fuzzy join adds: the matched Data 2 name and its score
+def fuzzy_output_columns():
+    return ["name" + JOIN_SUFFIXES[1], SCORE_COLUMN]
+
+
+# Function to put a join result's columns in the requested order, dropping the
+# join keys nobody asked for. A LazyCrossJoin keeps left-then-right order.
+def select_columns(result, columns):
+    if not columns or isinstance(result, LazyCrossJoin) or list(result.columns) == list(columns):
+        return result
+    selected = result[list(columns)]
+    selected.attrs = dict(result.attrs)
+    if any(col not in columns for col in selected.attrs.get("sorted_by", [])):
+        selected.attrs.pop("sorted_by")
+    return selected
+
+
+# Function to join two frames the same way the Join Data button does.
+# With lazy=True a cross join returns a LazyCrossJoin instead of a DataFrame.
+# With categorical_keys=True text join columns are merged through a shared
+# categorical dictionary and decoded back to their original dtypes afterwards.
+# With check_sorted=True a result whose inputs are both sorted on the join
+# columns is marked as sorted on them: merge() keeps left, right or key order,
+# so the rows already come out in key order and sort_frame can skip them.
+# With columns only those output columns are carried through the merge.
+# With fuzzy_threshold names only need to be that similar (see fuzzy_join);
+# the matching runs on fuzzy_workers forked processes.
+# With asof (a direction from ASOF_DIRECTIONS) each Data 1 row of an inner or
+# left join is matched per name to the nearest Data 2 date, at most tolerance
+# away; with date_range (a start and an end column of Data 2) to the range
+# holding its date. Date joins read every column; columns are picked after.
+def join_frames(left, right, how="inner", lazy=False, categorical_keys=False, check_sorted=False, columns=None,
+                fuzzy_threshold=None, fuzzy_workers=1, asof=None, tolerance=None, date_range=None):
+    how = how.strip().lower()
+    if how not in JOIN_TYPES:
+        raise ValueError(f"Unknown join type: {how!r}")
+    if asof or date_range:
+        if fuzzy_threshold is not None:
+            raise ValueError("Fuzzy names cannot be combined with an as-of or date range join")
+        if date_range:
+            result = interval_join(left, right, *date_range, how=how, suffixes=JOIN_SUFFIXES)
+        else:
+            result = asof_join(left, right, how=how, direction=asof, tolerance=tolerance, suffixes=JOIN_SUFFIXES)
+        return select_columns(result, columns)
+    fuzzy = fuzzy_threshold is not None and how != "cross"
+    if columns:
+        # The matched name and its score are made by the join, not read from an input
+        fuzzy_columns = fuzzy_output_columns() if fuzzy else []
+        left, right = project_frames(left, right, how, [col for col in columns if col not in fuzzy_columns])
+
+    if fuzzy:
+        keys = key_columns(left, right)
+        result = fuzzy_join(left, right, keys, how, fuzzy_threshold, workers=fuzzy_workers, suffixes=JOIN_SUFFIXES)
+        return select_columns(result, columns)
+
+    if how == "cross":
+        if lazy:
+            return LazyCrossJoin(left, right)
+        return select_columns(left.merge(right, how="cross"), columns)
+
+    keys = key_columns(left, right)
+    presorted = check_sorted and is_sorted_on(left, keys) and is_sorted_on(right, keys)
+    if categorical_keys:
+        left, right, original_dtypes = encode_keys(left, right, keys)
+        result = left.merge(right, on=keys, how=how, suffixes=JOIN_SUFFIXES)
+        if how == "outer" and result[keys].isna().any().any():
+            # Outer joins sort on the keys, missing categorical codes first; put
+            # them last, as merging the plain values does
+            result = result.sort_values(keys, kind="mergesort", ignore_index=True)
+        result = decode_keys(result, original_dtypes)
+    else:
+        result = left.merge(right, on=keys, how=how, suffixes=JOIN_SUFFIXES)
+    if presorted:
+        result.attrs["sorted_by"] = keys
+    return select_columns(result, columns)
+
+
+# Function to resolve the primary and secondary sort widgets into sort columns
+def sort_columns(by=None, then_by=None):
+    if by and then_by and by != then_by:
+        return [by, then_by]
+    if by:
+        return [by]
+    return []
+
+
+# Function to sort a join result by up to two columns, or shuffle it.
+# Frames already marked as sorted on the requested columns (attrs["sorted_by"])
+# are returned unchanged for an ascending sort.
+def sort_frame(frame, by=None, then_by=None, order="Ascending"):
+    if order not in SORT_ORDERS:
+        raise ValueError(f"Unknown sort order: {order!r}")
+
+    ascending = order == "Ascending"
+    if isinstance(frame, LazyCrossJoin):
+        columns = sort_columns(by, then_by)
+        if order != "Random" and frame.can_sort_lazily(columns):
+            return frame.sort_lazily(columns, ascending)
+        if order != "Random" and not columns:
+            return frame
+        frame = frame.to_frame()
+
+    if order == "Random":
+        shuffled = frame.sample(frac=1).reset_index(drop=True)
+        shuffled.attrs.pop("sorted_by", None)
+        return shuffled
+
+    columns = sort_columns(by, then_by)
+    if not columns:
+        return frame
+    if ascending and frame.attrs.get("sorted_by", [])[:len(columns)] == columns:
+        return frame
+    sorted_frame = frame.sort_values(by=columns, ascending=ascending)
+    if ascending:
+        sorted_frame.attrs["sorted_by"] = columns
+    else:
+        sorted_frame.attrs.pop("sorted_by", None)
+    return sorted_frame
+
+
+# Function to write a frame to disk, choosing the format from the file extension.
+# compression picks the codec of Parquet, Feather/Arrow and JSON Lines files (see
+# COMPRESSIONS); JSON Lines files ending in .gz or .zst are compressed to match.
+# JSON and JSON Lines are written in row batches, never as one big string, and
+# CSV chunks are formatted on all cores (see write_csv).
+def export_frame(frame, path, fmt=None, compression=None):
+    fmt = file_format(path, fmt)
+    if fmt == "jsonl" and compression_from_path(path) != "none":
+        compression = compression_from_path(path)
+    codec = compression_for(fmt, compression)
+    if isinstance(frame, LazyCrossJoin):
+        frame.export(path, fmt, compression=codec)
+    elif fmt == "csv":
+        write_csv(frame, path)
+    elif fmt == "json":
+        write_json_array(frame_batches(frame), path)
+    elif fmt == "jsonl":
+        write_json_lines(frame_batches(frame), path, codec)
+    elif fmt == "parquet":
+        frame.to_parquet(path, index=False, compression=codec)
+    elif fmt == "feather":
+        frame.reset_index(drop=True).to_feather(path, compression=codec)
+    else:
+        raise ValueError(f"Unsupported export format: {fmt!r}")
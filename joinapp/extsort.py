@@ -0,0 +1,207 @@
+import os
+import pickle
+import tempfile
+
+import numpy as np
+import pandas as pd
+
+from joinapp.engine import SORT_ORDERS, sort_columns
+
+# Rows per spilled block; also how much of each run is held in memory while merging
+DEFAULT_BLOCK_ROWS = 50_000
+
+# Helper columns holding the shuffle key of a random order and the position of
+# each row of a frame sorted by external_sort_frame
+_RANDOM_KEY = "__random_key"
+_POSITION = "__position"
+
+
+# Function to sort an iterable of DataFrame chunks without holding them all in memory.
+# Each chunk is sorted and spilled to a temporary run file, then the runs are
+# k-way merged block by block. Yields the sorted rows as a sequence of DataFrames.
+def external_sort(chunks, by=None, then_by=None, order="Ascending", block_rows=DEFAULT_BLOCK_ROWS, tmp_dir=None):
+    if order not in SORT_ORDERS:
+        raise ValueError(f"Unknown sort order: {order!r}")
+
+    columns = sort_columns(by, then_by)
+    if order == "Random":
+        columns = [_RANDOM_KEY]
+    elif not columns:
+        yield from chunks
+        return
+    ascending = order != "Descending"
+
+    with tempfile.TemporaryDirectory(prefix="joinapp-sort-", dir=tmp_dir) as run_dir:
+        run_paths = []
+        for chunk in chunks:
+            if order == "Random":
+                chunk = chunk.assign(**{_RANDOM_KEY: np.random.random(len(chunk))})
+            run = chunk.sort_values(by=columns, ascending=ascending, kind="mergesort")
+            run_path = os.path.join(run_dir, f"run{len(run_paths)}.pkl")
+            _write_run(run, run_path, block_rows)
+            run_paths.append(run_path)
+            del chunk, run
+
+        for block in _merge_runs(run_paths, columns, ascending):
+            if order == "Random":
+                block = block.drop(columns=[_RANDOM_KEY])
+            yield block
+
+
+# Function to sort an in-memory frame through temporary run files. Only the
+# sort columns and each row's position are spilled and merged; the frame is then
+# taken once in the merged order, so the sorted copy is the one large allocation.
+def external_sort_frame(frame, by=None, then_by=None, order="Ascending", run_rows=1_000_000, tmp_dir=None):
+    columns = sort_columns(by, then_by)
+    if not columns and order != "Random":
+        if order not in SORT_ORDERS:
+            raise ValueError(f"Unknown sort order: {order!r}")
+        return frame
+    keys = frame[columns] if columns else pd.DataFrame(index=frame.index)
+    chunks = (
+        keys.iloc[start:start + run_rows].assign(**{_POSITION: np.arange(start, min(start + run_rows, len(frame)))})
+        for start in range(0, len(frame), run_rows)
+    )
+    positions = np.empty(len(frame), dtype=np.intp)
+    filled = 0
+    for block in external_sort(chunks, by, then_by, order, tmp_dir=tmp_dir):
+        positions[filled:filled + len(block)] = block[_POSITION].to_numpy()
+        filled += len(block)
+    sorted_frame = frame.take(positions)
+    if order == "Random":
+        sorted_frame = sorted_frame.reset_index(drop=True)
+    if order == "Ascending":
+        sorted_frame.attrs["sorted_by"] = columns
+    else:
+        sorted_frame.attrs.pop("sorted_by", None)
+    return sorted_frame
+
+
+# Function to sort a CSV file into another CSV file, run_rows rows per run.
+# Returns the number of rows written.
+def sort_csv(in_path, out_path, by=None, then_by=None, order="Ascending", run_rows=1_000_000, tmp_dir=None):
+    chunks = pd.read_csv(in_path, chunksize=run_rows)
+    pd.read_csv(in_path, nrows=0).to_csv(out_path, index=False)
+    rows_written = 0
+    for block in external_sort(chunks, by, then_by, order, tmp_dir=tmp_dir):
+        block.to_csv(out_path, mode="a", header=False, index=False)
+        rows_written += len(block)
+    return rows_written
+
+
+# Function to write one sorted run as a sequence of pickled blocks
+def _write_run(run, path, block_rows):
+    with open(path, "wb") as file:
+        for start in range(0, len(run), block_rows):
+            pickle.dump(run.iloc[start:start + block_rows], file, protocol=pickle.HIGHEST_PROTOCOL)
+
+
+# Function to read the blocks of one run back lazily
+def _read_run(path):
+    with open(path, "rb") as file:
+        while True:
+            try:
+                yield pickle.load(file)
+            except EOFError:
+                return
+
+
+# Function to k-way merge sorted runs, holding about one block per run. Rows are
+# ordered by key and then by run, as a stable sort of the runs in order would
+# order them. The bound is the smallest (last buffered key, run) of the runs
+# that still have blocks to read. Everything sorting before it is final: rows
+# of a smaller key from any run, and rows equal to the bound's key from the
+# bounding run and the runs before it. Those rows are merged, yielded and
+# dropped, and the bounding run has emptied its buffer and reads its next
+# block, so each step consumes a block however many rows share a key.
+def _merge_runs(run_paths, columns, ascending):
+    readers = [_read_run(path) for path in run_paths]
+    buffers = [None] * len(readers)
+    more = [True] * len(readers)
+
+    def refill(run):
+        for block in readers[run]:
+            if not block.empty:
+                buffers[run] = block if buffers[run] is None else pd.concat([buffers[run], block])
+                return
+        more[run] = False
+
+    for run in range(len(readers)):
+        refill(run)
+
+    while True:
+        for run in range(len(readers)):
+            if more[run] and (buffers[run] is None or buffers[run].empty):
+                refill(run)
+        active = [run for run in range(len(readers)) if more[run]]
+        if not active:
+            pieces = [buffer for buffer in buffers if buffer is not None and not buffer.empty]
+            if pieces:
+                yield _merge_pieces(pieces, columns, ascending)
+            return
+
+        last_keys = {run: _row_key(buffers[run], len(buffers[run]) - 1, columns) for run in active}
+        bound_run = active[0]
+        for run in active[1:]:
+            # Strictly smaller, so equal keys leave the earliest run as the bound
+            if _compare_keys(last_keys[run], last_keys[bound_run], ascending) < 0:
+                bound_run = run
+        bound = last_keys[bound_run]
+
+        pieces = []
+        for run, buffer in enumerate(buffers):
+            if buffer is None or buffer.empty:
+                continue
+            count = _count_before(buffer, bound, columns, ascending, inclusive=run <= bound_run)
+            if count:
+                pieces.append(buffer.iloc[:count])
+                buffers[run] = buffer.iloc[count:]
+        yield _merge_pieces(pieces, columns, ascending)
+
+
+# Function to merge sorted pieces taken from different runs, in run order for ties
+def _merge_pieces(pieces, columns, ascending):
+    if len(pieces) == 1:
+        return pieces[0]
+    return pd.concat(pieces).sort_values(by=columns, ascending=ascending, kind="mergesort")
+
+
+# Function to read the sort key of one row of a block
+def _row_key(block, position, columns):
+    return tuple(block[col].iat[position] for col in columns)
+
+
+# Function to order two sort keys as sort_values does: column by column, in the
+# given direction, with missing values last either way. Returns -1, 0 or 1.
+def _compare_keys(a, b, ascending):
+    for x, y in zip(a, b):
+        x_missing, y_missing = pd.isna(x), pd.isna(y)
+        if x_missing or y_missing:
+            if x_missing and y_missing:
+                continue
+            return 1 if x_missing else -1
+        if x == y:
+            continue
+        before = x < y if ascending else x > y
+        return -1 if before else 1
+    return 0
+
+
+# Function to count the leading rows of a sorted block whose key sorts strictly
+# before bound, or with inclusive=True before or equal to it, by binary search
+def _count_before(block, bound, columns, ascending, inclusive=False):
+    def before(position):
+        order = _compare_keys(_row_key(block, position, columns), bound, ascending)
+        return order < 0 or (inclusive and order == 0)
+
+    if not before(0):
+        # Most runs have nothing before the bound; one comparison tells
+        return 0
+    low, high = 1, len(block)
+    while low < high:
+        middle = (low + high) // 2
+        if before(middle):
+            low = middle + 1
+        else:
+            high = middle
+    return low
@@ -0,0 +1,49 @@
+import re
+
+import pandas as pd
+
+# Rows parsed per chunk when a filter is applied while loading
+FILTER_CHUNK_ROWS = 200_000
+
+# Identifiers and `backticked names` in a filter expression
+_NAME_PATTERN = re.compile(r"`([^`]+)`|([A-Za-z_]\w*)")
+
+
+# Function to keep the rows of a frame matching a DataFrame.query expression, e.g.
+# 'status in ["Late", "Absent"] and name != "Bob"'. Dates compare as dates only
+# when the frame was loaded typed. Bad expressions raise ValueError.
+def filter_frame(frame, where):
+    try:
+        mask = frame.eval(where)
+    except (SyntaxError, NameError, TypeError, KeyError, ValueError) as e:
+        raise ValueError(f"Invalid filter {where!r}: {e}") from e
+    if not isinstance(mask, pd.Series) or not pd.api.types.is_bool_dtype(mask.dtype):
+        raise ValueError(f"Filter {where!r} does not give True or False for each row")
+    return frame[mask]
+
+
+# Function to list which of `columns` a filter expression mentions, so a
+# projected load can read them for the filter and drop them afterwards
+def filter_columns(where, columns):
+    names = {quoted or plain for quoted, plain in _NAME_PATTERN.findall(where)}
+    return [col for col in columns if col.strip() in names]
+
+
+# Function to filter a stream of chunks, keeping only the matching rows (and only
+# `keep` columns, if given) of each chunk before the next one is read. Categorical
+# columns whose chunks ended up with different categories are made categorical again.
+def filter_chunks(chunks, where, keep=None):
+    kept = []
+    first = None
+    for chunk in chunks:
+        if first is None:
+            first = chunk.iloc[:0]
+        rows = filter_frame(chunk, where)
+        kept.append(rows if keep is None else rows[keep])
+    if first is None:
+        raise ValueError("No columns to parse from file")
+    frame = pd.concat(kept, ignore_index=True)
+    for col in frame.columns:
+        if isinstance(first[col].dtype, pd.CategoricalDtype) and not isinstance(frame[col].dtype, pd.CategoricalDtype):
+            frame[col] = frame[col].astype("category")
+    return frame
@@ -0,0 +1,246 @@
+import multiprocessing
+import re
+import unicodedata
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from difflib import SequenceMatcher
+
+import numpy as np
+import pandas as pd
+
+# Lowest similarity (0 to 1) at which two names are taken to be the same person
+DEFAULT_THRESHOLD = 0.85
+
+# Blocking keys shared by more distinct names than this on either side are too
+# common to narrow anything down, and are skipped
+DEFAULT_MAX_BLOCK = 2_000
+
+# Factor applied to the similarity of names that only match once initials are
+# spelled out, e.g. "A. Smith" and "Alice Smith"
+INITIALS_FACTOR = 0.95
+
+# Column holding the similarity of each matched pair in a fuzzy join result
+SCORE_COLUMN = "name_score"
+
+# Soundex digit of each consonant; vowels, h, w and y have none
+SOUNDEX_DIGITS = {
+    letter: digit
+    for digit, letters in {"1": "bfpv", "2": "cgjkqsxz", "3": "dt", "4": "l", "5": "mn", "6": "r"}.items()
+    for letter in letters
+}
+
+# Helper columns carrying the normalized name both sides are merged on and the
+# position of each Data 2 row
+_MATCH = "__name_match"
+_POSITION = "__position"
+
+# Blocks being compared by match_names; forked workers inherit them instead of
+# receiving pickled name lists
+_match_blocks = None
+
+
+# Function to reduce a name to the form names are compared in: accents removed,
+# case folded, punctuation dropped and whitespace collapsed, so "  Zoë O'Neil"
+# becomes "zoe o neil". Missing names become "".
+def normalize_name(name):
+    if not isinstance(name, str) and pd.isna(name):
+        return ""
+    text = unicodedata.normalize("NFKD", str(name))
+    text = "".join(char for char in text if not unicodedata.combining(char)).casefold()
+    return " ".join(re.findall(r"[^\W_]+", text))
+
+
+# Function to normalize a column of names, normalizing each distinct value once
+def normalize_column(series):
+    codes, uniques = pd.factorize(series)
+    normalized = np.array([normalize_name(value) for value in uniques] + [""], dtype=object)
+    return normalized[codes]
+
+
+# Function to give the Soundex code of a token (its first letter and up to three
+# consonant digits); tokens that do not start with a letter are kept as they are
+def soundex(token):
+    if not token[:1].isalpha():
+        return token
+    code, last = token[0], SOUNDEX_DIGITS.get(token[0], "")
+    for char in token[1:]:
+        digit = SOUNDEX_DIGITS.get(char, "")
+        if digit and digit != last:
+            code += digit
+            if len(code) == 4:
+                break
+        if char not in "hw":
+            last = digit
+    return code.ljust(4, "0")
+
+
+# Function to list the blocking keys of a normalized name. Only names sharing a
+# key are compared. A key is the Soundex code of the first or last token plus
+# the initial of the other one, so "alice smith", "a smith", "alice smyth" and
+# "smith alice" all share "s530 a". Single-token names block on their Soundex code.
+def blocking_keys(name):
+    tokens = name.split()
+    if not tokens:
+        return []
+    if len(tokens) == 1:
+        return [soundex(tokens[0])]
+    first, last = tokens[0], tokens[-1]
+    return [f"{soundex(last)} {first[0]}", f"{soundex(first)} {last[0]}"]
+
+
+# Function to pick the string similarity used to score names: rapidfuzz's Indel
+# similarity when it is installed, else difflib's ratio. Both are
+# 2 * matching characters / total characters.
+def ratio_function():
+    try:
+        from rapidfuzz.distance import Indel
+    except ImportError:
+        return lambda a, b: SequenceMatcher(None, a, b).ratio()
+    return Indel.normalized_similarity
+
+
+# Function to score two normalized names between 0 and 1. Tokens are sorted
+# first, so word order does not matter. A single-letter token that is the
+# initial of a token in the other name is spelled out, at INITIALS_FACTOR of
+# the score. Pairs that cannot reach threshold score 0 without being compared.
+def name_similarity(a, b, ratio=None, threshold=0.0):
+    ratio = ratio or ratio_function()
+    a_tokens, b_tokens = a.split(), b.split()
+    score = 0.0
+    if 2 * min(len(a), len(b)) >= threshold * (len(a) + len(b)):
+        score = ratio(" ".join(sorted(a_tokens)), " ".join(sorted(b_tokens)))
+    if score < 1.0 and any(len(token) == 1 for token in a_tokens + b_tokens):
+        a_expanded, b_expanded = _expand_initials(a_tokens, b_tokens), _expand_initials(b_tokens, a_tokens)
+        if (a_expanded, b_expanded) != (a_tokens, b_tokens):
+            expanded = ratio(" ".join(sorted(a_expanded)), " ".join(sorted(b_expanded)))
+            score = max(score, INITIALS_FACTOR * expanded)
+    return score
+
+
+# Function to match two lists of distinct normalized names. Names are grouped
+# into blocks by blocking_keys and compared only within a block, so the work
+# grows with the block sizes instead of len(left) * len(right). Each left name
+# keeps its best-scoring right names at or above threshold; identical names
+# score 1 and are not compared further. With workers > 1 the blocks are
+# compared on forked processes. Returns a DataFrame of left, right and score.
+def match_names(left_names, right_names, threshold=DEFAULT_THRESHOLD, max_block=DEFAULT_MAX_BLOCK, workers=1,
+                mp_context=None):
+    global _match_blocks
+    right_set = set(right_names)
+    best = {name: (1.0, {name}) for name in left_names if name in right_set}
+
+    blocks = defaultdict(lambda: ([], []))
+    for side, names in ((0, (name for name in left_names if name not in best)), (1, right_names)):
+        for name in names:
+            for key in blocking_keys(name):
+                blocks[key][side].append(name)
+    blocks = [
+        (left_block, right_block) for left_block, right_block in blocks.values()
+        if left_block and right_block and len(left_block) <= max_block and len(right_block) <= max_block
+    ]
+
+    if mp_context is None and "fork" in multiprocessing.get_all_start_methods():
+        mp_context = multiprocessing.get_context("fork")
+    if workers > 1 and len(blocks) > 1 and mp_context is not None and mp_context.get_start_method() == "fork":
+        # Cut the blocks into a few ranges per worker of about equal comparison counts
+        costs = np.cumsum([len(left_block) * len(right_block) for left_block, right_block in blocks])
+        cuts = np.searchsorted(costs, np.linspace(0, costs[-1], 4 * workers + 1)[1:-1])
+        bounds = list(zip([0, *cuts], [*cuts, len(blocks)]))
+        _match_blocks = blocks
+        try:
+            with ProcessPoolExecutor(max_workers=workers, mp_context=mp_context) as executor:
+                found = list(executor.map(_compare_blocks, *zip(*bounds), [threshold] * len(bounds)))
+        finally:
+            _match_blocks = None
+    else:
+        found = [_compare_blocks(0, len(blocks), threshold, blocks)]
+
+    for part in found:
+        for name, (score, matches) in part.items():
+            _keep_best(best, name, score, matches)
+    rows = [(name, match, score) for name, (score, matches) in best.items() for match in sorted(matches)]
+    return pd.DataFrame(rows, columns=["left", "right", "score"])
+
+
+# Function to join two frames on similar rather than equal names. The other
+# join keys must still be equal. Names are normalized, matched once per distinct
+# name with match_names, and the rows are merged on the matches. The result has
+# the left columns, the matched right name as name + suffixes[1], its score in
+# SCORE_COLUMN, then the right columns. Rows of right and outer joins without a
+# match take their name from the right side.
+def fuzzy_join(left, right, keys, how="inner", threshold=DEFAULT_THRESHOLD, max_block=DEFAULT_MAX_BLOCK, workers=1,
+               suffixes=("_1", "_2")):
+    if how not in ("inner", "left", "right", "outer"):
+        raise ValueError(f"Cannot fuzzy match a {how!r} join")
+    if not 0 < threshold <= 1:
+        raise ValueError(f"Fuzzy threshold must be between 0 and 1, not {threshold}")
+    right_name = "name" + suffixes[1]
+    left_names, right_names = normalize_column(left["name"]), normalize_column(right["name"])
+    matches = match_names(
+        [name for name in pd.unique(left_names) if name], [name for name in pd.unique(right_names) if name],
+        threshold, max_block, workers,
+    )
+
+    # Left rows merge on their own normalized name, right rows on each left name
+    # that picked theirs. Right rows no left name picked are kept apart and, for
+    # right and outer joins, added afterwards with empty left columns.
+    left_keyed = left.assign(**{_MATCH: left_names})
+    pairs = matches.rename(columns={"left": _MATCH, "right": "__normalized", "score": SCORE_COLUMN})
+    right_keyed = right.rename(columns={"name": right_name}).assign(__normalized=right_names, **{_POSITION: np.arange(len(right))})
+    right_keyed = right_keyed.merge(pairs, on="__normalized", how="left").drop(columns=["__normalized"])
+    picked = right_keyed[_MATCH].notna()
+
+    other_keys = [col for col in keys if col != "name"]
+    joined = left_keyed.merge(right_keyed[picked], on=[_MATCH] + other_keys, how=how, suffixes=suffixes)
+    if how in ("right", "outer"):
+        # Merging with no left rows lays the unpicked rows out with the joined columns
+        unpicked = left_keyed.iloc[:0].merge(right_keyed[~picked], on=[_MATCH] + other_keys, how="right", suffixes=suffixes)
+        joined = pd.concat([joined, unpicked], ignore_index=True)
+        if how == "right":
+            joined = joined.sort_values(_POSITION, kind="mergesort", ignore_index=True)
+        names = joined["name"]
+        if isinstance(names.dtype, pd.CategoricalDtype):
+            names = names.astype(object)
+        joined["name"] = names.where(names.notna(), joined[right_name])
+
+    rest = [col for col in joined.columns if col not in (_MATCH, _POSITION, right_name, SCORE_COLUMN)]
+    columns = rest[:len(left.columns)] + [right_name, SCORE_COLUMN] + rest[len(left.columns):]
+    return joined[columns]
+
+
+# Function to compare the names of blocks [start, stop), returning each left
+# name's best-scoring right names. Worker processes compare the blocks they
+# inherited from match_names.
+def _compare_blocks(start, stop, threshold, blocks=None):
+    ratio = ratio_function()
+    best = {}
+    for left_block, right_block in (_match_blocks if blocks is None else blocks)[start:stop]:
+        for name in left_block:
+            for candidate in right_block:
+                score = name_similarity(name, candidate, ratio, threshold)
+                if score >= threshold:
+                    _keep_best(best, name, score, {candidate})
+    return best
+
+
+# Function to record right-name matches of a left name, keeping only the best score
+def _keep_best(best, name, score, matches):
+    known = best.get(name)
+    if known is None or score > known[0]:
+        best[name] = (score, set(matches))
+    elif score == known[0]:
+        known[1].update(matches)
+
+
+# Function to spell out single-letter tokens that are the initial of an unused
+# longer token of the other name
+def _expand_initials(tokens, other_tokens):
+    spare = [token for token in other_tokens if len(token) > 1 and token not in tokens]
+    expanded = []
+    for token in tokens:
+        full = next((candidate for candidate in spare if len(token) == 1 and candidate[0] == token), None)
+        if full is not None:
+            spare.remove(full)
+            token = full
+        expanded.append(token)
+    return expanded
@@ -0,0 +1,125 @@
+import io
+import os
+
+import pandas as pd
+from pandas.api.types import union_categoricals
+
+from joinapp.engine import export_frame, is_sorted_on, join_frames, normalize_columns
+from joinapp.lazy import LazyCrossJoin
+from joinapp.writers import write_json_lines
+
+# Join types whose result for appended left rows is exactly the rows appended to the result
+INCREMENTAL_JOIN_TYPES = ("inner", "left", "cross")
+
+
+# Remembers how much of a growing CSV file has been loaded, so rows appended
+# later can be read on their own instead of re-parsing the whole file.
+class AppendTracker:
+    def __init__(self, path):
+        self.path = path
+        with open(path, "rb") as file:
+            self.header = file.readline()
+        self.offset = os.path.getsize(path)
+        self.mtime_ns = os.stat(path).st_mtime_ns
+
+    # Function to read the rows appended since the last call (or since creation).
+    # Returns an empty frame when nothing changed, and None when the file was
+    # truncated or rewritten and needs a full reload.
+    def read_appended(self, columns):
+        size = os.path.getsize(self.path)
+        with open(self.path, "rb") as file:
+            if file.readline() != self.header or size < self.offset:
+                return None
+            file.seek(self.offset)
+            data = file.read(size - self.offset)
+
+        # Leave a half-written last line for the next call
+        complete = data[:data.rfind(b"\n") + 1]
+        self.offset += len(complete)
+        self.mtime_ns = os.stat(self.path).st_mtime_ns
+        if not complete.strip():
+            return pd.DataFrame(columns=columns)
+        return pd.read_csv(io.BytesIO(complete), header=None, names=list(columns))
+
+
+# Function to append new rows to a loaded frame, keeping the loaded dtypes where
+# possible (categoricals get the union of both dictionaries, day-first dates are parsed)
+def append_rows(base, delta):
+    if delta.empty:
+        return base
+    delta = normalize_columns(delta)
+    columns = {}
+    for col in base.columns:
+        old, new = base[col], delta[col]
+        if isinstance(old.dtype, pd.CategoricalDtype):
+            columns[col] = pd.Series(union_categoricals([old.array, pd.Categorical(new)], ignore_order=True))
+            continue
+        if old.dtype != new.dtype:
+            try:
+                if pd.api.types.is_datetime64_any_dtype(old.dtype):
+                    new = pd.to_datetime(new, dayfirst=True)
+                else:
+                    new = new.astype(old.dtype)
+            except (ValueError, TypeError):
+                pass
+        columns[col] = pd.concat([old, new], ignore_index=True)
+    return pd.DataFrame(columns)
+
+
+# Function to extend a join result with the rows that appended left rows produce.
+# Inner, left and cross joins keep the left order, so the new rows are exactly the
+# join of the appended rows alone, added at the end; other join types raise
+# ValueError and need a full join. columns is the projection the result was joined
+# with, if any. Returns (new result, rows added to it).
+def join_appended(result, left, delta, right, how, columns=None):
+    how = how.strip().lower()
+    if how not in INCREMENTAL_JOIN_TYPES:
+        raise ValueError(f"{how.capitalize()} joins cannot be updated incrementally")
+    if isinstance(result, LazyCrossJoin):
+        # Cross join rows are ordered left row first, so the new rows are delta x right
+        return (
+            join_frames(left, right, how, lazy=True, columns=columns),
+            join_frames(delta, right, how, lazy=True, columns=columns),
+        )
+
+    added = join_frames(delta, right, how, columns=columns)[list(result.columns)]
+    combined = pd.concat([result, added], ignore_index=True)
+    sorted_by = result.attrs.get("sorted_by")
+    if sorted_by:
+        # The appended rows keep the key order only if they sort after the old ones
+        boundary = pd.concat([result[sorted_by].iloc[-1:], added[sorted_by]], ignore_index=True)
+        if is_sorted_on(boundary, sorted_by):
+            combined.attrs["sorted_by"] = sorted_by
+    return combined, added
+
+
+# Function to add the new rows of a result to a file exported from it earlier.
+# CSV and JSON Lines files are appended to, JSON arrays are re-closed after the
+# new records; any other format is rewritten from full_result.
+def append_to_export(path, added, fmt, full_result):
+    fmt = fmt.lower()
+    if fmt not in ("csv", "json", "jsonl"):
+        export_frame(full_result, path, fmt)
+        return
+
+    batches = added.iter_batches() if isinstance(added, LazyCrossJoin) else [added]
+    for batch in batches:
+        if batch.empty:
+            continue
+        if fmt == "csv":
+            batch.to_csv(path, mode="a", header=False, index=False)
+        elif fmt == "jsonl":
+            write_json_lines([batch], path, append=True)
+        else:
+            _append_json_records(path, batch.to_json(orient="records")[1:-1])
+
+
+# Function to add records before the closing bracket of a JSON array file
+def _append_json_records(path, records):
+    with open(path, "r+b") as file:
+        file.seek(-1, os.SEEK_END)
+        if file.read(1) != b"]":
+            raise ValueError(f"{path} is not a JSON array export")
+        file.seek(-1, os.SEEK_END)
+        separator = b"," if file.tell() > 1 else b""
+        file.write(separator + records.encode("utf-8") + b"]")
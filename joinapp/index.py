@@ -0,0 +1,229 @@
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+from joinapp.engine import JOIN_TYPES, load_frame
+
+INDEX_META = "index.json"
+INDEX_FRAME = "frame.feather"
+INDEX_HASHES = "hashes.npy"
+INDEX_ORDER = "order.npy"
+
+
+# Index from join-key tuples to the row positions of one frame: the 64-bit
+# hash of every row's key, sorted, next to the row positions in that order.
+# Probing hashes the other side and binary searches the sorted hashes, then
+# checks the real key values of each candidate so hash collisions never match.
+class HashIndex:
+    def __len__(self):
+        return len(self.order)
+
+    # Function to find matching rows for every row of `other`.
+    # Returns parallel arrays (other positions, indexed-frame positions) ordered by
+    # other position; with keep_unmatched, rows of `other` without a match appear
+    # once with position -1.
+    def probe(self, other, keep_unmatched=False):
+        other_hashes = hash_keys(other, self.keys)
+        # Searching in sorted order walks the sorted hashes front to back
+        probe_order = np.argsort(other_hashes)
+        sorted_hashes = other_hashes[probe_order]
+        low = np.empty(len(other), dtype=np.intp)
+        high = np.empty(len(other), dtype=np.intp)
+        low[probe_order] = np.searchsorted(self.hashes, sorted_hashes, side="left")
+        high[probe_order] = np.searchsorted(self.hashes, sorted_hashes, side="right")
+        repeats = high - low
+
+        other_positions = np.repeat(np.arange(len(other)), repeats)
+        group_offsets = np.arange(repeats.sum()) - np.repeat(np.cumsum(repeats) - repeats, repeats)
+        frame_positions = np.asarray(self.order[np.repeat(low, repeats) + group_offsets], dtype=np.intp)
+
+        # Equal hashes are only candidates; keep the pairs whose key values really match
+        equal = np.ones(len(other_positions), dtype=bool)
+        for col in self.keys:
+            probe_values = other[col].to_numpy()[other_positions]
+            indexed_values = self.key_values(col, frame_positions)
+            equal &= (probe_values == indexed_values) | (pd.isna(probe_values) & pd.isna(indexed_values))
+        other_positions, frame_positions = other_positions[equal], frame_positions[equal]
+
+        if keep_unmatched:
+            missing = np.flatnonzero(np.bincount(other_positions, minlength=len(other)) == 0)
+            other_positions = np.concatenate([other_positions, missing])
+            frame_positions = np.concatenate([frame_positions, np.full(len(missing), -1, dtype=np.intp)])
+            order = np.argsort(other_positions, kind="stable")
+            other_positions, frame_positions = other_positions[order], frame_positions[order]
+        return other_positions, frame_positions
+
+
+# HashIndex over an in-memory frame. Built once, then probed with any number
+# of other frames or chunks.
+class KeyIndex(HashIndex):
+    def __init__(self, frame, keys):
+        # Loaded frames already have a 0..n-1 index; only re-index (and copy) the others
+        if not frame.index.equals(pd.RangeIndex(len(frame))):
+            frame = frame.reset_index(drop=True)
+        self.frame = frame
+        self.keys = list(keys)
+        self.columns = self.frame.columns
+        hashes = hash_keys(self.frame, self.keys)
+        self.order = np.argsort(hashes, kind="stable")
+        self.hashes = hashes[self.order]
+
+    def key_values(self, col, positions):
+        return self.frame[col].take(positions).to_numpy()
+
+    # Function to fetch indexed rows by position; -1 gives an all-missing row
+    def rows(self, positions):
+        return self.frame.reindex(positions).reset_index(drop=True)
+
+    # Function to fetch the indexed rows not flagged in `matched`
+    def unmatched_rows(self, matched):
+        return self.frame[~matched]
+
+
+# HashIndex saved to a directory so it can be reopened without rebuilding:
+# the frame as uncompressed Feather plus the sorted hashes and row order as
+# .npy files, all memory-mapped, so a probe only pays for the probing side.
+# Needs pyarrow.
+class SavedIndex(HashIndex):
+    def __init__(self, directory):
+        import pyarrow.feather as feather
+
+        self.directory = directory
+        with open(os.path.join(directory, INDEX_META), "r") as file:
+            self.meta = json.load(file)
+        self.keys = self.meta["keys"]
+        self.table = feather.read_table(os.path.join(directory, INDEX_FRAME), memory_map=True)
+        self.columns = pd.Index(self.table.column_names)
+        self.hashes = np.load(os.path.join(directory, INDEX_HASHES), mmap_mode="r")
+        self.order = np.load(os.path.join(directory, INDEX_ORDER), mmap_mode="r")
+
+    def key_values(self, col, positions):
+        return self.table.column(col).take(positions).to_pandas().to_numpy()
+
+    # Function to fetch indexed rows by position straight from the memory-mapped table
+    def rows(self, positions):
+        import pyarrow as pa
+
+        positions = np.asarray(positions)
+        indices = pa.array(positions, type=pa.int64(), mask=positions < 0)
+        return self.table.take(indices).to_pandas()
+
+    def unmatched_rows(self, matched):
+        return self.rows(np.flatnonzero(~matched))
+
+
+# Function to hash each row's join key into one 64-bit value.
+# Numeric and boolean keys are hashed as float64 so 1 and 1.0 hash alike,
+# text and categorical keys by their string values.
+def hash_keys(frame, keys):
+    key_values = {}
+    for col in keys:
+        series = frame[col]
+        if pd.api.types.is_bool_dtype(series.dtype) or pd.api.types.is_numeric_dtype(series.dtype):
+            series = series.astype("float64")
+        elif isinstance(series.dtype, pd.CategoricalDtype) or pd.api.types.is_string_dtype(series.dtype):
+            series = series.astype(object)
+        key_values[col] = series.to_numpy()
+    return pd.util.hash_pandas_object(pd.DataFrame(key_values), index=False, categorize=False).to_numpy()
+
+
+# Function to build a SavedIndex for `frame` on `keys` in `directory`.
+# source_path, if given, is recorded so open_index can tell when it went stale;
+# typed and where record how `frame` was loaded from it.
+def save_index(frame, keys, directory, source_path=None, typed=False, where=None):
+    import pyarrow.feather as feather
+
+    os.makedirs(directory, exist_ok=True)
+    frame = frame.reset_index(drop=True)
+    hashes = hash_keys(frame, keys)
+    order = np.argsort(hashes, kind="stable")
+
+    feather.write_feather(frame, os.path.join(directory, INDEX_FRAME), compression="uncompressed")
+    np.save(os.path.join(directory, INDEX_HASHES), hashes[order])
+    np.save(os.path.join(directory, INDEX_ORDER), order)
+    meta = {
+        "keys": list(keys), "rows": len(frame), "source": _source_state(source_path),
+        "load": _load_options(typed, where),
+    }
+    with open(os.path.join(directory, INDEX_META), "w") as file:
+        json.dump(meta, file)
+    return SavedIndex(directory)
+
+
+# Function to reopen a saved index; returns None if there is none, it was built
+# on other keys, its source file changed since it was built, or the table was
+# loaded with other options (typed parsing or a row filter) than the ones given.
+def open_index(directory, keys=None, source_path=None, typed=False, where=None):
+    if not os.path.exists(os.path.join(directory, INDEX_META)):
+        return None
+    index = SavedIndex(directory)
+    if keys is not None and list(keys) != index.keys:
+        return None
+    if source_path is not None and index.meta.get("source") != _source_state(source_path):
+        return None
+    # Indexes saved before the load options were recorded hold the plain file
+    if index.meta.get("load", _load_options(False, None)) != _load_options(typed, where):
+        return None
+    return index
+
+
+# Function to open the saved index in `directory`, or build and save it from
+# `frame` (or by loading source_path with typed and where) when it is missing
+# or stale. `frame`, if given, must have been loaded with those same options.
+def ensure_index(directory, keys, source_path=None, frame=None, typed=False, where=None):
+    index = open_index(directory, keys, source_path, typed, where)
+    if index is None:
+        if frame is None:
+            frame = load_frame(source_path, typed=typed, where=where)
+        index = save_index(frame, keys, directory, source_path, typed, where)
+    return index
+
+
+# Function to join `frame` against an index of the other side; frame_is_left says
+# which side `frame` is. Produces the same rows and columns as join_frames; rows
+# follow the order of `frame`, with unmatched indexed rows (right/outer) at the end.
+def join_with_index(frame, index, how="inner", frame_is_left=True):
+    how = how.strip().lower()
+    if how not in JOIN_TYPES or how == "cross":
+        raise ValueError(f"Index joins do not support {how!r} joins")
+    keep_frame = how in (("left", "outer") if frame_is_left else ("right", "outer"))
+    keep_indexed = how in (("right", "outer") if frame_is_left else ("left", "outer"))
+
+    matched = np.zeros(len(index), dtype=bool)
+    joined = probe_join(frame, index, keep_frame, frame_is_left, matched)
+    if keep_indexed:
+        joined = pd.concat([joined, index.unmatched_rows(matched).reindex(columns=joined.columns)], ignore_index=True)
+    return joined
+
+
+# Function to join one frame (or chunk) against an index, flagging the indexed
+# rows it matched in `matched`. Columns are laid out as merge() lays them out:
+# left columns, then the right columns that are not join keys.
+def probe_join(frame, index, keep_unmatched, frame_is_left, matched):
+    keys = index.keys
+    frame = frame.reset_index(drop=True)
+    frame_positions, index_positions = index.probe(frame, keep_unmatched=keep_unmatched)
+    matched[index_positions[index_positions >= 0]] = True
+
+    probe_rows = frame.take(frame_positions).reset_index(drop=True)
+    indexed_rows = index.rows(index_positions)
+    if frame_is_left:
+        right_extra = [col for col in index.columns if col not in keys]
+        return pd.concat([probe_rows, indexed_rows[right_extra]], axis=1)
+    # Key values are equal on matched rows, and only the right side has them otherwise
+    indexed_rows[keys] = probe_rows[keys]
+    right_extra = [col for col in frame.columns if col not in keys]
+    return pd.concat([indexed_rows, probe_rows[right_extra]], axis=1)
+
+
+def _source_state(source_path):
+    if source_path is None:
+        return None
+    stat = os.stat(source_path)
+    return [os.path.abspath(source_path), stat.st_size, stat.st_mtime_ns]
+
+
+def _load_options(typed, where):
+    return {"typed": bool(typed), "where": where or None}
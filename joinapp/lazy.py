@@ -0,0 +1,136 @@
+import numpy as np
+import pandas as pd
+
+from joinapp.writers import write_csv, write_json_array, write_json_lines
+
+# Rows generated per batch when a lazy result is iterated or exported
+DEFAULT_BATCH_ROWS = 100_000
+
+
+# Cross join of two frames that never builds the full Cartesian product.
+# Row i pairs left row i // len(right) with right row i % len(right); rows are
+# only generated for the slices that are asked for.
+class LazyCrossJoin:
+    def __init__(self, left, right):
+        # Kept as-is (no copies); rows are always looked up by position
+        self.left = left
+        self.right = right
+        # Same column names (and _x/_y suffixes) as an eager cross merge
+        self.columns = self.left.iloc[:0].merge(self.right.iloc[:0], how="cross").columns
+
+    def __len__(self):
+        return len(self.left) * len(self.right)
+
+    @property
+    def empty(self):
+        return len(self) == 0
+
+    @property
+    def shape(self):
+        return (len(self), len(self.columns))
+
+    @property
+    def iloc(self):
+        return _LazyRowIndexer(self)
+
+    # Function to build the rows at the given positions
+    def take(self, positions):
+        positions = np.asarray(positions, dtype=np.int64)
+        width = len(self.right)
+        left_rows = self.left.take(positions // width).reset_index(drop=True)
+        right_rows = self.right.take(positions % width).reset_index(drop=True)
+        rows = pd.concat([left_rows, right_rows], axis=1)
+        rows.columns = self.columns
+        rows.index = positions
+        return rows
+
+    # Function to generate the result in DataFrame batches
+    def iter_batches(self, batch_rows=DEFAULT_BATCH_ROWS):
+        for start in range(0, len(self), batch_rows):
+            yield self.iloc[start:start + batch_rows]
+
+    def itertuples(self, index=False):
+        for batch in self.iter_batches():
+            yield from batch.itertuples(index=index)
+
+    # Function to build the whole product in memory; only call when asked to
+    def to_frame(self):
+        return self.iloc[0:len(self)]
+
+    # Function to check whether sorting on these columns can stay lazy:
+    # ordering by left-hand columns only just reorders the left frame.
+    def can_sort_lazily(self, columns):
+        left_names = self._left_names()
+        return bool(columns) and all(col in left_names for col in columns)
+
+    # Function to sort by left-hand columns without materializing
+    def sort_lazily(self, columns, ascending=True):
+        left_names = self._left_names()
+        keys = pd.DataFrame({col: self.left.iloc[:, left_names.index(col)].to_numpy() for col in columns})
+        order = keys.sort_values(by=columns, ascending=ascending, kind="mergesort").index
+        return LazyCrossJoin(self.left.take(order), self.right)
+
+    # Function to list the result names of the left-hand columns (after suffixing)
+    def _left_names(self):
+        return list(self.columns[:self.left.shape[1]])
+
+    # Function to stream the result to a CSV, JSON, JSON Lines, Parquet or Feather/Arrow
+    # file batch by batch. compression is the codec already checked by export_frame.
+    def export(self, path, fmt, batch_rows=DEFAULT_BATCH_ROWS, compression=None):
+        if fmt == "csv":
+            write_csv(self, path, chunk_rows=batch_rows)
+        elif fmt == "json":
+            write_json_array(self.iter_batches(batch_rows), path)
+        elif fmt == "jsonl":
+            write_json_lines(self.iter_batches(batch_rows), path, compression)
+        elif fmt == "parquet":
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+
+            writer = None
+            try:
+                for batch in self.iter_batches(batch_rows):
+                    table = pa.Table.from_pandas(batch, preserve_index=False)
+                    if writer is None:
+                        writer = pq.ParquetWriter(path, table.schema, compression=compression or "snappy")
+                    writer.write_table(table)
+            finally:
+                if writer is not None:
+                    writer.close()
+            if writer is None:
+                self.iloc[0:0].to_parquet(path, index=False)
+        elif fmt == "feather":
+            import pyarrow as pa
+
+            codec = compression or "lz4"
+            options = pa.ipc.IpcWriteOptions(compression=None if codec == "uncompressed" else codec)
+            writer = None
+            try:
+                for batch in self.iter_batches(batch_rows):
+                    table = pa.Table.from_pandas(batch, preserve_index=False)
+                    if writer is None:
+                        writer = pa.ipc.new_file(path, table.schema, options=options)
+                    writer.write_table(table)
+            finally:
+                if writer is not None:
+                    writer.close()
+            if writer is None:
+                self.iloc[0:0].reset_index(drop=True).to_feather(path)
+        else:
+            raise ValueError(f"Unsupported export format: {fmt!r}")
+
+
+# Positional slicing for LazyCrossJoin, mirroring DataFrame.iloc[start:stop]
+class _LazyRowIndexer:
+    def __init__(self, join):
+        self.join = join
+
+    def __getitem__(self, key):
+        if isinstance(key, slice):
+            return self.join.take(np.arange(*key.indices(len(self.join))))
+        if isinstance(key, (int, np.integer)):
+            position = key + len(self.join) if key < 0 else key
+            if not 0 <= position < len(self.join):
+                raise IndexError("row position out of range")
+            return self.join.take([position]).iloc[0]
+        return self.join.take(key)
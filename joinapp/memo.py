@@ -0,0 +1,151 @@
+import hashlib
+import threading
+import weakref
+from collections import OrderedDict
+
+import pandas as pd
+
+from joinapp.engine import is_sorted_on, join_frames, key_columns, project_frames, projection, select_columns
+from joinapp.index import join_with_index
+from joinapp.lazy import LazyCrossJoin
+from joinapp.parallel import parallel_join
+
+# Default memory budget for cached join results
+DEFAULT_BUDGET_BYTES = 1024 ** 3
+
+
+# Function to hash the contents of a frame (values, column names and dtypes)
+def frame_fingerprint(frame):
+    digest = hashlib.sha1()
+    digest.update(repr(list(frame.columns)).encode("utf-8"))
+    digest.update(repr([str(dtype) for dtype in frame.dtypes]).encode("utf-8"))
+    digest.update(pd.util.hash_pandas_object(frame, index=False).to_numpy().tobytes())
+    return digest.hexdigest()
+
+
+# In-memory cache of join results keyed by input fingerprints, join columns and
+# join type, evicting least-recently-used results once their total size passes
+# budget_bytes. Loaded frames are never mutated, so each frame is only hashed
+# the first time it is joined.
+class ResultCache:
+    def __init__(self, budget_bytes=DEFAULT_BUDGET_BYTES):
+        self.budget_bytes = budget_bytes
+        self.entries = OrderedDict()
+        self.used_bytes = 0
+        self.fingerprints = {}
+        # Reentrant: a weakref callback can fire from garbage collection while the lock is held
+        self.lock = threading.RLock()
+
+    # Function to join through the cache; same arguments as join_frames, plus
+    # workers to compute misses with parallel_join on that many processes, and
+    # right_index (a prebuilt index of `right`) to compute inner/left misses by
+    # probing it instead of merging. Fuzzy joins (fuzzy_threshold) match names
+    # on the workers processes instead; date joins (asof, tolerance, date_range)
+    # always run through join_frames.
+    def join(self, left, right, how="inner", lazy=False, categorical_keys=False, check_sorted=False, workers=0,
+             right_index=None, columns=None, fuzzy_threshold=None, asof=None, tolerance=None, date_range=None):
+        how = how.strip().lower()
+        key = self.key(
+            left, right, how, lazy, categorical_keys, check_sorted, columns, fuzzy_threshold,
+            asof, tolerance, date_range,
+        )
+        cached = self.get(key)
+        if cached is not None:
+            return cached
+
+        if asof or date_range:
+            result = join_frames(
+                left, right, how, columns=columns, asof=asof, tolerance=tolerance, date_range=date_range,
+            )
+        elif fuzzy_threshold is not None and how != "cross":
+            result = join_frames(
+                left, right, how, columns=columns, fuzzy_threshold=fuzzy_threshold, fuzzy_workers=workers or 1,
+            )
+        elif right_index is not None and how in ("inner", "left") and right_index.keys == key_columns(left, right):
+            if columns:
+                left = left[list(projection(left.columns, right.columns, how, columns)[0])]
+            result = join_with_index(left, right_index, how)
+            if check_sorted and is_sorted_on(left, right_index.keys):
+                result.attrs["sorted_by"] = right_index.keys
+            result = select_columns(result, columns)
+        elif workers and how != "cross":
+            if columns:
+                left, right = project_frames(left, right, how, columns)
+            result = parallel_join(left, right, how, workers=workers, categorical_keys=categorical_keys)
+            result = select_columns(result, columns)
+        else:
+            result = join_frames(left, right, how, lazy, categorical_keys, check_sorted, columns)
+        self.store(key, result)
+        return result
+
+    # Function to return the cached result of a join without computing it on a
+    # miss (None then); takes the arguments of join that pick the result, so a
+    # caller can skip work it would only do before a real join
+    def lookup(self, left, right, how="inner", lazy=False, categorical_keys=False, check_sorted=False,
+               columns=None, fuzzy_threshold=None, asof=None, tolerance=None, date_range=None):
+        how = how.strip().lower()
+        return self.get(self.key(
+            left, right, how, lazy, categorical_keys, check_sorted, columns, fuzzy_threshold,
+            asof, tolerance, date_range,
+        ))
+
+    # Function to build the cache key of a join from its inputs' fingerprints and options
+    def key(self, left, right, how, lazy, categorical_keys, check_sorted, columns, fuzzy_threshold,
+            asof, tolerance, date_range):
+        return (
+            self.fingerprint(left), self.fingerprint(right), tuple(key_columns(left, right)),
+            how, lazy, categorical_keys, check_sorted, tuple(columns or ()), fuzzy_threshold,
+            asof, tolerance, tuple(date_range or ()),
+        )
+
+    # Function to fetch a cached result by key, marking it most recently used
+    def get(self, key):
+        with self.lock:
+            if key in self.entries:
+                self.entries.move_to_end(key)
+                return self.entries[key][0]
+        return None
+
+    # Function to fingerprint a frame, reusing the hash while the same object is alive
+    def fingerprint(self, frame):
+        with self.lock:
+            known = self.fingerprints.get(id(frame))
+            if known is not None and known[0]() is frame:
+                return known[1]
+
+        fingerprint = frame_fingerprint(frame)
+        with self.lock:
+            self.fingerprints[id(frame)] = (weakref.ref(frame, self._forget(id(frame))), fingerprint)
+        return fingerprint
+
+    # Function to add a result and evict old ones until the cache fits its budget
+    def store(self, key, result):
+        if isinstance(result, LazyCrossJoin):
+            size = 0
+        else:
+            size = int(result.memory_usage(index=True, deep=True).sum())
+        if size > self.budget_bytes:
+            return
+
+        with self.lock:
+            if key in self.entries:
+                self.used_bytes -= self.entries.pop(key)[1]
+            self.entries[key] = (result, size)
+            self.used_bytes += size
+            while self.used_bytes > self.budget_bytes:
+                _, (_, evicted_size) = self.entries.popitem(last=False)
+                self.used_bytes -= evicted_size
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+            self.used_bytes = 0
+
+    # Function to build the weakref callback that drops a dead frame's fingerprint
+    def _forget(self, frame_id):
+        def forget(_):
+            with self.lock:
+                known = self.fingerprints.get(frame_id)
+                if known is not None and known[0]() is None:
+                    del self.fingerprints[frame_id]
+        return forget
@@ -0,0 +1,139 @@
+from itertools import chain
+
+import numpy as np
+import pandas as pd
+
+from joinapp.engine import JOIN_SUFFIXES, is_sorted_on, key_columns, normalize_columns, projection, read_csv_chunks
+
+# Rows taken from each side per step of the merge
+DEFAULT_CHUNK_ROWS = 100_000
+
+
+# Function to join two streams of chunks that are both sorted on `keys`.
+# Only rows whose key is below the smaller of the two buffered last keys are
+# joined at each step, so memory stays at about one chunk per side plus the
+# largest run of equal keys, and the output comes out in key order.
+# Each stream must start with a (possibly empty) frame carrying its columns.
+def sorted_merge_join(left_chunks, right_chunks, keys, how="inner"):
+    if how not in ("inner", "left", "right", "outer"):
+        raise ValueError(f"Sorted merge join does not support {how!r} joins")
+
+    left_chunks, right_chunks = iter(left_chunks), iter(right_chunks)
+    left_buffer, left_more = next(left_chunks), True
+    right_buffer, right_more = next(right_chunks), True
+
+    while True:
+        if left_more and left_buffer.empty:
+            left_buffer, left_more = _pull(left_chunks, left_buffer, keys, "left")
+            continue
+        if right_more and right_buffer.empty:
+            right_buffer, right_more = _pull(right_chunks, right_buffer, keys, "right")
+            continue
+        if not (left_more or right_more):
+            if not (left_buffer.empty and right_buffer.empty):
+                yield _join_piece(left_buffer, right_buffer, keys, how)
+            return
+
+        last_keys = []
+        if left_more:
+            last_keys.append(_last_key(left_buffer, keys))
+        if right_more:
+            last_keys.append(_last_key(right_buffer, keys))
+        bound = min(last_keys)
+
+        left_done = _less_than(left_buffer, keys, bound)
+        right_done = _less_than(right_buffer, keys, bound)
+        if left_done.any() or right_done.any():
+            yield _join_piece(left_buffer[left_done], right_buffer[right_done], keys, how)
+            left_buffer = left_buffer[~left_done]
+            right_buffer = right_buffer[~right_done]
+
+        # Rows equal to the bound may continue in the next chunk of the side that set it
+        if left_more and _last_key(left_buffer, keys) == bound:
+            left_buffer, left_more = _pull(left_chunks, left_buffer, keys, "left")
+        if right_more and _last_key(right_buffer, keys) == bound:
+            right_buffer, right_more = _pull(right_chunks, right_buffer, keys, "right")
+
+
+# Function to sort-merge two in-memory frames that are sorted on their join keys.
+# The result is marked as sorted on those keys, which makes sort_frame on them a no-op.
+def merge_join_frames(left, right, how="inner", chunk_rows=DEFAULT_CHUNK_ROWS):
+    keys = key_columns(left, right)
+    pieces = list(sorted_merge_join(_slices(left, chunk_rows), _slices(right, chunk_rows), keys, how))
+    if pieces:
+        result = pd.concat(pieces, ignore_index=True)
+    else:
+        result = left.iloc[:0].merge(right.iloc[:0], on=keys, how=how, suffixes=JOIN_SUFFIXES)
+    result.attrs["sorted_by"] = keys
+    return result
+
+
+# Function to sort-merge two CSV files that are sorted on their join keys,
+# reading both in chunks and appending the joined rows to out_path in key order.
+# Raises ValueError as soon as either file turns out not to be sorted.
+# With columns only those output columns (plus the join keys) are parsed, and
+# left_where/right_where filters drop rows of either file as they are read.
+# Returns the number of rows written.
+def merge_join_files(left_path, right_path, out_path, how="inner", chunksize=DEFAULT_CHUNK_ROWS, columns=None,
+                     left_where=None, right_where=None):
+    left_header = normalize_columns(pd.read_csv(left_path, nrows=0))
+    right_header = normalize_columns(pd.read_csv(right_path, nrows=0))
+    keys = key_columns(left_header, right_header)
+    left_use = right_use = None
+    if columns:
+        left_map, right_map = projection(left_header.columns, right_header.columns, how, columns)
+        left_use, right_use = list(left_map), list(right_map)
+        left_header, right_header = left_header[left_use], right_header[right_use]
+    left_chunks = chain([left_header], read_csv_chunks(left_path, chunksize, left_use, left_where))
+    right_chunks = chain([right_header], read_csv_chunks(right_path, chunksize, right_use, right_where))
+
+    header = left_header.merge(right_header, on=keys, how=how, suffixes=JOIN_SUFFIXES)
+    out_columns = list(columns) if columns else list(header.columns)
+    header[out_columns].to_csv(out_path, index=False)
+    rows_written = 0
+    for piece in sorted_merge_join(left_chunks, right_chunks, keys, how):
+        piece[out_columns].to_csv(out_path, mode="a", header=False, index=False)
+        rows_written += len(piece)
+    return rows_written
+
+
+# Function to slice a frame into views of chunk_rows rows, starting with an empty one
+def _slices(frame, chunk_rows):
+    yield frame.iloc[:0]
+    for start in range(0, len(frame), chunk_rows):
+        yield frame.iloc[start:start + chunk_rows]
+
+
+# Function to append the next chunk of a stream to its buffer, checking the sort order
+def _pull(chunks, buffer, keys, side):
+    chunk = next(chunks, None)
+    if chunk is None:
+        return buffer, False
+    if chunk.empty:
+        return buffer, True
+    if not is_sorted_on(chunk, keys) or (not buffer.empty and _first_key(chunk, keys) < _last_key(buffer, keys)):
+        raise ValueError(f"The {side} input is not sorted on {keys}")
+    return pd.concat([buffer, chunk]), True
+
+
+def _first_key(frame, keys):
+    return tuple(frame[keys].iloc[0])
+
+
+def _last_key(frame, keys):
+    return tuple(frame[keys].iloc[-1])
+
+
+# Function to mark the rows whose key tuple sorts strictly before `bound`
+def _less_than(frame, keys, bound):
+    less = np.zeros(len(frame), dtype=bool)
+    equal_so_far = np.ones(len(frame), dtype=bool)
+    for col, value in zip(keys, bound):
+        values = frame[col].to_numpy()
+        less |= equal_so_far & (values < value)
+        equal_so_far &= values == value
+    return less
+
+
+def _join_piece(left, right, keys, how):
+    return left.merge(right, on=keys, how=how, suffixes=JOIN_SUFFIXES)
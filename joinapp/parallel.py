@@ -0,0 +1,85 @@
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+
+import numpy as np
+import pandas as pd
+
+from joinapp.encoding import decode_keys, encode_keys
+from joinapp.engine import JOIN_TYPES, join_frames, key_columns
+
+# Helper column carrying input row positions when the result order is restored
+_ROW_POSITION = "__row_position"
+
+
+# Function to join two frames by hash-partitioning both on the join keys and
+# merging the bucket pairs on a process pool. Matches join_frames row for row;
+# with preserve_order=False the rows come back grouped by bucket, which skips
+# the final single-threaded reorder.
+def parallel_join(left, right, how="inner", workers=None, partitions=None, preserve_order=True, mp_context=None,
+                  categorical_keys=False):
+    how = how.strip().lower()
+    if how not in JOIN_TYPES:
+        raise ValueError(f"Unknown join type: {how!r}")
+    if how == "cross":
+        # Nothing to partition on; a lazy product is cheaper than any split
+        return join_frames(left, right, how, lazy=True)
+
+    workers = workers or os.cpu_count() or 1
+    partitions = partitions or workers
+    keys = key_columns(left, right)
+    original_dtypes = {}
+    if categorical_keys:
+        # Encode once up front so every bucket shares the same dictionaries
+        left, right, original_dtypes = encode_keys(left, right, keys)
+    left_hashes, right_hashes = key_hashes(left, right, keys)
+
+    # Inner and left joins keep the left order, right joins the right order
+    track_left = preserve_order and how in ("inner", "left")
+    track_right = preserve_order and how == "right"
+    left_parts = split(left, left_hashes % partitions, partitions, track_left)
+    right_parts = split(right, right_hashes % partitions, partitions, track_right)
+
+    if mp_context is None and "fork" in multiprocessing.get_all_start_methods():
+        mp_context = multiprocessing.get_context("fork")
+    with ProcessPoolExecutor(max_workers=min(workers, partitions), mp_context=mp_context) as executor:
+        parts = list(executor.map(join_frames, left_parts, right_parts, repeat(how)))
+
+    joined = decode_keys(pd.concat(parts, ignore_index=True), original_dtypes)
+    if not preserve_order:
+        return joined
+    if how == "outer":
+        # merge() sorts outer joins by key
+        return joined.sort_values(by=keys, kind="mergesort", ignore_index=True)
+    joined = joined.sort_values(by=_ROW_POSITION, kind="mergesort", ignore_index=True)
+    return joined.drop(columns=[_ROW_POSITION])
+
+
+# Function to hash the key columns of both sides so equal keys land in the same bucket.
+# Numeric keys with different dtypes (int vs float) are hashed as float on both sides.
+def key_hashes(left, right, keys):
+    left_keys = left[keys]
+    right_keys = right[keys]
+    for col in keys:
+        left_dtype, right_dtype = left_keys[col].dtype, right_keys[col].dtype
+        if left_dtype != right_dtype and all(pd.api.types.is_numeric_dtype(d) for d in (left_dtype, right_dtype)):
+            left_keys = left_keys.astype({col: "float64"})
+            right_keys = right_keys.astype({col: "float64"})
+    left_hashes = pd.util.hash_pandas_object(left_keys, index=False).to_numpy()
+    right_hashes = pd.util.hash_pandas_object(right_keys, index=False).to_numpy()
+    return left_hashes, right_hashes
+
+
+# Function to split a frame into buckets, keeping the input order within each bucket
+def split(frame, buckets, partitions, with_positions):
+    order = np.argsort(buckets, kind="stable")
+    bounds = np.searchsorted(buckets[order], np.arange(partitions + 1))
+    parts = []
+    for start, stop in zip(bounds[:-1], bounds[1:]):
+        positions = order[start:stop]
+        part = frame.take(positions)
+        if with_positions:
+            part[_ROW_POSITION] = positions
+        parts.append(part)
+    return parts
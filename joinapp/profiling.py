@@ -0,0 +1,147 @@
+import cProfile
+import functools
+import pstats
+import threading
+import time
+import tracemalloc
+
+from joinapp.resources import current_rss, peak_rss, reset_peak_rss
+
+# Frames kept per allocation in tracemalloc snapshots
+TRACEMALLOC_FRAMES = 10
+
+
+# Records how long each user action and the stages inside it took, and how much
+# memory they used. An operation (e.g. a button press) starts a new breakdown;
+# stages run inside it, on any thread, are added to it. On request it also
+# captures a cProfile profile and tracemalloc snapshot for dumping to files.
+class Profiler:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.operation_name = None
+        self.operation_started = None
+        self.stages = []
+        self.local = threading.local()
+        self.capturing = False
+        self.profiles = []
+        self.running = 0
+
+    # Function to start a new breakdown, dropping the previous operation's stages
+    def begin(self, name):
+        with self.lock:
+            self.operation_name = name
+            self.operation_started = time.perf_counter()
+            self.stages = []
+
+    # Function to wrap func so each call is timed as a stage; with operation=True
+    # each call also starts a new breakdown, as a user action does
+    def wrap(self, func, name=None, operation=False):
+        name = name or func.__name__
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if operation:
+                self.begin(name)
+            return self.run_stage(name, func, *args, **kwargs)
+        return wrapper
+
+    # Function to call func as a named stage: wall time, RSS change and peak RSS
+    # are recorded, and while a capture runs it is profiled on this thread too.
+    # Nested stages reset the peak, so an outer stage takes the largest of them.
+    # The peak is one high-water mark for the whole process, so it is only reset
+    # while no stage runs on another thread; stages that overlap across threads
+    # share it and each report the peak of the two together.
+    def run_stage(self, name, func, *args, **kwargs):
+        depth = getattr(self.local, "depth", 0)
+        child_peaks = getattr(self.local, "child_peaks", [])
+        self.local.depth, self.local.child_peaks = depth + 1, []
+        with self.lock:
+            others_running = self.running > depth
+            self.running += 1
+        if not others_running:
+            reset_peak_rss()
+        before = current_rss()
+        started = time.perf_counter()
+        try:
+            profile = None
+            if self.capturing and depth == 0 and threading.current_thread() is not threading.main_thread():
+                profile = self.thread_profile()
+            if profile is None:
+                return func(*args, **kwargs)
+            try:
+                return func(*args, **kwargs)
+            finally:
+                profile.disable()
+        finally:
+            ended = time.perf_counter()
+            after = current_rss()
+            peak = max([peak_rss()] + self.local.child_peaks)
+            self.local.depth, self.local.child_peaks = depth, child_peaks
+            child_peaks.append(peak)
+            with self.lock:
+                self.running -= 1
+                self.stages.append({
+                    "stage": name, "depth": depth, "seconds": ended - started, "ended": ended,
+                    "rss_delta_bytes": after - before, "peak_rss_bytes": peak,
+                })
+
+    # Function to start a cProfile profile for a worker thread's stage, which the
+    # capture's own profile does not see before Python 3.12. From 3.12 one profile
+    # sees every thread and a second one cannot be enabled; returns None then.
+    def thread_profile(self):
+        profile = cProfile.Profile()
+        try:
+            profile.enable()
+        except ValueError:
+            # "Another profiling tool is already active": the capture covers this thread
+            return None
+        with self.lock:
+            self.profiles.append(profile)
+        return profile
+
+    # Function to describe the last operation in one line for the status bar. An
+    # operation lasts until its last stage ends, which for work handed to a worker
+    # thread is after the function that started it has returned.
+    def summary(self):
+        with self.lock:
+            name, started, stages = self.operation_name, self.operation_started, list(self.stages)
+        if name is None:
+            return "No operation timed yet"
+        if not stages:
+            return f"{name}: running"
+        elapsed = max(stage["ended"] for stage in stages) - started
+        peak = max(stage["peak_rss_bytes"] for stage in stages)
+        parts = [
+            f"{stage['stage']} {stage['seconds']:.2f}s ({stage['rss_delta_bytes'] / 1024 ** 2:+.0f} MB)"
+            for stage in stages
+        ]
+        return f"{name} {elapsed:.2f}s, peak {peak / 1024 ** 2:.0f} MB: " + ", ".join(parts)
+
+    # Function to start profiling the calling thread (and stages on other threads)
+    # with cProfile, and tracking allocations with tracemalloc
+    def start_capture(self):
+        with self.lock:
+            self.profiles = [cProfile.Profile()]
+        tracemalloc.start(TRACEMALLOC_FRAMES)
+        self.capturing = True
+        self.profiles[0].enable()
+
+    # Function to stop a capture and write it out: the cProfile statistics to
+    # profile_path (open with pstats or snakeviz) and the tracemalloc snapshot to
+    # snapshot_path (tracemalloc.Snapshot.load)
+    def dump_capture(self, profile_path, snapshot_path):
+        self.profiles[0].disable()
+        self.capturing = False
+        snapshot = tracemalloc.take_snapshot()
+        tracemalloc.stop()
+        with self.lock:
+            profiles, self.profiles = self.profiles, []
+        stats = pstats.Stats(profiles[0])
+        for profile in profiles[1:]:
+            try:
+                stats.add(profile)
+            except TypeError:
+                # A worker stage still running has no statistics yet
+                pass
+        stats.dump_stats(profile_path)
+        snapshot.dump(snapshot_path)
@@ -0,0 +1,69 @@
+import os
+import sys
+
+try:
+    import resource
+except ImportError:
+    # Not available on Windows; psutil stands in where it is installed
+    resource = None
+
+# Per-process memory figures from /proc on Linux
+_PROC_STATUS = "/proc/self/status"
+_PROC_CLEAR_REFS = "/proc/self/clear_refs"
+
+
+# Function to read the resident set size of this process in bytes (0 if unknown)
+def current_rss():
+    rss = _proc_status_bytes("VmRSS")
+    if rss:
+        return rss
+    info = _psutil_memory()
+    return info.rss if info is not None else 0
+
+
+# Function to read the peak resident set size of this process in bytes (0 if
+# unknown). On Linux this is the high-water mark since the last
+# reset_peak_rss(); elsewhere it is the peak over the whole life of the process.
+def peak_rss():
+    peak = _proc_status_bytes("VmHWM")
+    if peak:
+        return peak
+    if resource is not None:
+        maxrss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # ru_maxrss is in bytes on macOS and in kilobytes everywhere else
+        return maxrss if sys.platform == "darwin" else maxrss * 1024
+    info = _psutil_memory()
+    # Only Windows reports a peak working set through psutil
+    return getattr(info, "peak_wset", 0) if info is not None else 0
+
+
+# Function to restart the peak RSS measurement, so peak_rss() covers what comes
+# next. Returns False where the peak cannot be reset. The high-water mark
+# belongs to the whole process, so a reset also restarts the peak of anything
+# running on other threads.
+def reset_peak_rss():
+    try:
+        with open(_PROC_CLEAR_REFS, "w") as file:
+            file.write("5")
+    except OSError:
+        return False
+    return True
+
+
+def _proc_status_bytes(field):
+    if not os.path.exists(_PROC_STATUS):
+        return 0
+    with open(_PROC_STATUS) as file:
+        for line in file:
+            if line.startswith(field + ":"):
+                return int(line.split()[1]) * 1024
+    return 0
+
+
+# Function to read this process's memory counters through psutil, or None without it
+def _psutil_memory():
+    try:
+        import psutil
+    except ImportError:
+        return None
+    return psutil.Process().memory_info()
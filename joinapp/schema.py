@@ -0,0 +1,116 @@
+import importlib.util
+import json
+import os
+
+import pandas as pd
+
+# Rows read to infer a schema
+DEFAULT_SAMPLE_ROWS = 10_000
+
+# Text columns with at most this share of distinct values in the sample become categoricals
+CATEGORY_MAX_UNIQUE_RATIO = 0.5
+
+# Date layouts tried on text columns, day-first ones before ISO
+DATE_FORMATS = ["%d/%m/%Y", "%d-%m-%Y", "%d.%m.%Y", "%d/%m/%Y %H:%M", "%d/%m/%Y %H:%M:%S", "%Y-%m-%d", "%Y-%m-%d %H:%M:%S"]
+
+SCHEMA_SUFFIX = ".schema.json"
+
+
+# Function to return the sidecar schema path for a CSV file
+def schema_path(csv_path):
+    return csv_path + SCHEMA_SUFFIX
+
+
+# Function to infer a compact schema from the first sample_rows rows of a CSV.
+# Each column maps to {"kind": integer | float | bool | datetime | category | string},
+# datetime columns also record their "format".
+def infer_schema(csv_path, sample_rows=DEFAULT_SAMPLE_ROWS):
+    sample = pd.read_csv(csv_path, nrows=sample_rows)
+    columns = {}
+    for col in sample.columns:
+        series = sample[col]
+        if pd.api.types.is_bool_dtype(series.dtype):
+            columns[col] = {"kind": "bool"}
+        elif pd.api.types.is_integer_dtype(series.dtype):
+            columns[col] = {"kind": "integer"}
+        elif pd.api.types.is_float_dtype(series.dtype):
+            columns[col] = {"kind": "float"}
+        else:
+            columns[col] = infer_text_column(series.dropna().astype(str))
+    return {"version": 1, "sample_rows": sample_rows, "columns": columns}
+
+
+# Function to classify a text column as datetime, category or plain string
+def infer_text_column(values):
+    if len(values):
+        for date_format in DATE_FORMATS:
+            if pd.to_datetime(values, format=date_format, errors="coerce").notna().all():
+                return {"kind": "datetime", "format": date_format}
+        if values.nunique() <= CATEGORY_MAX_UNIQUE_RATIO * len(values):
+            return {"kind": "category"}
+    return {"kind": "string"}
+
+
+def save_schema(schema, path):
+    with open(path, "w") as file:
+        json.dump(schema, file, indent=2)
+
+
+def load_schema(path):
+    with open(path, "r") as file:
+        return json.load(file)
+
+
+# Function to read a CSV with explicit dtypes from a schema: categoricals are
+# parsed directly, integers are downcast to the smallest type that holds them
+# and date columns are converted with their recorded format. Without a schema
+# argument the sidecar file is reused if its columns still match the header,
+# otherwise a schema is inferred (and written to the sidecar with save=True).
+# usecols limits parsing to those header columns. With chunksize an iterator of
+# converted chunks is returned instead, like read_csv(chunksize=...).
+def read_typed_csv(csv_path, schema=None, save=False, usecols=None, chunksize=None):
+    header = list(pd.read_csv(csv_path, nrows=0).columns)
+    if schema is None:
+        sidecar = schema_path(csv_path)
+        if os.path.exists(sidecar):
+            schema = load_schema(sidecar)
+        if schema is None or list(schema["columns"]) != header:
+            schema = infer_schema(csv_path)
+            if save:
+                try:
+                    save_schema(schema, sidecar)
+                except OSError:
+                    pass
+
+    columns = schema["columns"]
+    dtypes = {col: "category" for col, spec in columns.items() if spec["kind"] == "category"}
+    if chunksize is not None:
+        # The pyarrow parser cannot read in chunks
+        reader = pd.read_csv(csv_path, dtype=dtypes, usecols=usecols, chunksize=chunksize)
+        return (convert_columns(chunk, columns) for chunk in reader)
+    frame = pd.read_csv(csv_path, dtype=dtypes, usecols=usecols, **parser_options())
+    return convert_columns(frame, columns)
+
+
+# Function to downcast integer columns and parse date columns as a schema says
+def convert_columns(frame, columns):
+    for col, spec in columns.items():
+        if col not in frame.columns:
+            continue
+        if spec["kind"] == "integer" and pd.api.types.is_integer_dtype(frame[col].dtype):
+            frame[col] = pd.to_numeric(frame[col], downcast="integer")
+        elif spec["kind"] == "datetime":
+            try:
+                frame[col] = pd.to_datetime(frame[col], format=spec["format"])
+            except (ValueError, TypeError):
+                # Later rows do not follow the sampled layout; keep the column as text
+                pass
+    return frame
+
+
+# Function to pick the multi-threaded pyarrow parser when it is installed.
+# Looks the package up without importing it, so the check stays cheap.
+def parser_options():
+    if importlib.util.find_spec("pyarrow") is None:
+        return {}
+    return {"engine": "pyarrow"}
@@ -0,0 +1,92 @@
+import os
+
+import numpy as np
+import pandas as pd
+
+from joinapp.engine import key_columns, normalize_columns, projection, read_csv_chunks
+from joinapp.index import KeyIndex, probe_join
+
+# Rows read from the streamed file per chunk
+DEFAULT_CHUNKSIZE = 100_000
+
+
+# Function to join two CSV files without loading the larger one into memory.
+# The smaller file (by size on disk) is loaded and indexed; the other is read
+# in chunks, probed against the index and written to out_path as it goes.
+# With columns only those output columns (plus the join keys) are parsed, and
+# left_where/right_where filters drop rows of either file as they are read.
+# Returns the number of rows written.
+def stream_join(left_path, right_path, out_path, how="inner", chunksize=DEFAULT_CHUNKSIZE, columns=None,
+                left_where=None, right_where=None):
+    how = how.strip().lower()
+    if how == "cross":
+        raise ValueError("Cross joins cannot be streamed; use join_frames(..., lazy=True)")
+    if how not in ("inner", "left", "right", "outer"):
+        raise ValueError(f"Unknown join type: {how!r}")
+
+    left_header = normalize_columns(pd.read_csv(left_path, nrows=0))
+    right_header = normalize_columns(pd.read_csv(right_path, nrows=0))
+    keys = key_columns(left_header, right_header)
+    right_extra = [col for col in right_header.columns if col not in keys]
+    out_columns = list(left_header.columns) + right_extra
+    left_use = right_use = None
+    if columns:
+        left_map, right_map = projection(left_header.columns, right_header.columns, how, columns)
+        left_use, right_use = list(left_map), list(right_map)
+        out_columns = list(columns)
+
+    stream_is_left = os.path.getsize(left_path) > os.path.getsize(right_path)
+    left_side, right_side = (left_path, left_use, left_where), (right_path, right_use, right_where)
+    indexed_path, indexed_use, indexed_where = right_side if stream_is_left else left_side
+    indexed = pd.concat(read_csv_chunks(indexed_path, chunksize, indexed_use, indexed_where), ignore_index=True)
+    stream_path, stream_use, stream_where = left_side if stream_is_left else right_side
+    chunks = read_csv_chunks(stream_path, chunksize, stream_use, stream_where)
+    return _write_probed(indexed, chunks, stream_is_left, keys, how, out_columns, out_path)
+
+
+# Function to write the join of two in-memory frames to a CSV file without ever
+# holding the whole result: the smaller frame is indexed and the larger one is
+# probed chunksize rows at a time, so memory stays bounded however much the
+# keys multiply. With columns only those output columns are written.
+# Returns the number of rows written.
+def stream_join_frames(left, right, out_path, how="inner", chunksize=DEFAULT_CHUNKSIZE, columns=None):
+    how = how.strip().lower()
+    if how not in ("inner", "left", "right", "outer"):
+        raise ValueError(f"Cannot stream a {how!r} join")
+    keys = key_columns(left, right)
+    out_columns = list(columns) if columns else list(left.columns) + [col for col in right.columns if col not in keys]
+    if columns:
+        left_map, right_map = projection(left.columns, right.columns, how, columns)
+        left, right = left[list(left_map)], right[list(right_map)]
+
+    stream_is_left = len(left) > len(right)
+    indexed, streamed = (right, left) if stream_is_left else (left, right)
+    chunks = (streamed.iloc[start:start + chunksize] for start in range(0, len(streamed), chunksize))
+    return _write_probed(indexed, chunks, stream_is_left, keys, how, out_columns, out_path)
+
+
+# Function to index one side of a join, probe it with each chunk of the other
+# side and append the joined rows (then, for outer sides, the unmatched indexed
+# rows) to out_path as CSV
+def _write_probed(indexed, chunks, stream_is_left, keys, how, out_columns, out_path):
+    index = KeyIndex(indexed, keys)
+    keep_left = how in ("left", "outer")
+    keep_right = how in ("right", "outer")
+    keep_streamed = keep_left if stream_is_left else keep_right
+    keep_indexed = keep_right if stream_is_left else keep_left
+    indexed_matched = np.zeros(len(index), dtype=bool)
+
+    pd.DataFrame(columns=out_columns).to_csv(out_path, index=False)
+    rows_written = 0
+
+    for chunk in chunks:
+        joined = probe_join(chunk, index, keep_streamed, stream_is_left, indexed_matched)
+        joined[out_columns].to_csv(out_path, mode="a", header=False, index=False)
+        rows_written += len(joined)
+
+    if keep_indexed:
+        unmatched = index.frame[~indexed_matched].reindex(columns=out_columns)
+        unmatched.to_csv(out_path, mode="a", header=False, index=False)
+        rows_written += len(unmatched)
+
+    return rows_written
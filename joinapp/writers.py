@@ -0,0 +1,158 @@
+import gzip
+import io
+import multiprocessing
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+# Rows encoded per batch by the streaming writers
+DEFAULT_BATCH_ROWS = 100_000
+
+# Bytes buffered between the encoder and the file; each batch is encoded,
+# written and dropped before the next one is built
+WRITE_BUFFER_BYTES = 4 * 1024 ** 2
+
+# Frame being written by write_csv; forked formatting workers inherit it instead
+# of receiving pickled row chunks
+_csv_source = None
+
+# Compression codecs of text outputs, by the extension that follows the format's own
+COMPRESSED_EXTENSIONS = {".gz": "gzip", ".zst": "zstd"}
+
+
+# Function to return the fork start method where forking a worker pool is safe
+# to do by default (Linux), or None elsewhere: macOS can crash in forked
+# children of processes that use system frameworks, and Windows cannot fork
+def fork_context():
+    if sys.platform.startswith("linux"):
+        return multiprocessing.get_context("fork")
+    return None
+
+
+# Function to name the compression a text output's extension asks for ("none" if any other)
+def compression_from_path(path):
+    return COMPRESSED_EXTENSIONS.get(os.path.splitext(path)[1].lower(), "none")
+
+
+# Function to open a binary output file behind a large write buffer, compressing
+# with gzip or zstd if asked. With append=True new data goes after the existing
+# contents; concatenated gzip members and zstd frames decode as one stream.
+def open_output(path, compression="none", append=False):
+    mode = "ab" if append else "wb"
+    if compression == "none":
+        return open(path, mode, buffering=WRITE_BUFFER_BYTES)
+    if compression == "gzip":
+        return io.BufferedWriter(gzip.open(path, mode, compresslevel=6), WRITE_BUFFER_BYTES)
+    if compression == "zstd":
+        try:
+            import zstandard
+        except ImportError:
+            raise ValueError("zstd compression needs the zstandard package") from None
+        return io.BufferedWriter(zstandard.ZstdCompressor().stream_writer(open(path, mode)), WRITE_BUFFER_BYTES)
+    raise ValueError(f"Unsupported compression: {compression!r}")
+
+
+# Function to cut a DataFrame into positional row batches without copying it
+def frame_batches(frame, batch_rows=DEFAULT_BATCH_ROWS):
+    for start in range(0, len(frame), batch_rows):
+        yield frame.iloc[start:start + batch_rows]
+
+
+# Function to write DataFrame batches as JSON Lines, one record per line.
+# Only one encoded batch is in memory at a time. Returns the number of rows written.
+def write_json_lines(batches, path, compression=None, append=False):
+    rows = 0
+    with open_output(path, compression or compression_from_path(path), append) as out:
+        for batch in batches:
+            if batch.empty:
+                continue
+            out.write(batch.to_json(orient="records", lines=True).encode("utf-8"))
+            rows += len(batch)
+    return rows
+
+
+# Function to write DataFrame batches as one JSON array of records, the layout
+# of to_json(orient="records"), without building the whole document in memory.
+# Returns the number of rows written.
+def write_json_array(batches, path):
+    rows = 0
+    with open_output(path) as out:
+        out.write(b"[")
+        separator = b""
+        for batch in batches:
+            records = batch.to_json(orient="records")[1:-1]
+            if records:
+                out.write(separator + records.encode("utf-8"))
+                separator = b","
+            rows += len(batch)
+        out.write(b"]")
+    return rows
+
+
+# Function to write a DataFrame (or LazyCrossJoin) as CSV, formatting chunks of
+# chunk_rows rows on forked worker processes and writing them in order through
+# a buffered (and, for .gz/.zst names, compressed) file. The bytes match
+# to_csv(index=False). Workers are forked by default on Linux only (see
+# fork_context); elsewhere, or with a non-fork mp_context, the chunks are
+# formatted in this process. The app exports from a worker thread and asks
+# for more than one worker only when its export_workers preference opts in.
+# progress(rows_written, total_rows) is called after each chunk; when
+# cancel.is_set() turns true the partial file is removed and None is returned.
+# Returns the number of rows written.
+def write_csv(frame, path, workers=None, chunk_rows=DEFAULT_BATCH_ROWS, progress=None, cancel=None, mp_context=None):
+    global _csv_source
+    total = len(frame)
+    bounds = [(start, min(start + chunk_rows, total)) for start in range(0, total, chunk_rows)]
+    workers = min(workers or os.cpu_count() or 1, len(bounds))
+    if mp_context is None:
+        mp_context = fork_context()
+
+    executor = None
+    if workers > 1 and mp_context is not None and mp_context.get_start_method() == "fork":
+        _csv_source = frame
+        executor = ProcessPoolExecutor(max_workers=workers, mp_context=mp_context)
+    written = 0
+    try:
+        with open_output(path, compression_from_path(path)) as out:
+            out.write(frame.iloc[0:0].to_csv(index=False).encode("utf-8"))
+            # Keep a couple of chunks per worker in flight so memory stays bounded
+            pending = []
+            for start, stop in bounds:
+                if cancel is not None and cancel.is_set():
+                    break
+                if executor is None:
+                    pending.append(_format_csv_chunk(start, stop, frame))
+                else:
+                    pending.append(executor.submit(_format_csv_chunk, start, stop))
+                    if len(pending) < 2 * workers:
+                        continue
+                written += _write_chunk(out, pending.pop(0))
+                if progress is not None:
+                    progress(written, total)
+            while pending and not (cancel is not None and cancel.is_set()):
+                written += _write_chunk(out, pending.pop(0))
+                if progress is not None:
+                    progress(written, total)
+    finally:
+        if executor is not None:
+            executor.shutdown(cancel_futures=True)
+            _csv_source = None
+
+    if cancel is not None and cancel.is_set():
+        os.remove(path)
+        return None
+    return written
+
+
+# Function to format rows [start, stop) of a frame as CSV without a header.
+# Worker processes format the frame they inherited from write_csv.
+def _format_csv_chunk(start, stop, frame=None):
+    rows = (_csv_source if frame is None else frame).iloc[start:stop]
+    return len(rows), rows.to_csv(index=False, header=False).encode("utf-8")
+
+
+# Function to write one formatted chunk (or the future of one); returns its row count
+def _write_chunk(out, chunk):
+    rows, data = chunk if isinstance(chunk, tuple) else chunk.result()
+    out.write(data)
+    return rows
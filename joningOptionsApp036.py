@@ -1,8 +1,23 @@
 import tkinter as tk
 from tkinter import ttk, filedialog, messagebox, font
 import pandas as pd
+import hashlib
 import json
+import multiprocessing
 import os
+import queue
+import threading
+
+from joinapp import engine, extsort, writers
+from joinapp.cache import FrameCache
+from joinapp.cardinality import estimate_join
+from joinapp.filters import filter_frame
+from joinapp.incremental import INCREMENTAL_JOIN_TYPES, AppendTracker, append_rows, append_to_export, join_appended
+from joinapp.index import KeyIndex, ensure_index
+from joinapp.lazy import LazyCrossJoin
+from joinapp.memo import ResultCache
+from joinapp.profiling import Profiler
+from joinapp.streaming import stream_join_frames
 
 # Initialize Tkinter window
 root = tk.Tk()
@@ -11,7 +26,30 @@ root.geometry("1000x600")  # Set a default size for better visibility
 
 # Default user preferences
 preferences = {
-    "font_size": 10
+    "font_size": 10,
+    "virtual_grid": True,
+    "external_sort_rows": 5_000_000,
+    "csv_cache": True,
+    "csv_cache_mb": 2048,
+    "result_cache_mb": 1024,
+    "parallel_join_workers": 0,
+    "categorical_keys": True,
+    "typed_loading": False,
+    "save_schema": True,
+    "detect_sorted_inputs": True,
+    "index_reference_table": False,
+    "reference_index_dir": "",
+    "parquet_compression": "snappy",
+    "arrow_compression": "lz4",
+    "jsonl_compression": "none",
+    "export_workers": 0,
+    "profiling": False,
+    "join_guard": True,
+    "join_guard_rows": 20_000_000,
+    "join_guard_mb": 4096,
+    "fuzzy_threshold": 0.85,
+    "asof_tolerance": "",
+    "date_range_columns": ["start_date", "end_date"]
 }
 preferences_file = "preferences.json"
 
@@ -20,10 +58,28 @@ if os.path.exists(preferences_file):
     with open(preferences_file, "r") as file:
         preferences.update(json.load(file))
 
+# On-disk cache of parsed CSVs so reopening a known file skips the parse
+frame_cache = FrameCache(max_bytes=preferences["csv_cache_mb"] * 1024 ** 2) if preferences["csv_cache"] else None
+
+# Recent join results, so switching join types on the same inputs is instant
+result_cache = ResultCache(preferences["result_cache_mb"] * 1024 ** 2)
+
+# Partitioned joins run on forked worker processes; this script has no main guard,
+# so spawned workers would re-run the GUI and the feature is only offered with fork
+parallel_join_available = "fork" in multiprocessing.get_all_start_methods()
+
 # Initialize variables for datasets
 data1 = pd.DataFrame()
 data2 = pd.DataFrame()
+data2_path = None
+data2_where = None  # Load filter Data 2 was read with; a saved index of it records the same
+data1_tracker = None  # Remembers how much of Data 1's file is loaded, for refreshes
+data1_where = None  # Load filter Data 1 was read with; refreshed rows go through it too
 result = pd.DataFrame()  # Placeholder for the join result
+result_join_type = None  # Join type of result while its rows are still in join order
+result_columns = None  # Output columns result was projected to, if any
+output_columns = []  # Output columns chosen with Pick Columns; empty keeps every column
+exported_files = []  # (path, format) of exports of the current result, kept in step on refresh
 
 # Variables to store filenames
 data1_filename = tk.StringVar(value="No file loaded")
@@ -33,6 +89,16 @@ data2_filename = tk.StringVar(value="No file loaded")
 style = ttk.Style()
 style.configure("Treeview", rowheight=20)  # Default row height
 
+# File types offered by the open dialogs; binary files are read memory-mapped
+DATA_FILE_TYPES = [
+    ("Data files", "*.csv *.json *.jsonl *.jsonl.gz *.jsonl.zst *.parquet *.feather *.arrow"),
+    ("CSV files", "*.csv"),
+    ("JSON files", "*.json"),
+    ("JSON Lines files", "*.jsonl *.jsonl.gz *.jsonl.zst"),
+    ("Parquet files", "*.parquet"),
+    ("Feather/Arrow files", "*.feather *.arrow"),
+]
+
 # Function to adjust font size and row height for all elements
 def set_font_size(size):
     preferences["font_size"] = size
@@ -45,10 +111,10 @@ def set_font_size(size):
 
     # Apply font size to other widgets, including menu labels
     for widget in [
-        load_data1_button, load_data2_button, join_button,
-        increase_font_button, decrease_font_button, sort_button,
-        export_csv_button, export_json_button, join_type, sort_column,
-        sort_column_2, sort_order_choice, join_result_label, join_type_text
+        load_data1_button, load_data2_button, refresh_data1_button, pick_columns_button, join_button,
+        cancel_join_button, cancel_export_button, increase_font_button, decrease_font_button, sort_button,
+        export_csv_button, export_json_button, export_jsonl_button, export_parquet_button, export_arrow_button,
+        profile_button, status_bar, join_type, sort_column, sort_column_2, sort_order_choice, load_filter, join_result_label, date_match_label, date_match, fuzzy_names_check, join_type_text
     ] + menu_labels:
         widget.configure(font=font_style)
     
@@ -56,24 +122,158 @@ def set_font_size(size):
     data1_file_label.configure(font=font_style)
     data2_file_label.configure(font=font_style)
 
+# Function to read a data file with the preferences and the Load Filter box;
+# returns None (after telling the user) if the filter is invalid
+def load_file(file_path):
+    try:
+        return engine.load_frame(
+            file_path, frame_cache, preferences["categorical_keys"],
+            preferences["typed_loading"], preferences["save_schema"],
+            where=load_filter.get().strip() or None,
+        )
+    except ValueError as e:
+        messagebox.showerror("Load Error", f"Could not load {os.path.basename(file_path)}: {e}")
+        return None
+
+# Function to stop treating the shown result as the join of the loaded data once
+# Data 1 or Data 2 is replaced: a refresh then joins again in full instead of
+# appending to it, and its exports are no longer kept in step. Loads wait for a
+# running join, whose result would otherwise be taken for the new data's.
+def forget_result_inputs():
+    global result_join_type
+    result_join_type = None
+    exported_files.clear()
+
 # Function to load data into Treeview for Data 1
 def load_data1():
-    global data1
-    file_path = filedialog.askopenfilename(filetypes=[("CSV files", "*.csv")])
+    global data1, data1_tracker, data1_where
+    if join_running:
+        messagebox.showwarning("Join Running", "Wait for the running join to finish, or cancel it, before loading.")
+        return
+    file_path = filedialog.askopenfilename(filetypes=DATA_FILE_TYPES)
     if file_path:
-        data1 = pd.read_csv(file_path)
+        # Only CSV files can be refreshed by reading what was appended to them
+        tracker = AppendTracker(file_path) if engine.file_format(file_path, default="csv") == "csv" else None
+        frame = load_file(file_path)
+        if frame is None:
+            return
+        data1, data1_tracker, data1_where = frame, tracker, load_filter.get().strip() or None
+        output_columns.clear()
+        forget_result_inputs()
         update_treeview(data1_tree, data1)
         data1_filename.set(f"Loaded: {os.path.basename(file_path)}")
 
 # Function to load data into Treeview for Data 2
 def load_data2():
-    global data2
-    file_path = filedialog.askopenfilename(filetypes=[("CSV files", "*.csv")])
+    global data2, data2_path, data2_where
+    if join_running:
+        messagebox.showwarning("Join Running", "Wait for the running join to finish, or cancel it, before loading.")
+        return
+    file_path = filedialog.askopenfilename(filetypes=DATA_FILE_TYPES)
     if file_path:
-        data2 = pd.read_csv(file_path)
+        frame = load_file(file_path)
+        if frame is None:
+            return
+        data2, data2_path, data2_where = frame, file_path, load_filter.get().strip() or None
+        output_columns.clear()
+        forget_result_inputs()
         update_treeview(data2_tree, data2)
         data2_filename.set(f"Loaded: {os.path.basename(file_path)}")
 
+# Function to pick up rows appended to Data 1's file since it was loaded. Inner,
+# left and cross results only gain the join of the new rows, which is appended to
+# the result grid and to the files it was exported to; other joins run again.
+def refresh_data1():
+    global data1, result
+    if data1_tracker is None:
+        messagebox.showwarning("No Data", "Load Data 1 from a CSV file before refreshing it.")
+        return
+    if join_running:
+        messagebox.showwarning("Join Running", "Wait for the running join to finish before refreshing.")
+        return
+
+    delta = data1_tracker.read_appended(data1.columns)
+    if delta is None:
+        messagebox.showwarning(
+            "File Rewritten",
+            f"{os.path.basename(data1_tracker.path)} was changed, not appended to. Load it again.",
+        )
+        return
+    if delta.empty:
+        return
+
+    old_data1 = data1
+    data1 = append_rows(data1, delta)
+    if data1_where:
+        try:
+            appended = filter_frame(data1.iloc[len(old_data1):], data1_where)
+        except ValueError as e:
+            data1 = old_data1
+            messagebox.showerror("Refresh Error", str(e))
+            return
+        if appended.empty:
+            data1 = old_data1
+            return
+        data1 = pd.concat([data1.iloc[:len(old_data1)], appended], ignore_index=True)
+    update_treeview(data1_tree, data1)
+    if result_join_type is None or data2.empty:
+        if not result.empty:
+            join_data()
+        return
+
+    # Only the appended rows are joined; the converted frame keeps data1's dtypes
+    delta = data1.iloc[len(old_data1):].reset_index(drop=True)
+    try:
+        result, added = join_appended(result, data1, delta, data2, result_join_type, result_columns)
+        for path, fmt in exported_files:
+            append_to_export(path, added, fmt, result)
+    except (KeyError, ValueError, pd.errors.MergeError, OSError) as e:
+        messagebox.showerror("Refresh Error", f"Incremental join failed: {e}")
+        return
+    display_join_result()
+
+# Function to choose the output columns of the next join. Only the chosen columns
+# (and the join keys) are carried through the merge; unchosen keys are dropped after.
+def pick_columns():
+    if data1.empty or data2.empty:
+        messagebox.showwarning("No Data", "Load both files before picking columns.")
+        return
+    try:
+        fuzzy_threshold = preferences["fuzzy_threshold"] if fuzzy_names.get() else None
+        available = list(engine.join_frames(
+            data1.iloc[:0], data2.iloc[:0], join_type.get(), fuzzy_threshold=fuzzy_threshold, **date_join_options(),
+        ).columns)
+    except (KeyError, ValueError, pd.errors.MergeError) as e:
+        messagebox.showerror("Join Error", f"Join operation failed: {e}")
+        return
+
+    picker = tk.Toplevel(root)
+    picker.title("Output Columns")
+    listbox = tk.Listbox(picker, selectmode="multiple", exportselection=False, height=min(len(available), 20))
+    for position, col in enumerate(available):
+        listbox.insert(tk.END, col)
+        if col in output_columns:
+            listbox.selection_set(position)
+    listbox.grid(row=0, column=0, columnspan=2, padx=5, pady=5, sticky="nsew")
+
+    def apply():
+        chosen = [available[position] for position in listbox.curselection()]
+        output_columns[:] = [] if len(chosen) == len(available) else chosen
+        picker.destroy()
+
+    def keep_all():
+        output_columns.clear()
+        picker.destroy()
+
+    tk.Button(picker, text="Apply", command=apply).grid(row=1, column=0, padx=5, pady=5, sticky="w")
+    tk.Button(picker, text="All Columns", command=keep_all).grid(row=1, column=1, padx=5, pady=5, sticky="e")
+
+# Extra rows kept in the Treeview above and below the visible viewport
+OVERSCAN_ROWS = 50
+
+# Per-Treeview state for the virtual grid: backing DataFrame and materialized window
+virtual_views = {}
+
 # Function to update Treeview with Data
 def update_treeview(tree, dataframe):
     tree.delete(*tree.get_children())
@@ -81,8 +281,83 @@ def update_treeview(tree, dataframe):
     for col in dataframe.columns:
         tree.heading(col, text=col, anchor="w")
         tree.column(col, anchor="w", width=100)
-    for _, row in dataframe.iterrows():
+    if not preferences.get("virtual_grid", True):
+        virtual_views.pop(tree, None)
+        for row in dataframe.itertuples(index=False):
+            tree.insert("", "end", values=list(row))
+        return
+    virtual_views[tree] = {"data": dataframe, "first": 0, "start": 0, "end": 0}
+    render_visible_rows(tree)
+
+# Function to count how many rows fit in the Treeview viewport
+def visible_row_count(tree):
+    row_height = int(style.lookup("Treeview", "rowheight") or 20)
+    return max(int(tree.cget("height")), tree.winfo_height() // max(row_height, 1))
+
+# Function to materialize only the rows around the current scroll position
+def render_visible_rows(tree):
+    view = virtual_views.get(tree)
+    if view is None:
+        return
+    total = len(view["data"])
+    visible = visible_row_count(tree)
+    first = max(0, min(view["first"], total - visible))
+    start = max(0, first - OVERSCAN_ROWS)
+    end = min(total, first + visible + OVERSCAN_ROWS)
+    view.update(first=first, start=start, end=end)
+
+    tree.delete(*tree.get_children())
+    for row in view["data"].iloc[start:end].itertuples(index=False):
         tree.insert("", "end", values=list(row))
+    if end > start:
+        tree.yview_moveto((first - start) / (end - start))
+    update_virtual_scrollbar(tree)
+
+# Function to position a Treeview's scrollbar relative to the whole DataFrame
+def update_virtual_scrollbar(tree):
+    view = virtual_views[tree]
+    scrollbar = virtual_scrollbars.get(tree)
+    total = len(view["data"])
+    if scrollbar is None:
+        return
+    if total == 0:
+        scrollbar.set(0, 1)
+        return
+    visible = visible_row_count(tree)
+    scrollbar.set(view["first"] / total, min(1.0, (view["first"] + visible) / total))
+
+# Function called by the Treeview when it scrolls inside its materialized rows
+def on_tree_yscroll(tree, low, high):
+    view = virtual_views.get(tree)
+    if view is None:
+        scrollbar = virtual_scrollbars.get(tree)
+        if scrollbar is not None:
+            scrollbar.set(low, high)
+        return
+    view["first"] = view["start"] + round(float(low) * (view["end"] - view["start"]))
+    visible = visible_row_count(tree)
+    near_top = view["first"] - view["start"] < OVERSCAN_ROWS // 2 and view["start"] > 0
+    near_bottom = (view["end"] - view["first"] - visible < OVERSCAN_ROWS // 2
+                   and view["end"] < len(view["data"]))
+    if near_top or near_bottom:
+        tree.after_idle(render_visible_rows, tree)
+    else:
+        update_virtual_scrollbar(tree)
+
+# Function to handle scrollbar drags and clicks for a virtual Treeview
+def virtual_yview(tree, *args):
+    view = virtual_views.get(tree)
+    if view is None:
+        tree.yview(*args)
+        return
+    total = len(view["data"])
+    visible = visible_row_count(tree)
+    if args[0] == "moveto":
+        view["first"] = int(float(args[1]) * total)
+    elif args[0] == "scroll":
+        step = int(args[1]) * (visible if args[2] == "pages" else 1)
+        view["first"] += step
+    render_visible_rows(tree)
 
 # Function to display join type info
 def update_join_info(event=None):
@@ -99,38 +374,229 @@ def update_join_info(event=None):
     
     join_type_text.insert(tk.END, join_descriptions.get(selected_join, ""))
 
-# Function to perform join on all columns except 'name' and include 'name' in the result
-def join_data():
-    global result
+# Queue and job counter used to hand join results from the worker thread back to Tk
+join_queue = queue.Queue()
+join_job_id = 0
+join_running = False
+join_types = {}  # Join type, columns, fuzzy threshold and date options of each started job, so the finished result knows how it was made
+
+# As-of direction (or date range) of each Date Match choice; Exact is a plain join
+date_matches = {
+    "Exact": None,
+    "Latest Before": "backward",
+    "Earliest After": "forward",
+    "Nearest": "nearest",
+    "In Range": "range",
+}
+
+# Function to turn the Date Match choice into join_frames date arguments
+def date_join_options():
+    match = date_matches.get(date_match.get())
+    if match is None:
+        return {}
+    if match == "range":
+        return {"date_range": tuple(preferences["date_range_columns"])}
+    return {"asof": match, "tolerance": preferences["asof_tolerance"] or None}
+
+# Function to perform join on all columns except 'name' and include 'name' in the result.
+# With guard=True the worker first predicts the result size and asks before a large join.
+def join_data(guard=True):
+    global join_job_id
     if not data1.empty and not data2.empty:
         join_type_selected = join_type.get().strip().lower()
 
-        data1.columns = data1.columns.str.strip()
-        data2.columns = data2.columns.str.strip()
-
-        join_columns = [col for col in data1.columns if col in data2.columns and col != 'name']
-        join_columns_with_name = ['name'] + join_columns
-
-        if join_type_selected == "cross":
-            data1['_key'] = 1
-            data2['_key'] = 1
-            result = data1.merge(data2, on='_key').drop(columns=['_key'])
-            data1.drop(columns=['_key'], inplace=True)
-            data2.drop(columns=['_key'], inplace=True)
-        else:
-            try:
-                result = data1.merge(data2, on=join_columns_with_name, how=join_type_selected, suffixes=('_1', '_2'))
-            except KeyError as e:
-                messagebox.showerror("Join Error", f"Join operation failed: {e}")
-                return
-            except pd.errors.MergeError as e:
-                messagebox.showerror("Join Error", f"Merge operation failed: {e}")
+        join_job_id += 1
+        columns = list(output_columns) or None
+        fuzzy_threshold = preferences["fuzzy_threshold"] if fuzzy_names.get() else None
+        date_options = date_join_options()
+        join_types[join_job_id] = (join_type_selected, columns, fuzzy_threshold, date_options)
+        worker = threading.Thread(
+            target=join_worker,
+            args=(
+                join_job_id, data1, data2, data2_path, data2_where, join_type_selected, columns, fuzzy_threshold,
+                date_options, guard,
+            ),
+            daemon=True,
+        )
+        set_join_running(True)
+        worker.start()
+        root.after(100, poll_join_queue)
+
+# Key index of Data 2, kept across joins so joining new Data 1 files only pays for the probe
+reference_index = {"frame": None, "index": None}
+
+# Function run on the worker thread to get (or build) the index of the reference table.
+# With a reference_index_dir preference the index is saved there and reopened
+# memory-mapped on later runs, as long as Data 2 is loaded the same way (typed
+# loading and load filter); otherwise it lives in memory until Data 2 changes.
+def reference_index_for(right, right_path, right_where, keys):
+    if reference_index["frame"] is right and reference_index["index"].keys == keys:
+        return reference_index["index"]
+    if preferences["reference_index_dir"] and right_path:
+        digest = hashlib.sha1(os.path.abspath(right_path).encode("utf-8")).hexdigest()
+        directory = os.path.join(preferences["reference_index_dir"], digest)
+        index = ensure_index(directory, keys, right_path, right, preferences["typed_loading"], right_where)
+    else:
+        index = KeyIndex(right, keys)
+    reference_index.update(frame=right, index=index)
+    return index
+
+# Function run on the worker thread; never touches Tk widgets. Cross joins stay
+# lazy whatever their size, the estimate counts exact matches only, and date
+# joins give at most one row per Data 1 row, so only exact joins are guarded.
+def join_worker(job_id, left, right, right_path, right_where, join_type_selected, columns, fuzzy_threshold=None,
+                date_options=None, guard=True):
+    date_options = date_options or {}
+    exact = fuzzy_threshold is None and not date_options
+    options = dict(
+        lazy=True,
+        categorical_keys=preferences["categorical_keys"],
+        check_sorted=preferences["detect_sorted_inputs"],
+        columns=columns,
+        fuzzy_threshold=fuzzy_threshold,
+        **date_options,
+    )
+    try:
+        # A join already in the result cache costs nothing, so it is not estimated
+        cached = result_cache.lookup(left, right, join_type_selected, **options)
+        if cached is not None:
+            join_queue.put((job_id, "done", cached))
+            return
+        if guard and preferences["join_guard"] and join_type_selected != "cross" and exact:
+            estimate = estimate_join(left, right, join_type_selected, columns)
+            if (estimate["rows"] > preferences["join_guard_rows"]
+                    or estimate["bytes"] > preferences["join_guard_mb"] * 1024 ** 2):
+                join_queue.put((job_id, "estimate", estimate))
                 return
+        right_index = None
+        if preferences["index_reference_table"] and join_type_selected in ("inner", "left") and exact:
+            right_index = reference_index_for(right, right_path, right_where, engine.key_columns(left, right))
+        joined = result_cache.join(
+            left, right, join_type_selected,
+            workers=preferences["parallel_join_workers"] if parallel_join_available else 0,
+            right_index=right_index,
+            **options,
+        )
+    except KeyError as e:
+        join_queue.put((job_id, "error", f"Join operation failed: {e}"))
+        return
+    except pd.errors.MergeError as e:
+        join_queue.put((job_id, "error", f"Merge operation failed: {e}"))
+        return
+    except ValueError as e:
+        join_queue.put((job_id, "error", f"Join operation failed: {e}"))
+        return
+    except Exception as e:
+        # Anything else (index files that cannot be written, running out of memory)
+        # must still reach the Tk thread, or the join would look like it never ends
+        join_queue.put((job_id, "error", f"Join operation failed: {type(e).__name__}: {e}"))
+        return
+    join_queue.put((job_id, "done", joined))
+
+# Function to ask what to do with a join predicted to be too large for memory:
+# run it anyway, write it straight to a CSV file, or drop it
+def confirm_large_join(join_type_selected, columns, estimate):
+    sampled = " (estimated from a sample of the keys)" if estimate["sampled"] else ""
+    choice = messagebox.askyesnocancel(
+        "Large Join",
+        f"This {join_type_selected} join is expected to produce about {estimate['rows']:,} rows "
+        f"(~{estimate['bytes'] / 1024 ** 2:,.0f} MB in memory){sampled}.\n\n"
+        "Yes: join in memory anyway.\n"
+        "No: write the result straight to a CSV file instead.\n"
+        "Cancel: don't join.",
+    )
+    if choice:
+        join_data(guard=False)
+    elif choice is False:
+        stream_join_to_csv(join_type_selected, columns)
+
+# Function to join the loaded data straight into a CSV file, a chunk of the larger
+# side at a time, leaving the current result as it is
+def stream_join_to_csv(join_type_selected, columns):
+    global join_job_id
+    file_path = filedialog.asksaveasfilename(defaultextension=".csv", filetypes=[("CSV files", "*.csv")])
+    if not file_path:
+        return
+    join_job_id += 1
+    worker = threading.Thread(
+        target=stream_join_worker,
+        args=(join_job_id, data1, data2, join_type_selected, columns, file_path),
+        daemon=True,
+    )
+    set_join_running(True)
+    worker.start()
+    root.after(100, poll_join_queue)
+
+# Function run on the worker thread for joins written straight to a file
+def stream_join_worker(job_id, left, right, join_type_selected, columns, file_path):
+    try:
+        rows = stream_join_frames(left, right, file_path, join_type_selected, columns=columns)
+    except (KeyError, ValueError, OSError) as e:
+        join_queue.put((job_id, "error", f"Join operation failed: {e}"))
+        return
+    except Exception as e:
+        join_queue.put((job_id, "error", f"Join operation failed: {type(e).__name__}: {e}"))
+        return
+    join_queue.put((job_id, "streamed", (file_path, rows)))
+
+# Function to pick up finished joins on the Tk thread
+def poll_join_queue():
+    global result, result_join_type, result_columns
+    try:
+        job_id, kind, payload = join_queue.get_nowait()
+    except queue.Empty:
+        if join_running:
+            root.after(100, poll_join_queue)
+        return
+
+    if job_id != join_job_id:
+        # Result of a cancelled or superseded join; keep waiting for the current one
+        join_types.pop(job_id, None)
+        root.after(100, poll_join_queue)
+        return
 
-        sort_column['values'] = list(result.columns)
-        sort_column_2['values'] = list(result.columns)
+    set_join_running(False)
+    if kind == "error":
+        join_types.pop(job_id, None)
+        messagebox.showerror("Join Error", payload)
+        return
+    if kind == "estimate":
+        join_type_selected, columns, _, _ = join_types.pop(job_id)
+        confirm_large_join(join_type_selected, columns, payload)
+        return
+    if kind == "streamed":
+        messagebox.showinfo("Join Written", f"{payload[1]:,} rows written to {payload[0]}")
+        return
 
-        display_join_result()
+    result = payload
+    result_join_type, result_columns, fuzzy_threshold, date_options = join_types.pop(job_id, (None, None, None, None))
+    if result_join_type not in INCREMENTAL_JOIN_TYPES or fuzzy_threshold is not None or date_options:
+        result_join_type = None
+    exported_files.clear()
+    sort_column['values'] = list(result.columns)
+    sort_column_2['values'] = list(result.columns)
+
+    display_join_result()
+
+# Function to abandon the running join; its result is discarded when it arrives
+def cancel_join():
+    global join_job_id
+    join_types.pop(join_job_id, None)
+    join_job_id += 1
+    set_join_running(False)
+
+# Function to toggle the progress indicator and join/cancel buttons
+def set_join_running(running):
+    global join_running
+    join_running = running
+    if running:
+        join_button.configure(state="disabled")
+        cancel_join_button.configure(state="normal")
+        join_progress.start(10)
+    else:
+        join_progress.stop()
+        join_button.configure(state="normal")
+        cancel_join_button.configure(state="disabled")
 
 def display_join_result():
     update_treeview(result_tree, result)
@@ -143,7 +609,7 @@ def on_closing():
 
 # Function to sort the join result based on selected columns
 def sort_result():
-    global result
+    global result, result_join_type
     if result.empty:
         messagebox.showwarning("No Data", "No joined data available to sort.")
         return
@@ -151,36 +617,176 @@ def sort_result():
     sort_by = sort_column.get()
     sort_by_2 = sort_column_2.get()
     sort_order = sort_order_choice.get()
-    ascending = True if sort_order == "Ascending" else False
 
-    if sort_order == "Random":
-        result = result.sample(frac=1).reset_index(drop=True)
-    else:
-        if sort_by and sort_by_2 and sort_by != sort_by_2:
-            result.sort_values(by=[sort_by, sort_by_2], ascending=[ascending, ascending], inplace=True)
-        elif sort_by:
-            result.sort_values(by=sort_by, ascending=ascending, inplace=True)
+    if isinstance(result, LazyCrossJoin) and not (
+        sort_order != "Random" and result.can_sort_lazily(engine.sort_columns(sort_by, sort_by_2))
+    ):
+        if not messagebox.askyesno(
+            "Materialize Cross Join",
+            f"Sorting this cross join this way needs all {len(result):,} rows in memory. Continue?",
+        ):
+            return
+
+    try:
+        if isinstance(result, LazyCrossJoin):
+            result = engine.sort_frame(result, sort_by, sort_by_2, sort_order)
+        elif len(result) > preferences["external_sort_rows"]:
+            # Sort through temporary run files instead of one in-memory argsort
+            result = extsort.external_sort_frame(result, sort_by, sort_by_2, sort_order)
+        else:
+            result = engine.sort_frame(result, sort_by, sort_by_2, sort_order)
+    except ValueError as e:
+        messagebox.showerror("Sort Error", f"Sort operation failed: {e}")
+        return
+    # Appending new rows at the end would break the chosen order, so refreshes re-join
+    result_join_type = None
+    exported_files.clear()
 
     display_join_result()  # Refresh the Join Result display after sorting
 
 # Export functions
-def export_to_csv():
+def export_result(fmt, extension, label, compression=None):
     if result.empty:
         messagebox.showwarning("No Data", "No joined data available to export.")
         return
-    file_path = filedialog.asksaveasfilename(defaultextension=".csv", filetypes=[("CSV files", "*.csv")])
+    file_path = filedialog.asksaveasfilename(defaultextension=extension, filetypes=[(label, f"*{extension}")])
     if file_path:
-        result.to_csv(file_path, index=False)
+        try:
+            engine.export_frame(result, file_path, fmt, compression)
+        except (ImportError, ValueError) as e:
+            messagebox.showerror("Export Error", f"Export failed: {e}")
+            return
+        exported_files.append((file_path, fmt))
         messagebox.showinfo("Export Successful", f"Data exported to {file_path}")
 
-def export_to_json():
+# Queue and cancel flag of the background CSV export; the frame being exported is
+# kept so a finished export is only tracked for refreshes if it is still the result
+export_queue = queue.Queue()
+export_job = {"cancel": None, "frame": None}
+
+# CSV exports run on a worker thread that formats chunks on all cores, with progress
+def export_to_csv():
     if result.empty:
         messagebox.showwarning("No Data", "No joined data available to export.")
         return
-    file_path = filedialog.asksaveasfilename(defaultextension=".json", filetypes=[("JSON files", "*.json")])
+    if export_job["cancel"] is not None:
+        messagebox.showwarning("Export Running", "Wait for the running export to finish or cancel it.")
+        return
+    file_path = filedialog.asksaveasfilename(defaultextension=".csv", filetypes=[("CSV files", "*.csv")])
     if file_path:
-        result.to_json(file_path, orient="records")
-        messagebox.showinfo("Export Successful", f"Data exported to {file_path}")
+        export_job.update(cancel=threading.Event(), frame=result)
+        worker = threading.Thread(target=export_csv_worker, args=(result, file_path, export_job["cancel"]), daemon=True)
+        set_export_running(True)
+        worker.start()
+        root.after(100, poll_export_queue)
+
+# Function run on the export thread; never touches Tk widgets. Forking from
+# this thread is opt-in: export_workers above 1 formats on that many processes
+# where writers.fork_context allows it, anything else formats here.
+def export_csv_worker(frame, file_path, cancel):
+    workers = preferences["export_workers"]
+    try:
+        rows = writers.write_csv(
+            frame, file_path, workers=workers if workers > 1 else 1, mp_context=writers.fork_context(),
+            progress=lambda done, total: export_queue.put(("progress", done, total)),
+            cancel=cancel,
+        )
+    except (OSError, ValueError) as e:
+        export_queue.put(("error", file_path, str(e)))
+        return
+    except Exception as e:
+        export_queue.put(("error", file_path, f"{type(e).__name__}: {e}"))
+        return
+    export_queue.put(("done", file_path, rows))
+
+# Function to show export progress and report the finished export on the Tk thread
+def poll_export_queue():
+    try:
+        while True:
+            kind, first, second = export_queue.get_nowait()
+            if kind != "progress":
+                break
+            export_progress["value"] = 100 * first / max(second, 1)
+    except queue.Empty:
+        root.after(100, poll_export_queue)
+        return
+
+    frame = export_job["frame"]
+    export_job.update(cancel=None, frame=None)
+    set_export_running(False)
+    if kind == "error":
+        messagebox.showerror("Export Error", f"Export failed: {second}")
+    elif second is not None:
+        if frame is result:
+            exported_files.append((first, "csv"))
+        messagebox.showinfo("Export Successful", f"Data exported to {first}")
+
+# Function to stop the running CSV export; the partial file is removed
+def cancel_export():
+    if export_job["cancel"] is not None:
+        export_job["cancel"].set()
+
+# Function to toggle the export progress bar and cancel button
+def set_export_running(running):
+    export_progress["value"] = 0
+    export_csv_button.configure(state="disabled" if running else "normal")
+    cancel_export_button.configure(state="normal" if running else "disabled")
+
+def export_to_json():
+    export_result("json", ".json", "JSON files")
+
+# JSON Lines exports are compressed by extension, so the suggested name carries the codec
+def export_to_jsonl():
+    extension = {"gzip": ".jsonl.gz", "zstd": ".jsonl.zst"}.get(preferences["jsonl_compression"], ".jsonl")
+    export_result("jsonl", extension, "JSON Lines files")
+
+def export_to_parquet():
+    export_result("parquet", ".parquet", "Parquet files", preferences["parquet_compression"])
+
+def export_to_arrow():
+    export_result("feather", ".arrow", "Arrow IPC files", preferences["arrow_compression"])
+
+# Optional timing of each user action and the stages inside it. Buttons, threads and
+# callers look these functions up by name, so rebinding them here instruments every call.
+profiler = Profiler()
+if preferences["profiling"]:
+    load_data1 = profiler.wrap(load_data1, operation=True)
+    load_data2 = profiler.wrap(load_data2, operation=True)
+    refresh_data1 = profiler.wrap(refresh_data1, operation=True)
+    join_data = profiler.wrap(join_data, operation=True)
+    sort_result = profiler.wrap(sort_result, operation=True)
+    export_result = profiler.wrap(export_result, operation=True)
+    export_to_csv = profiler.wrap(export_to_csv, operation=True)
+    load_file = profiler.wrap(load_file)
+    join_worker = profiler.wrap(join_worker)
+    update_treeview = profiler.wrap(update_treeview)
+    export_csv_worker = profiler.wrap(export_csv_worker)
+
+# Function to show the last operation's breakdown; stages finish on worker threads,
+# so the status bar is refreshed on a timer rather than by them
+def update_status_bar():
+    status_bar.configure(text=profiler.summary())
+    root.after(500, update_status_bar)
+
+# Function to start a cProfile/tracemalloc capture, or stop it and save it: the
+# statistics to the chosen .prof file and the allocations next to it as .tracemalloc
+def toggle_profile_capture():
+    if not profiler.capturing:
+        profiler.start_capture()
+        profile_button.configure(text="Save Profile")
+        return
+    file_path = filedialog.asksaveasfilename(defaultextension=".prof", filetypes=[("Profile files", "*.prof")])
+    if not file_path:
+        return
+    snapshot_path = os.path.splitext(file_path)[0] + ".tracemalloc"
+    try:
+        profiler.dump_capture(file_path, snapshot_path)
+    except OSError as e:
+        messagebox.showerror("Profile Error", f"Could not save the profile: {e}")
+        return
+    finally:
+        profile_button.configure(text="Start Profile")
+    messagebox.showinfo("Profile Saved", f"Profile saved to {file_path} and {snapshot_path}")
 
 # Create menu labels
 menu_labels = [
@@ -188,6 +794,7 @@ menu_labels = [
     tk.Label(root, text="Sort By"),
     tk.Label(root, text="Then By"),
     tk.Label(root, text="Order"),
+    tk.Label(root, text="Load Filter"),
 ]
 
 # Load Data buttons
@@ -197,6 +804,17 @@ load_data1_button.grid(row=0, column=0, padx=5, pady=5, sticky="w")
 load_data2_button = tk.Button(root, text="Load Data 2", command=load_data2)
 load_data2_button.grid(row=0, column=1, padx=5, pady=5, sticky="w")
 
+refresh_data1_button = tk.Button(root, text="Refresh Data 1", command=refresh_data1)
+refresh_data1_button.grid(row=0, column=2, padx=5, pady=5, sticky="w")
+
+pick_columns_button = tk.Button(root, text="Pick Columns", command=pick_columns)
+pick_columns_button.grid(row=0, column=3, padx=5, pady=5, sticky="w")
+
+# Filter applied while files are read, e.g. status == "Late" and name != "Bob"
+menu_labels[4].grid(row=0, column=4, sticky="e")
+load_filter = tk.Entry(root, width=40)
+load_filter.grid(row=0, column=5, columnspan=2, padx=5, pady=5, sticky="we")
+
 # Join type dropdown and label
 menu_labels[0].grid(row=1, column=0, sticky="w")
 join_type = ttk.Combobox(root, values=["Inner", "Left", "Right", "Outer", "Cross"])
@@ -204,10 +822,26 @@ join_type.set("Inner")
 join_type.bind("<<ComboboxSelected>>", update_join_info)
 join_type.grid(row=1, column=1, sticky="w")
 
+# Match names that are only similar (case, spacing, initials, typos) instead of equal
+fuzzy_names = tk.BooleanVar(value=False)
+fuzzy_names_check = tk.Checkbutton(root, text="Fuzzy Names", variable=fuzzy_names)
+
+# Match each Data 1 date to the nearest Data 2 date (or date range) per name instead of an equal one
+date_match_label = tk.Label(root, text="Date Match")
+date_match = ttk.Combobox(root, values=list(date_matches), state="readonly", width=14)
+date_match.set("Exact")
+
 # Join button
 join_button = tk.Button(root, text="Join Data", command=join_data)
 join_button.grid(row=1, column=2, padx=5, pady=5, sticky="w")
 
+# Progress indicator and cancel button for joins running in the background
+join_progress = ttk.Progressbar(root, mode="indeterminate", length=120)
+join_progress.grid(row=1, column=5, padx=5, pady=5, sticky="w")
+
+cancel_join_button = tk.Button(root, text="Cancel Join", command=cancel_join, state="disabled")
+cancel_join_button.grid(row=1, column=6, padx=5, pady=5, sticky="w")
+
 # Font size adjustment buttons
 increase_font_button = tk.Button(root, text="Increase Font Size", command=lambda: set_font_size(preferences["font_size"] + 1))
 increase_font_button.grid(row=1, column=3, padx=5, pady=5)
@@ -232,8 +866,8 @@ data1_file_label.pack(anchor="w", padx=5)
 data1_tree = ttk.Treeview(data1_frame, show='headings', style="Treeview", height=10)
 data1_tree.pack(fill="both", expand=True)
 
-data1_scrollbar = ttk.Scrollbar(data1_frame, orient="vertical", command=data1_tree.yview)
-data1_tree.configure(yscrollcommand=data1_scrollbar.set)
+data1_scrollbar = ttk.Scrollbar(data1_frame, orient="vertical", command=lambda *args: virtual_yview(data1_tree, *args))
+data1_tree.configure(yscrollcommand=lambda low, high: on_tree_yscroll(data1_tree, low, high))
 data1_scrollbar.pack(side="right", fill="y")
 
 # Data 2 section with Treeview, Scrollbar, and filename label
@@ -244,18 +878,36 @@ data2_file_label.pack(anchor="w", padx=5)
 data2_tree = ttk.Treeview(data2_frame, show='headings', style="Treeview", height=10)
 data2_tree.pack(fill="both", expand=True)
 
-data2_scrollbar = ttk.Scrollbar(data2_frame, orient="vertical", command=data2_tree.yview)
-data2_tree.configure(yscrollcommand=data2_scrollbar.set)
+data2_scrollbar = ttk.Scrollbar(data2_frame, orient="vertical", command=lambda *args: virtual_yview(data2_tree, *args))
+data2_tree.configure(yscrollcommand=lambda low, high: on_tree_yscroll(data2_tree, low, high))
 data2_scrollbar.pack(side="right", fill="y")
 
 # Join Result label
 join_result_label = tk.Label(root, text="Join Result")
-join_result_label.grid(row=5, column=0, columnspan=7, sticky="w")
+join_result_label.grid(row=5, column=0, columnspan=4, sticky="w")
+date_match_label.grid(row=5, column=4, sticky="e")
+date_match.grid(row=5, column=5, sticky="w")
+fuzzy_names_check.grid(row=5, column=6, sticky="w")
 
 # Join Result display with Treeview
 result_tree = ttk.Treeview(root, show='headings', style="Treeview")
 result_tree.grid(row=6, column=0, columnspan=7, padx=5, pady=5, sticky="nsew")
 
+result_scrollbar = ttk.Scrollbar(root, orient="vertical", command=lambda *args: virtual_yview(result_tree, *args))
+result_tree.configure(yscrollcommand=lambda low, high: on_tree_yscroll(result_tree, low, high))
+result_scrollbar.grid(row=6, column=7, pady=5, sticky="ns")
+
+# Scrollbars driven by the virtual grid, keyed by the Treeview they control
+virtual_scrollbars = {
+    data1_tree: data1_scrollbar,
+    data2_tree: data2_scrollbar,
+    result_tree: result_scrollbar,
+}
+
+# Re-page the visible rows when a Treeview is resized
+for virtual_tree in virtual_scrollbars:
+    virtual_tree.bind("<Configure>", lambda event: render_visible_rows(event.widget))
+
 # Sort options
 menu_labels[1].grid(row=7, column=0, sticky="w")
 sort_column = ttk.Combobox(root, values=[], state="readonly")
@@ -281,6 +933,31 @@ export_csv_button.grid(row=8, column=0, padx=5, pady=5, sticky="w")
 export_json_button = tk.Button(root, text="Export to JSON", command=export_to_json)
 export_json_button.grid(row=8, column=1, padx=5, pady=5, sticky="w")
 
+export_jsonl_button = tk.Button(root, text="Export to JSON Lines", command=export_to_jsonl)
+export_jsonl_button.grid(row=8, column=2, padx=5, pady=5, sticky="w")
+
+export_parquet_button = tk.Button(root, text="Export to Parquet", command=export_to_parquet)
+export_parquet_button.grid(row=8, column=3, padx=5, pady=5, sticky="w")
+
+export_arrow_button = tk.Button(root, text="Export to Arrow", command=export_to_arrow)
+export_arrow_button.grid(row=8, column=4, padx=5, pady=5, sticky="w")
+
+# Progress and cancel button for CSV exports running in the background
+export_progress = ttk.Progressbar(root, mode="determinate", length=120, maximum=100)
+export_progress.grid(row=8, column=5, padx=5, pady=5, sticky="w")
+
+cancel_export_button = tk.Button(root, text="Cancel Export", command=cancel_export, state="disabled")
+cancel_export_button.grid(row=8, column=6, padx=5, pady=5, sticky="w")
+
+# Status bar with the last operation's timings, and the profile capture button,
+# shown when the profiling preference is on
+status_bar = tk.Label(root, text="", anchor="w", relief="sunken")
+profile_button = tk.Button(root, text="Start Profile", command=toggle_profile_capture)
+if preferences["profiling"]:
+    status_bar.grid(row=9, column=0, columnspan=6, padx=5, pady=5, sticky="ew")
+    profile_button.grid(row=9, column=6, padx=5, pady=5, sticky="w")
+    update_status_bar()
+
 # Set initial font size from preferences
 set_font_size(preferences["font_size"])
 
@@ -0,0 +1,87 @@
+import numpy as np
+import pandas as pd
+
+# Join kinds that merge on keys, as opposed to cross joins
+KEYED_JOIN_TYPES = ["inner", "left", "right", "outer"]
+
+# Cases without missing keys, for paths that sort on the keys or never match a
+# missing one
+WITHOUT_MISSING_KEYS = ["attendance", "duplicates", "empty_left", "empty_right", "int_float"]
+
+
+# Function to build small left/right pairs covering the edge cases every join
+# path must agree with DataFrame.merge on: duplicate keys, missing keys, int vs
+# float keys and empty sides. Returns {case name: (left, right)}.
+def join_cases():
+    left = pd.DataFrame({
+        "name": ["Alice", "Bob", "Carol", "Alice", "Dan"],
+        "date": ["20/10/2024", "20/10/2024", "21/10/2024", "21/10/2024", "22/10/2024"],
+        "hours": [8, 6, 7, 5, 4],
+    })
+    right = pd.DataFrame({
+        "name": ["Alice", "Bob", "Eve", "Alice"],
+        "date": ["20/10/2024", "20/10/2024", "20/10/2024", "21/10/2024"],
+        "status": ["Present", "Late", "Absent", "Present"],
+    })
+    duplicates_left = pd.DataFrame({"name": ["Alice", "Alice", "Bob", "Bob", "Bob"], "hours": [1, 2, 3, 4, 5]})
+    duplicates_right = pd.DataFrame({"name": ["Alice", "Alice", "Alice", "Bob", "Cid"], "status": list("pqrst")})
+    missing_left = pd.DataFrame({"name": ["Alice", None, "Bob", None], "hours": [1, 2, 3, 4]})
+    missing_right = pd.DataFrame({"name": [None, "Bob", "Alice", "Zed"], "status": ["x", "y", "z", "w"]})
+    int_left = pd.DataFrame({"name": ["Alice", "Bob", "Carol"], "shift": np.array([1, 2, 3], dtype="int64"), "hours": [8, 6, 7]})
+    float_right = pd.DataFrame({"name": ["Alice", "Bob", "Carol"], "shift": [1.0, 2.5, 3.0], "status": ["a", "b", "c"]})
+    return {
+        "attendance": (left, right),
+        "duplicates": (duplicates_left, duplicates_right),
+        "missing": (missing_left, missing_right),
+        "int_float": (int_left, float_right),
+        "empty_left": (left.iloc[:0], right),
+        "empty_right": (left, right.iloc[:0]),
+    }
+
+
+# Function to compute the join every engine path is compared against
+def reference_join(left, right, how):
+    if how == "cross":
+        return left.merge(right, how="cross")
+    keys = ["name"] + [col for col in left.columns if col in right.columns and col != "name"]
+    return left.merge(right, on=keys, how=how, suffixes=("_1", "_2"))
+
+
+# Function to compare two frames as bags of rows: same columns, same rows with
+# the same multiplicity, in any order. Values are compared as text so paths that
+# round-trip through files (int 1 vs "1", NaN vs "") do not fail on dtype alone.
+def assert_same_rows(actual, expected):
+    assert list(actual.columns) == list(expected.columns)
+    assert _row_counts(actual) == _row_counts(expected)
+
+
+# Function to count each row of a frame, with every value rendered as text
+def _row_counts(frame):
+    counts = {}
+    for row in frame.astype(object).itertuples(index=False, name=None):
+        row = tuple("" if _missing(value) else _text(value) for value in row)
+        counts[row] = counts.get(row, 0) + 1
+    return counts
+
+
+def _missing(value):
+    return value is None or (not isinstance(value, str) and pd.isna(value))
+
+
+# Function to render a value so 1, 1.0 and "1" compare equal
+def _text(value):
+    if isinstance(value, (float, np.floating)) and float(value).is_integer():
+        return str(int(value))
+    return str(value)
+
+
+# Function to write a case's frames to left.csv and right.csv under directory.
+# Returns their paths and the frames as read back, which is what file-based
+# join paths should be compared against.
+def write_case(directory, left, right):
+    paths = []
+    for name, frame in (("left", left), ("right", right)):
+        path = str(directory / f"{name}.csv")
+        frame.to_csv(path, index=False)
+        paths.append(path)
+    return paths[0], paths[1], pd.read_csv(paths[0]), pd.read_csv(paths[1])
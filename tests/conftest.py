@@ -0,0 +1,35 @@
+import pytest
+
+from cases import KEYED_JOIN_TYPES, join_cases
+
+CASES = join_cases()
+
+
+def pytest_configure(config):
+    # The int_float case merges int keys with non-integral floats on purpose
+    config.addinivalue_line("filterwarnings", "ignore:You are merging on int and float")
+
+
+# Every join case by name, for tests that pick one
+@pytest.fixture
+def cases():
+    return CASES
+
+
+# Name of the join case under test: every case unless a test parametrizes
+# "case" itself with the ones it covers
+@pytest.fixture(params=sorted(CASES))
+def case(request):
+    return request.param
+
+
+# The (left, right) frames of the join case under test
+@pytest.fixture
+def frames(case):
+    return CASES[case]
+
+
+# Join type under test: every keyed join unless a test parametrizes "how" itself
+@pytest.fixture(params=KEYED_JOIN_TYPES)
+def how(request):
+    return request.param
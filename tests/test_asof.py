@@ -0,0 +1,115 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from joinapp import asof, engine
+
+LEFT = pd.DataFrame({
+    "name": ["Alice", "Alice", "Bob", "Bob", "Carol", "Alice", None],
+    "date": ["03/10/2024", "10/10/2024", "01/10/2024", "20/10/2024", "05/10/2024", None, "05/10/2024"],
+    "hours": [1, 2, 3, 4, 5, 6, 7],
+})
+RIGHT = pd.DataFrame({
+    "name": ["Alice", "Alice", "Alice", "Bob", "Bob", "Dan", "Alice"],
+    "date": ["01/10/2024", "05/10/2024", "05/10/2024", "18/10/2024", "25/10/2024", "05/10/2024", None],
+    "status": ["a", "b", "c", "d", "e", "f", "g"],
+})
+RANGES = pd.DataFrame({
+    "name": ["Alice", "Alice", "Bob", "Carol"],
+    "start": ["01/10/2024", "08/10/2024", "15/10/2024", "06/10/2024"],
+    "end": ["04/10/2024", "12/10/2024", "19/10/2024", "30/10/2024"],
+    "shift": ["early", "late", "night", "day"],
+})
+
+
+# Function to pick, for each left row, the right row a date join should match
+# by checking every right row: the same name, then the date rule. Ties between
+# equal right dates go to the last row backward and the first row forward, as
+# merge_asof breaks them; nearest prefers the backward match at equal distance.
+def brute_force(left, right, how, choose):
+    rows = []
+    left_dates = pd.to_datetime(left["date"], format="%d/%m/%Y")
+    for position in range(len(left)):
+        candidates = [
+            row for row in range(len(right))
+            if left["name"].iat[position] is not None and right["name"].iat[row] == left["name"].iat[position]
+        ]
+        match = choose(left_dates.iat[position], candidates) if pd.notna(left_dates.iat[position]) else None
+        if match is None and how == "inner":
+            continue
+        rows.append((position, match))
+    right_part = right.drop(columns=["name"]).rename(columns={"date": "date_2"})
+    left_rows = left.iloc[[position for position, _ in rows]].reset_index(drop=True)
+    right_rows = right_part.reindex([-1 if match is None else match for _, match in rows]).reset_index(drop=True)
+    return pd.concat([left_rows, right_rows], axis=1)
+
+
+# Function to return a chooser of the as-of match among candidate right rows
+def asof_chooser(right, direction, tolerance=None):
+    dates = pd.to_datetime(right["date"], format="%d/%m/%Y")
+
+    def choose(date, candidates):
+        candidates = [row for row in candidates if pd.notna(dates.iat[row])]
+        before = [row for row in candidates if dates.iat[row] <= date]
+        after = [row for row in candidates if dates.iat[row] >= date]
+        backward = max(before, key=lambda row: (dates.iat[row], row)) if before else None
+        forward = min(after, key=lambda row: (dates.iat[row], row)) if after else None
+        if direction == "backward":
+            match = backward
+        elif direction == "forward":
+            match = forward
+        elif backward is None or forward is None:
+            match = forward if backward is None else backward
+        else:
+            match = backward if date - dates.iat[backward] <= dates.iat[forward] - date else forward
+        if match is not None and tolerance is not None and abs(dates.iat[match] - date) > pd.Timedelta(tolerance):
+            return None
+        return match
+    return choose
+
+
+@pytest.mark.parametrize("direction", asof.ASOF_DIRECTIONS)
+@pytest.mark.parametrize("how", ["inner", "left"])
+@pytest.mark.parametrize("tolerance", [None, "3D"])
+def test_asof_join_matches_brute_force(direction, how, tolerance):
+    result = asof.asof_join(LEFT, RIGHT, how=how, direction=direction, tolerance=tolerance)
+    expected = brute_force(LEFT, RIGHT, how, asof_chooser(RIGHT, direction, tolerance))
+    pd.testing.assert_frame_equal(result, expected, check_dtype=False)
+
+
+@pytest.mark.parametrize("how", ["inner", "left"])
+def test_interval_join_matches_brute_force(how):
+    starts = pd.to_datetime(RANGES["start"], format="%d/%m/%Y")
+    ends = pd.to_datetime(RANGES["end"], format="%d/%m/%Y")
+
+    def choose(date, candidates):
+        holding = [row for row in candidates if starts.iat[row] <= date <= ends.iat[row]]
+        return holding[0] if holding else None
+
+    result = asof.interval_join(LEFT, RANGES, "start", "end", how=how)
+    expected = brute_force(LEFT, RANGES.rename(columns={"start": "date"}), how, choose)
+    expected = expected.rename(columns={"date_2": "start"})[list(result.columns)]
+    pd.testing.assert_frame_equal(result, expected, check_dtype=False)
+
+
+def test_left_rows_keep_their_order():
+    result = asof.asof_join(LEFT, RIGHT, how="left")
+    assert result["hours"].tolist() == LEFT["hours"].tolist()
+
+
+def test_right_and_outer_joins_are_rejected():
+    with pytest.raises(ValueError):
+        asof.asof_join(LEFT, RIGHT, how="outer")
+
+
+def test_day_first_dates_parse():
+    dates = asof.as_dates(pd.Series(["03/10/2024", "13/10/2024", None]))
+    assert dates.tolist()[:2] == [pd.Timestamp(2024, 10, 3), pd.Timestamp(2024, 10, 13)]
+    assert np.isnat(dates.to_numpy()[2])
+
+
+def test_join_frames_routes_date_joins():
+    pd.testing.assert_frame_equal(
+        engine.join_frames(LEFT, RANGES, "left", date_range=("start", "end")),
+        asof.interval_join(LEFT, RANGES, "start", "end", how="left"),
+    )
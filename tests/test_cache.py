@@ -0,0 +1,40 @@
+import pandas as pd
+import pytest
+
+from joinapp import engine
+from joinapp.cache import FrameCache
+
+pytest.importorskip("pyarrow")
+
+
+@pytest.fixture
+def csv_path(tmp_path, cases):
+    left, _ = cases["duplicates"]
+    path = tmp_path / "data1.csv"
+    left.to_csv(path, index=False)
+    return str(path)
+
+
+def test_cached_load_matches_a_fresh_parse(tmp_path, csv_path):
+    cache = FrameCache(str(tmp_path / "cache"))
+    first = engine.load_frame(csv_path, cache)
+    assert cache.get(csv_path) is not None
+    pd.testing.assert_frame_equal(engine.load_frame(csv_path, cache), first, check_dtype=False)
+
+
+def test_categorized_load_does_not_leak_into_plain_loads(tmp_path, csv_path):
+    cache = FrameCache(str(tmp_path / "cache"))
+    categorized = engine.load_frame(csv_path, cache, categorize=True)
+    assert isinstance(categorized["name"].dtype, pd.CategoricalDtype)
+    plain = engine.load_frame(csv_path, cache)
+    assert not any(isinstance(dtype, pd.CategoricalDtype) for dtype in plain.dtypes)
+    assert isinstance(engine.load_frame(csv_path, cache, categorize=True)["name"].dtype, pd.CategoricalDtype)
+
+
+def test_changed_file_misses(tmp_path, csv_path):
+    cache = FrameCache(str(tmp_path / "cache"))
+    engine.load_frame(csv_path, cache)
+    with open(csv_path, "a") as file:
+        file.write("Zed,9\n")
+    assert cache.get(csv_path) is None
+    assert len(engine.load_frame(csv_path, cache)) == 6
@@ -0,0 +1,38 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from cases import reference_join, write_case
+from joinapp import cli, engine
+from joinapp.cardinality import estimate_join
+
+
+@pytest.mark.parametrize("case", ["attendance", "duplicates", "empty_left", "empty_right"])
+@pytest.mark.parametrize("how", engine.JOIN_TYPES)
+def test_unsampled_estimate_is_exact(frames, how):
+    left, right = frames
+    estimate = estimate_join(left, right, how)
+    assert estimate["rows"] == len(reference_join(left, right, how))
+    assert not estimate["sampled"]
+
+
+@pytest.mark.parametrize("how", ["inner", "left", "outer"])
+def test_sampled_estimate_is_close(how):
+    rng = np.random.default_rng(0)
+    left = pd.DataFrame({"name": rng.integers(0, 2000, 20_000).astype(str), "hours": 1})
+    right = pd.DataFrame({"name": rng.integers(1000, 3000, 20_000).astype(str), "status": "x"})
+    estimate = estimate_join(left, right, how, sample_rows=5_000)
+    assert estimate["sampled"]
+    assert estimate["rows"] == pytest.approx(len(reference_join(left, right, how)), rel=0.25)
+
+
+@pytest.mark.parametrize("how", ["inner", "cross"])
+def test_cli_refuses_joins_over_max_rows(tmp_path, how, capsys, cases):
+    left_path, right_path, left, right = write_case(tmp_path, *cases["duplicates"])
+    out_path = str(tmp_path / "out.csv")
+    with pytest.raises(SystemExit):
+        cli.main(["join", left_path, right_path, "--how", how, "--out", out_path, "--max-rows", "3"])
+    assert "--max-rows" in capsys.readouterr().err
+    limit = str(len(reference_join(left, right, how)))
+    cli.main(["join", left_path, right_path, "--how", how, "--out", out_path, "--max-rows", limit])
+    assert len(pd.read_csv(out_path)) == int(limit)
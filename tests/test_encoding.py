@@ -0,0 +1,35 @@
+import pandas as pd
+import pytest
+
+from cases import reference_join
+from joinapp import engine
+from joinapp.encoding import categorize_columns
+
+
+# Function to store the text columns of a frame as categoricals, as a categorized load would
+def categorical(frame):
+    return frame.astype({col: "category" for col in frame.columns if frame[col].dtype != "int64" and col != "shift"})
+
+
+@pytest.mark.parametrize("sides", ["left", "both"])
+def test_categorical_key_join_matches_merge(frames, how, sides):
+    left, right = frames
+    encoded_left = categorical(left)
+    encoded_right = categorical(right) if sides == "both" else right
+    result = engine.join_frames(encoded_left, encoded_right, how, categorical_keys=True)
+    # Same rows in merge's order; keys keep each side's own dtype rather than merge's
+    expected = reference_join(encoded_left, encoded_right, how)
+    pd.testing.assert_frame_equal(result, expected, check_dtype=False, check_categorical=False)
+
+
+def test_plain_text_keys_keep_their_dtype(cases):
+    left, right = cases["attendance"]
+    result = engine.join_frames(left, right, "inner", categorical_keys=True)
+    pd.testing.assert_series_equal(result.dtypes, engine.join_frames(left, right, "inner").dtypes)
+
+
+def test_categorize_columns_leaves_unique_text_alone():
+    frame = pd.DataFrame({"name": ["a", "b", "c", "d"], "status": ["x", "x", "x", "y"]})
+    categorized = categorize_columns(frame.copy())
+    assert not isinstance(categorized["name"].dtype, pd.CategoricalDtype)
+    assert isinstance(categorized["status"].dtype, pd.CategoricalDtype)
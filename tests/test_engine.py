@@ -0,0 +1,64 @@
+import pandas as pd
+import pytest
+
+from cases import assert_same_rows, reference_join
+from joinapp import engine
+
+
+@pytest.mark.parametrize("how", engine.JOIN_TYPES)
+def test_join_frames_matches_merge(frames, how):
+    left, right = frames
+    result = engine.join_frames(left, right, how)
+    pd.testing.assert_frame_equal(result, reference_join(left, right, how))
+
+
+def test_key_columns_are_name_then_shared_columns(cases):
+    left, right = cases["attendance"]
+    assert engine.key_columns(left, right) == ["name", "date"]
+
+
+def test_unknown_join_type_is_rejected(cases):
+    left, right = cases["attendance"]
+    with pytest.raises(ValueError):
+        engine.join_frames(left, right, "sideways")
+
+
+@pytest.mark.parametrize("order", ["Ascending", "Descending"])
+def test_sort_frame_matches_sort_values(order, cases):
+    left, right = cases["attendance"]
+    joined = engine.join_frames(left, right, "outer")
+    result = engine.sort_frame(joined, "name", "hours", order)
+    expected = joined.sort_values(["name", "hours"], ascending=order == "Ascending")
+    pd.testing.assert_frame_equal(result.reset_index(drop=True), expected.reset_index(drop=True))
+
+
+def test_random_order_keeps_every_row(cases):
+    left, right = cases["duplicates"]
+    joined = engine.join_frames(left, right, "inner")
+    assert_same_rows(engine.sort_frame(joined, order="Random"), joined)
+
+
+@pytest.mark.parametrize("extension", [".csv", ".json"])
+def test_exported_join_reads_back(tmp_path, extension, how, cases):
+    left, right = cases["missing"]
+    joined = engine.join_frames(left, right, how)
+    path = str(tmp_path / ("result" + extension))
+    engine.export_frame(joined, path)
+    assert_same_rows(engine.load_frame(path), joined)
+
+
+def test_load_frame_strips_header_whitespace(tmp_path):
+    path = tmp_path / "padded.csv"
+    path.write_text(" name ,date\nAlice,20/10/2024\n")
+    assert list(engine.load_frame(str(path)).columns) == ["name", "date"]
+
+
+@pytest.mark.parametrize("how", engine.JOIN_TYPES)
+def test_joins_leave_their_inputs_untouched(how, cases):
+    left, right = cases["attendance"]
+    left_before, right_before = left.copy(), right.copy()
+    result = engine.join_frames(left, right, how, lazy=True)
+    if how == "cross":
+        result.to_frame()
+    pd.testing.assert_frame_equal(left, left_before)
+    pd.testing.assert_frame_equal(right, right_before)
@@ -0,0 +1,65 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from cases import assert_same_rows
+from joinapp import extsort
+
+
+# Function to build a frame with many ties and some missing values in both sort columns
+def tied_frame(rows=120, seed=0):
+    rng = np.random.default_rng(seed)
+    names = np.array(["Alice", "Bob", "Carol", "Dan", None], dtype=object)
+    return pd.DataFrame({
+        "name": names[rng.integers(0, len(names), rows)],
+        "hours": np.where(rng.random(rows) < 0.1, np.nan, rng.integers(0, 5, rows)),
+        "row": np.arange(rows),
+    })
+
+
+@pytest.mark.parametrize("then_by", [None, "hours"])
+@pytest.mark.parametrize("order", ["Ascending", "Descending"])
+@pytest.mark.parametrize("run_rows", [2, 7, 64, 1000])
+def test_external_sort_matches_stable_sort_values(order, then_by, run_rows):
+    frame = tied_frame()
+    chunks = (frame.iloc[start:start + run_rows] for start in range(0, len(frame), run_rows))
+    blocks = list(extsort.external_sort(chunks, "name", then_by, order, block_rows=3))
+    columns = ["name"] + ([then_by] if then_by else [])
+    expected = frame.sort_values(columns, ascending=order == "Ascending", kind="mergesort")
+    pd.testing.assert_frame_equal(pd.concat(blocks), expected)
+
+
+def test_external_sort_of_nothing_is_empty():
+    assert list(extsort.external_sort(iter([]), "name")) == []
+
+
+def test_random_order_keeps_every_row():
+    frame = tied_frame(50)
+    shuffled = extsort.external_sort_frame(frame, order="Random", run_rows=9)
+    assert_same_rows(shuffled, frame)
+
+
+def test_sort_csv_matches_sort_values(tmp_path):
+    frame = tied_frame(120)
+    in_path, out_path = str(tmp_path / "in.csv"), str(tmp_path / "out.csv")
+    frame.to_csv(in_path, index=False)
+    assert extsort.sort_csv(in_path, out_path, "name", "hours", "Descending", run_rows=11) == len(frame)
+    expected = pd.read_csv(in_path).sort_values(["name", "hours"], ascending=False, kind="mergesort")
+    pd.testing.assert_frame_equal(pd.read_csv(out_path), expected.reset_index(drop=True))
+
+
+def test_equal_keys_do_not_pile_up():
+    # Ten runs of one key repeated throughout; each merged block stays near one block per run
+    frame = pd.DataFrame({"status": np.tile(["Absent", "Late", "Present"], 2000), "row": np.arange(6000)})
+    chunks = (frame.iloc[start:start + 600] for start in range(0, len(frame), 600))
+    blocks = list(extsort.external_sort(chunks, "status", block_rows=10))
+    assert max(len(block) for block in blocks) <= 2 * 10 * 10
+    pd.testing.assert_frame_equal(pd.concat(blocks), frame.sort_values("status", kind="mergesort"))
+
+
+@pytest.mark.parametrize("order", ["Ascending", "Descending"])
+def test_external_sort_frame_matches_sort_values(order):
+    frame = tied_frame()
+    result = extsort.external_sort_frame(frame, "name", "hours", order, run_rows=13)
+    expected = frame.sort_values(["name", "hours"], ascending=order == "Ascending", kind="mergesort")
+    pd.testing.assert_frame_equal(result, expected)
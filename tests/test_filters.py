@@ -0,0 +1,22 @@
+import pandas as pd
+import pytest
+
+from cases import reference_join, write_case
+from joinapp import engine
+from joinapp.filters import filter_frame
+
+
+@pytest.mark.parametrize("case", ["attendance", "duplicates", "missing"])
+@pytest.mark.parametrize("how", ["inner", "left", "outer"])
+def test_filtered_load_matches_filtered_frame(tmp_path, frames, how):
+    left_path, right_path, left, right = write_case(tmp_path, *frames)
+    where = 'name != "Bob"'
+    result = engine.join_frames(engine.load_frame(left_path, where=where), engine.load_frame(right_path), how)
+    expected = reference_join(filter_frame(left, where), right, how)
+    pd.testing.assert_frame_equal(result, expected, check_dtype=False)
+
+
+def test_bad_expression_is_rejected(cases):
+    left, _ = cases["attendance"]
+    with pytest.raises(ValueError):
+        filter_frame(left, "hours +")
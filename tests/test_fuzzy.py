@@ -0,0 +1,56 @@
+import pandas as pd
+import pytest
+
+from cases import WITHOUT_MISSING_KEYS, assert_same_rows, reference_join
+from joinapp import engine, fuzzy
+
+
+# merge() pairs up missing names; a fuzzy join never matches a missing name
+@pytest.mark.parametrize("case", WITHOUT_MISSING_KEYS)
+def test_exact_names_join_like_merge(frames, how):
+    left, right = frames
+    result = fuzzy.fuzzy_join(left, right, engine.key_columns(left, right), how, threshold=1.0)
+    assert_same_rows(result.drop(columns=engine.fuzzy_output_columns()), reference_join(left, right, how))
+
+
+def test_misspelled_names_match(how):
+    left = pd.DataFrame({"name": ["Jon Smith", "Alice Brown", None, ""], "hours": [1, 2, 3, 4]})
+    right = pd.DataFrame({"name": ["Bob Stone", "John  Smith", "alice brown"], "status": ["a", "b", "c"]})
+    result = fuzzy.fuzzy_join(left, right, ["name"], how, threshold=0.85)
+    matched = result[result["name_score"].notna()]
+    assert sorted(zip(matched["name"], matched["name_2"])) == [("Alice Brown", "alice brown"), ("Jon Smith", "John  Smith")]
+    expected_rows = {"inner": 2, "left": 4, "right": 3, "outer": 5}[how]
+    assert len(result) == expected_rows
+    assert list(result.columns) == ["name", "hours", "name_2", "name_score", "status"]
+    if how in ("right", "outer"):
+        assert "Bob Stone" in set(result["name"])
+    if how == "right":
+        # Right joins keep the Data 2 order, matched or not
+        assert result["name_2"].tolist() == right["name"].tolist()
+
+
+def test_other_keys_must_still_be_equal(cases):
+    left, right = cases["attendance"]
+    misspelled = right.assign(name=right["name"].replace({"Alice": "Alyce"}))
+    result = fuzzy.fuzzy_join(left, misspelled, ["name", "date"], "inner", threshold=0.7)
+    expected = reference_join(left, right, "inner")
+    assert_same_rows(result[list(expected.columns)], expected)
+
+
+def test_join_frames_routes_fuzzy_joins(cases):
+    left, right = cases["duplicates"]
+    result = engine.join_frames(left, right, "outer", fuzzy_threshold=1.0)
+    assert list(result.columns) == ["name", "hours", "name_2", "name_score", "status"]
+    assert len(result) == len(reference_join(left, right, "outer"))
+
+
+def test_forked_matching_agrees_with_one_process():
+    names = ["Alice Brown", "Alyce Brown", "Bob Stone", "Rob Stone", "Carol King", "Karol King"]
+    single = fuzzy.match_names(names[::2], names[1::2], 0.8, workers=1)
+    forked = fuzzy.match_names(names[::2], names[1::2], 0.8, workers=2)
+    pd.testing.assert_frame_equal(single, forked)
+
+
+def test_normalize_name():
+    assert fuzzy.normalize_name("  José  O'Neil ") == "jose o neil"
+    assert fuzzy.soundex("Robert") == fuzzy.soundex("Rupert")
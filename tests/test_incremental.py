@@ -0,0 +1,60 @@
+import pandas as pd
+import pytest
+
+from cases import assert_same_rows, reference_join
+from joinapp import engine, incremental
+
+
+@pytest.mark.parametrize("how", ["inner", "left"])
+@pytest.mark.parametrize("split", [0, 1, 3])
+def test_join_appended_matches_full_join(frames, how, split):
+    left, right = frames
+    base, delta = left.iloc[:split], left.iloc[split:]
+    result = engine.join_frames(base, right, how)
+    combined, added = incremental.join_appended(result, left, delta, right, how)
+    pd.testing.assert_frame_equal(combined, reference_join(left, right, how), check_dtype=False)
+    assert len(added) == len(combined) - len(result)
+
+
+def test_cross_join_appended_matches_full_join(cases):
+    left, right = cases["attendance"]
+    result = engine.join_frames(left.iloc[:2], right, "cross", lazy=True)
+    combined, added = incremental.join_appended(result, left, left.iloc[2:], right, "cross")
+    assert_same_rows(combined.to_frame(), reference_join(left, right, "cross"))
+    assert len(added) == 3 * len(right)
+
+
+@pytest.mark.parametrize("how", ["right", "outer"])
+def test_joins_that_reorder_need_a_full_join(how, cases):
+    left, right = cases["attendance"]
+    with pytest.raises(ValueError):
+        incremental.join_appended(engine.join_frames(left, right, how), left, left.iloc[:0], right, how)
+
+
+def test_tracker_reads_only_appended_rows(tmp_path, cases):
+    path = tmp_path / "left.csv"
+    left, _ = cases["attendance"]
+    left.iloc[:3].to_csv(path, index=False)
+    tracker = incremental.AppendTracker(str(path))
+    assert tracker.read_appended(left.columns).empty
+    with open(path, "a") as file:
+        file.write("Dan,22/10/2024,4\nEve,23/10")
+    delta = tracker.read_appended(left.columns)
+    assert delta.values.tolist() == [["Dan", "22/10/2024", 4]]
+    path.write_text("other,header\n")
+    assert tracker.read_appended(left.columns) is None
+
+
+@pytest.mark.parametrize("fmt", ["csv", "json", "jsonl"])
+def test_appended_export_reads_back(tmp_path, fmt, cases):
+    left, right = cases["attendance"]
+    result = engine.join_frames(left.iloc[:2], right, "left")
+    path = str(tmp_path / ("result." + fmt))
+    engine.export_frame(result, path, fmt)
+    combined, added = incremental.join_appended(result, left, left.iloc[2:], right, "left")
+    incremental.append_to_export(path, added, fmt, combined)
+    if fmt == "csv":
+        exported = pd.read_csv(path)
+    else:
+        exported = pd.read_json(path, lines=fmt == "jsonl", convert_dates=False)
+    assert_same_rows(exported, combined)
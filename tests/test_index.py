@@ -0,0 +1,80 @@
+import pandas as pd
+import pytest
+
+from cases import assert_same_rows, reference_join, write_case
+from joinapp import cli, engine, index
+
+
+@pytest.mark.parametrize("frame_is_left", [True, False])
+def test_join_with_index_matches_merge(frames, how, frame_is_left):
+    left, right = frames
+    keys = engine.key_columns(left, right)
+    if frame_is_left:
+        result = index.join_with_index(left, index.KeyIndex(right, keys), how, frame_is_left=True)
+    else:
+        result = index.join_with_index(right, index.KeyIndex(left, keys), how, frame_is_left=False)
+    expected = reference_join(left, right, how)
+    if how == ("inner" if frame_is_left else "right") or how == "left" and frame_is_left:
+        # Rows follow the probing frame, which is the order merge() keeps for these
+        pd.testing.assert_frame_equal(result, expected, check_dtype=False)
+    else:
+        assert_same_rows(result, expected)
+
+
+def test_saved_index_matches_merge(tmp_path, frames, how):
+    pytest.importorskip("pyarrow")
+    left, right = frames
+    keys = engine.key_columns(left, right)
+    index.save_index(right, keys, str(tmp_path))
+    result = index.join_with_index(left, index.open_index(str(tmp_path), keys), how)
+    assert_same_rows(result, reference_join(left, right, how))
+
+
+def test_int_and_float_keys_hash_alike(cases):
+    left, right = cases["int_float"]
+    assert (index.hash_keys(left, ["shift"])[[0, 2]] == index.hash_keys(right, ["shift"])[[0, 2]]).all()
+
+
+def test_stale_index_is_not_reopened(tmp_path, cases):
+    pytest.importorskip("pyarrow")
+    left, right = cases["attendance"]
+    source = tmp_path / "right.csv"
+    right.to_csv(source, index=False)
+    directory = str(tmp_path / "index")
+    index.save_index(right, ["name", "date"], directory, str(source))
+    assert index.open_index(directory, ["name", "date"], str(source)) is not None
+    assert index.open_index(directory, ["name"], str(source)) is None
+    source.write_text(source.read_text() + "Zed,23/10/2024,Late\n")
+    assert index.open_index(directory, ["name", "date"], str(source)) is None
+
+
+def test_index_loaded_otherwise_is_not_reopened(tmp_path, cases):
+    pytest.importorskip("pyarrow")
+    _, right = cases["attendance"]
+    source = str(tmp_path / "right.csv")
+    right.to_csv(source, index=False)
+    directory = str(tmp_path / "index")
+    index.ensure_index(directory, ["name", "date"], source)
+    assert index.open_index(directory, ["name", "date"], source) is not None
+    assert index.open_index(directory, ["name", "date"], source, typed=True) is None
+    assert index.open_index(directory, ["name", "date"], source, where='name != "Bob"') is None
+    rebuilt = index.ensure_index(directory, ["name", "date"], source, where='name != "Bob"')
+    assert "Bob" not in set(rebuilt.rows(range(len(rebuilt)))["name"])
+
+
+@pytest.mark.parametrize("options", [[], ["--typed"], ["--typed", "--right-where", 'name != "Bob"']])
+def test_cli_index_join_loads_right_like_left(tmp_path, cases, options):
+    pytest.importorskip("pyarrow")
+    left_path, right_path, _, _ = write_case(tmp_path, *cases["attendance"])
+    plain_path, indexed_path = str(tmp_path / "plain.csv"), str(tmp_path / "indexed.csv")
+    cli.main(["join", left_path, right_path, "--out", plain_path, *options])
+    # Run twice, so the second join reopens the index the first one saved
+    for _ in range(2):
+        cli.main(["join", left_path, right_path, "--out", indexed_path, "--right-index", str(tmp_path / "index"), *options])
+        pd.testing.assert_frame_equal(engine.load_frame(indexed_path), engine.load_frame(plain_path))
+
+
+def test_cross_joins_are_rejected(cases):
+    left, right = cases["attendance"]
+    with pytest.raises(ValueError):
+        index.join_with_index(left, index.KeyIndex(right, ["name"]), "cross")
@@ -0,0 +1,45 @@
+import pandas as pd
+import pytest
+
+from cases import assert_same_rows, reference_join
+from joinapp import engine
+from joinapp.lazy import LazyCrossJoin
+
+
+def test_lazy_cross_join_matches_merge(frames):
+    left, right = frames
+    product = engine.join_frames(left, right, "cross", lazy=True)
+    expected = reference_join(left, right, "cross")
+    assert isinstance(product, LazyCrossJoin)
+    assert len(product) == len(expected)
+    assert list(product.columns) == list(expected.columns)
+    pd.testing.assert_frame_equal(product.to_frame().reset_index(drop=True), expected)
+
+
+def test_slices_and_positions_match_merge(cases):
+    left, right = cases["attendance"]
+    product = LazyCrossJoin(left, right)
+    expected = reference_join(left, right, "cross")
+    pd.testing.assert_frame_equal(product.iloc[3:11].reset_index(drop=True), expected.iloc[3:11].reset_index(drop=True))
+    pd.testing.assert_series_equal(product.iloc[-1], expected.iloc[-1], check_names=False)
+    with pytest.raises(IndexError):
+        product.iloc[len(product)]
+
+
+@pytest.mark.parametrize("ascending", [True, False])
+def test_sort_on_left_columns_stays_lazy(ascending, cases):
+    left, right = cases["duplicates"]
+    product = LazyCrossJoin(left, right)
+    assert product.can_sort_lazily(["name_x"])
+    assert not product.can_sort_lazily(["status"])
+    result = product.sort_lazily(["name_x"], ascending).to_frame()
+    expected = reference_join(left, right, "cross").sort_values("name_x", ascending=ascending, kind="mergesort")
+    pd.testing.assert_frame_equal(result.reset_index(drop=True), expected.reset_index(drop=True))
+
+
+@pytest.mark.parametrize("extension", [".csv", ".json", ".jsonl"])
+def test_streamed_export_matches_merge(tmp_path, extension, cases):
+    left, right = cases["missing"]
+    path = str(tmp_path / ("product" + extension))
+    engine.export_frame(LazyCrossJoin(left, right), path)
+    assert_same_rows(engine.load_frame(path), reference_join(left, right, "cross"))
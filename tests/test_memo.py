@@ -0,0 +1,58 @@
+import pandas as pd
+import pytest
+
+from cases import WITHOUT_MISSING_KEYS
+from joinapp import engine
+from joinapp.index import KeyIndex
+from joinapp.memo import ResultCache
+
+
+@pytest.mark.parametrize("how", engine.JOIN_TYPES)
+def test_cached_join_matches_join_frames(frames, how):
+    left, right = frames
+    cache = ResultCache()
+    first = cache.join(left, right, how)
+    assert cache.join(left, right, how) is first
+    pd.testing.assert_frame_equal(first, engine.join_frames(left, right, how))
+
+
+def test_join_types_are_cached_separately(cases):
+    left, right = cases["attendance"]
+    cache = ResultCache()
+    assert len(cache.join(left, right, "inner")) != len(cache.join(left, right, "outer"))
+
+
+def test_equal_contents_share_an_entry(cases):
+    left, right = cases["attendance"]
+    cache = ResultCache()
+    assert cache.join(left.copy(), right.copy()) is cache.join(left.copy(), right.copy())
+
+
+def test_lookup_only_finds_computed_joins(cases):
+    left, right = cases["attendance"]
+    cache = ResultCache()
+    assert cache.lookup(left, right, "inner", lazy=True) is None
+    assert not cache.entries
+    result = cache.join(left, right, "inner", lazy=True, workers=2)
+    assert cache.lookup(left.copy(), right.copy(), " Inner ", lazy=True) is result
+    assert cache.lookup(left, right, "inner") is None
+
+
+def test_results_over_budget_are_not_kept(cases):
+    left, right = cases["attendance"]
+    cache = ResultCache(budget_bytes=1)
+    cache.join(left, right, "outer")
+    assert not cache.entries
+
+
+@pytest.mark.parametrize("case", WITHOUT_MISSING_KEYS)
+@pytest.mark.parametrize("how", ["inner", "left"])
+def test_index_probe_keeps_join_frames_order(frames, how):
+    left, right = frames
+    keys = engine.key_columns(left, right)
+    left, right = left.sort_values(keys, ignore_index=True), right.sort_values(keys, ignore_index=True)
+    result = ResultCache().join(left, right, how, check_sorted=True, right_index=KeyIndex(right, keys))
+    pd.testing.assert_frame_equal(result, engine.join_frames(left, right, how), check_dtype=False)
+    # Tagged as sorted on the keys, so sort_frame trusts the order above
+    assert result.attrs["sorted_by"] == keys
+    assert engine.is_sorted_on(result, keys)
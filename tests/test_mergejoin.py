@@ -0,0 +1,52 @@
+import pandas as pd
+import pytest
+
+from cases import WITHOUT_MISSING_KEYS, reference_join, write_case
+from joinapp import engine, mergejoin
+
+
+# Function to sort both sides of a case on their join keys, as the merge join expects
+def sorted_frames(left, right):
+    keys = engine.key_columns(left, right)
+    return left.sort_values(keys, ignore_index=True), right.sort_values(keys, ignore_index=True)
+
+
+# Missing keys have no place in a sort order; the merge join refuses them
+@pytest.mark.parametrize("case", WITHOUT_MISSING_KEYS)
+@pytest.mark.parametrize("chunk_rows", [1, 2, 100])
+def test_merge_join_frames_matches_merge(frames, how, chunk_rows):
+    left, right = sorted_frames(*frames)
+    result = mergejoin.merge_join_frames(left, right, how, chunk_rows=chunk_rows)
+    # On sorted inputs merge() also gives the rows in key order
+    pd.testing.assert_frame_equal(result, reference_join(left, right, how), check_dtype=False)
+
+
+# Missing keys have no place in a sort order; the merge join refuses them
+@pytest.mark.parametrize("case", WITHOUT_MISSING_KEYS)
+def test_merge_join_files_matches_merge(tmp_path, frames, how):
+    left_path, right_path, left, right = write_case(tmp_path, *sorted_frames(*frames))
+    out_path = str(tmp_path / "joined.csv")
+    rows = mergejoin.merge_join_files(left_path, right_path, out_path, how, chunksize=2)
+    expected = reference_join(left, right, how)
+    assert rows == len(expected)
+    pd.testing.assert_frame_equal(engine.load_frame(out_path), expected, check_dtype=False)
+
+
+def test_result_is_in_key_order(cases):
+    left, right = sorted_frames(*cases["duplicates"])
+    result = mergejoin.merge_join_frames(left, right, "outer", chunk_rows=2)
+    assert result["name"].tolist() == sorted(result["name"])
+    assert result.attrs["sorted_by"] == ["name"]
+
+
+def test_unsorted_input_is_rejected(tmp_path, cases):
+    left, right = cases["attendance"]
+    left_path, right_path, _, _ = write_case(tmp_path, left.iloc[::-1], right)
+    with pytest.raises(ValueError):
+        mergejoin.merge_join_files(left_path, right_path, str(tmp_path / "joined.csv"), chunksize=2)
+
+
+def test_missing_keys_are_rejected(cases):
+    left, right = sorted_frames(*cases["missing"])
+    with pytest.raises(ValueError):
+        mergejoin.merge_join_frames(left, right, "inner")
@@ -0,0 +1,28 @@
+import pandas as pd
+
+from cases import assert_same_rows, reference_join
+from joinapp.parallel import parallel_join
+
+
+def test_parallel_join_matches_merge(frames, how):
+    left, right = frames
+    result = parallel_join(left, right, how, workers=2, partitions=3)
+    expected = reference_join(left, right, how)
+    if how == "outer":
+        # Outer joins come back in key order rather than merge's exact order
+        assert_same_rows(result, expected)
+    else:
+        pd.testing.assert_frame_equal(result, expected, check_dtype=False)
+
+
+def test_unordered_parallel_join_has_the_same_rows(how, cases):
+    left, right = cases["duplicates"]
+    result = parallel_join(left, right, how, workers=2, preserve_order=False)
+    assert_same_rows(result, reference_join(left, right, how))
+
+
+def test_categorical_keys_give_the_same_rows(cases):
+    left, right = cases["attendance"]
+    left = left.astype({"name": "category"})
+    result = parallel_join(left, right, "outer", workers=2, categorical_keys=True)
+    assert_same_rows(result, reference_join(left, right, "outer"))
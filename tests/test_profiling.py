@@ -0,0 +1,56 @@
+import cProfile
+import pstats
+import threading
+
+import pytest
+
+from joinapp import profiling
+
+
+# Function to run a stage on a worker thread and return what it returned
+def run_on_thread(profiler, name, func):
+    results = []
+    worker = threading.Thread(target=lambda: results.append(profiler.run_stage(name, func)))
+    worker.start()
+    worker.join()
+    return results[0]
+
+
+def test_stages_are_recorded_in_order():
+    profiler = profiling.Profiler()
+    profiler.begin("Join Data")
+    assert profiler.run_stage("outer", lambda: profiler.run_stage("inner", lambda: 42)) == 42
+    assert [(stage["stage"], stage["depth"]) for stage in profiler.stages] == [("inner", 1), ("outer", 0)]
+    assert profiler.running == 0
+    assert profiler.summary().startswith("Join Data")
+
+
+def test_worker_stage_is_profiled_during_a_capture(tmp_path):
+    profiler = profiling.Profiler()
+    profiler.start_capture()
+    try:
+        assert run_on_thread(profiler, "join_worker", lambda: sum(range(1000))) == 499500
+    finally:
+        profiler.dump_capture(str(tmp_path / "app.prof"), str(tmp_path / "app.tracemalloc"))
+    assert pstats.Stats(str(tmp_path / "app.prof")).total_calls > 0
+
+
+def test_worker_stage_runs_when_another_profiler_is_active(monkeypatch):
+    class ActiveElsewhere(cProfile.Profile):
+        def enable(self, *args, **kwargs):
+            raise ValueError("Another profiling tool is already active")
+
+    profiler = profiling.Profiler()
+    profiler.capturing = True
+    monkeypatch.setattr(profiling.cProfile, "Profile", ActiveElsewhere)
+    assert run_on_thread(profiler, "join_worker", lambda: "joined") == "joined"
+    assert profiler.profiles == []
+    assert profiler.stages[0]["stage"] == "join_worker"
+
+
+def test_failing_stage_is_still_recorded():
+    profiler = profiling.Profiler()
+    with pytest.raises(KeyError):
+        profiler.run_stage("load", lambda: {}["name"])
+    assert profiler.stages[0]["stage"] == "load"
+    assert profiler.running == 0
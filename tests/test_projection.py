@@ -0,0 +1,25 @@
+import pandas as pd
+import pytest
+
+from cases import reference_join
+from joinapp import engine
+
+
+# Function to pick a few output columns of a join: the last one, then the first
+def some_columns(left, right, how):
+    output = list(reference_join(left.iloc[:0], right.iloc[:0], how).columns)
+    return [output[-1], output[0]]
+
+
+@pytest.mark.parametrize("how", engine.JOIN_TYPES)
+def test_projected_join_matches_merge(frames, how):
+    left, right = frames
+    columns = some_columns(left, right, how)
+    result = engine.join_frames(left, right, how, columns=columns)
+    pd.testing.assert_frame_equal(result, reference_join(left, right, how)[columns])
+
+
+def test_unknown_output_column_is_rejected(cases):
+    left, right = cases["attendance"]
+    with pytest.raises(ValueError):
+        engine.join_frames(left, right, "inner", columns=["nope"])
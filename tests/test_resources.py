@@ -0,0 +1,24 @@
+import subprocess
+import sys
+from pathlib import Path
+
+from joinapp import resources
+
+
+def test_memory_figures_without_resource_or_proc(monkeypatch, tmp_path):
+    monkeypatch.setattr(resources, "resource", None)
+    monkeypatch.setattr(resources, "_PROC_STATUS", str(tmp_path / "missing"))
+    monkeypatch.setitem(sys.modules, "psutil", None)
+    assert resources.current_rss() == 0
+    assert resources.peak_rss() == 0
+
+
+def test_peak_is_at_least_the_current_size():
+    assert resources.peak_rss() >= resources.current_rss() >= 0
+
+
+def test_package_import_leaves_the_benchmark_out():
+    code = "import sys, joinapp; print('joinapp.bench' in sys.modules)"
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True,
+                            cwd=Path(__file__).parents[1])
+    assert result.stdout.strip() == "False"
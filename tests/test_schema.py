@@ -0,0 +1,46 @@
+import importlib.util
+
+import pandas as pd
+
+from cases import assert_same_rows, reference_join, write_case
+from joinapp import engine, schema
+
+
+def test_typed_load_joins_like_merge(tmp_path, frames, how):
+    left_path, right_path, left, right = write_case(tmp_path, *frames)
+    typed_left = engine.load_frame(left_path, typed=True)
+    typed_right = engine.load_frame(right_path, typed=True)
+    result = engine.join_frames(typed_left, typed_right, how)
+    # Dates come back parsed; render them in the layout they were written in
+    for col in result.select_dtypes("datetime").columns:
+        result[col] = result[col].dt.strftime("%d/%m/%Y")
+    assert_same_rows(result, reference_join(left, right, how))
+
+
+def test_inferred_kinds(tmp_path):
+    path = str(tmp_path / "attendance.csv")
+    pd.DataFrame({
+        "name": ["Alice", "Bob", "Alice", "Bob"],
+        "date": ["20/10/2024", "21/10/2024", "22/10/2024", "23/10/2024"],
+        "hours": [8, 6, 7, 5],
+        "rate": [1.5, 2.0, 2.5, 3.0],
+    }).to_csv(path, index=False)
+    columns = schema.infer_schema(path)["columns"]
+    assert columns["name"] == {"kind": "category"}
+    assert columns["date"] == {"kind": "datetime", "format": "%d/%m/%Y"}
+    assert columns["hours"] == {"kind": "integer"}
+    assert columns["rate"] == {"kind": "float"}
+
+
+def test_stale_sidecar_is_ignored(tmp_path):
+    path = str(tmp_path / "data.csv")
+    pd.DataFrame({"name": ["Alice"], "hours": [8]}).to_csv(path, index=False)
+    schema.save_schema({"version": 1, "sample_rows": 1, "columns": {"other": {"kind": "string"}}}, schema.schema_path(path))
+    frame = schema.read_typed_csv(path)
+    assert list(frame.columns) == ["name", "hours"]
+    assert frame["hours"].tolist() == [8]
+
+
+def test_parser_options_follow_pyarrow():
+    expected = {"engine": "pyarrow"} if importlib.util.find_spec("pyarrow") else {}
+    assert schema.parser_options() == expected
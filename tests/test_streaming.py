@@ -0,0 +1,29 @@
+import pandas as pd
+import pytest
+
+from cases import assert_same_rows, reference_join, write_case
+from joinapp import streaming
+
+
+def test_stream_join_matches_merge(tmp_path, frames, how):
+    left_path, right_path, left, right = write_case(tmp_path, *frames)
+    out_path = str(tmp_path / "out.csv")
+    rows = streaming.stream_join(left_path, right_path, out_path, how, chunksize=2)
+    expected = reference_join(left, right, how)
+    assert rows == len(expected)
+    assert_same_rows(pd.read_csv(out_path), expected)
+
+
+def test_stream_join_frames_matches_merge(tmp_path, frames, how):
+    left, right = frames
+    out_path = str(tmp_path / "out.csv")
+    rows = streaming.stream_join_frames(left, right, out_path, how, chunksize=2)
+    expected = reference_join(left, right, how)
+    assert rows == len(expected)
+    assert_same_rows(pd.read_csv(out_path), expected)
+
+
+def test_cross_joins_are_not_streamed(tmp_path, cases):
+    left_path, right_path, _, _ = write_case(tmp_path, *cases["attendance"])
+    with pytest.raises(ValueError):
+        streaming.stream_join(left_path, right_path, str(tmp_path / "out.csv"), "cross")
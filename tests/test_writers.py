@@ -0,0 +1,58 @@
+import gzip
+import multiprocessing
+import sys
+import threading
+
+import pytest
+
+from cases import reference_join
+from joinapp import writers
+
+
+@pytest.mark.parametrize("how", ["inner", "outer", "cross"])
+@pytest.mark.parametrize("workers", [1, 2])
+def test_write_csv_matches_to_csv(tmp_path, frames, how, workers):
+    frame = reference_join(*frames, how)
+    path = tmp_path / "out.csv"
+    rows = writers.write_csv(frame, str(path), workers=workers, chunk_rows=2)
+    assert rows == len(frame)
+    assert path.read_text() == frame.to_csv(index=False)
+
+
+def test_compressed_csv_matches_to_csv(tmp_path, cases):
+    frame = reference_join(*cases["attendance"], "outer")
+    path = tmp_path / "out.csv.gz"
+    writers.write_csv(frame, str(path), workers=1, chunk_rows=2)
+    assert gzip.decompress(path.read_bytes()).decode() == frame.to_csv(index=False)
+
+
+def test_spawn_context_formats_in_process(tmp_path, cases):
+    frame = reference_join(*cases["duplicates"], "inner")
+    path = tmp_path / "out.csv"
+    writers.write_csv(frame, str(path), workers=2, chunk_rows=1, mp_context=multiprocessing.get_context("spawn"))
+    assert path.read_text() == frame.to_csv(index=False)
+
+
+def test_fork_is_the_default_on_linux_only():
+    context = writers.fork_context()
+    if sys.platform.startswith("linux"):
+        assert context.get_start_method() == "fork"
+    else:
+        assert context is None
+
+
+def test_cancelled_export_removes_the_file(tmp_path, cases):
+    frame = reference_join(*cases["attendance"], "cross")
+    path = tmp_path / "out.csv"
+    cancel = threading.Event()
+    rows = writers.write_csv(frame, str(path), workers=1, chunk_rows=1, progress=lambda done, total: cancel.set(),
+                             cancel=cancel)
+    assert rows is None
+    assert not path.exists()
+
+
+def test_json_lines_read_back(tmp_path, cases):
+    frame = reference_join(*cases["missing"], "outer")
+    path = tmp_path / "out.jsonl"
+    assert writers.write_json_lines(writers.frame_batches(frame, 2), str(path)) == len(frame)
+    assert path.read_text() == frame.to_json(orient="records", lines=True)